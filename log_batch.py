@@ -0,0 +1,448 @@
+#
+# This file is part of <LogGenerator Pro>.
+#
+# <LogGenerator Pro> is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+명령줄 일괄 변환
+
+    python log_batch.py convert --preset 이름 --jobs 4 입력폴더/ 출력폴더/
+
+저장된 프리셋으로 로그 파일들을 HTML로 변환합니다. QApplication을 만들지 않으며,
+파일은 ProcessPoolExecutor로 여러 프로세스에 나누어 처리합니다.
+
+    python log_batch.py cache-bench --threads 8 --ops 200000
+
+ShardedCache의 동시성 검사(갱신 유실 여부)와 잠금 하나짜리 캐시와의 처리량 비교를 실행합니다.
+
+    python log_batch.py minify-check --cases 500 [--preset 이름 로그파일...]
+
+최소화 출력이 전체 출력과 같은 태그와 속성을 만드는지, 절약 바이트 수가 실제 길이
+차이와 같은지 무작위 입력(또는 지정한 로그 파일)으로 확인합니다.
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields, replace
+
+from log_renderer import (
+    LogRenderer,
+    RenderSettings,
+    ShardedCache,
+    THEME_TEXT_COLORS,
+    TagStyle,
+    dom_signature
+)
+
+
+APP_NAME = "LogGenerator Pro"
+
+# 워커 프로세스마다 한 번만 만들어 두는 렌더러와 설정
+_worker_renderer = None
+_worker_settings = None
+
+
+def default_data_dir():
+    """GUI와 같은 설정 폴더 (QStandardPaths.AppDataLocation과 동일한 위치)"""
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or os.path.expanduser('~\\AppData\\Roaming')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Application Support')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(base, APP_NAME)
+
+
+def load_json(path):
+    """JSON 파일 읽기 (없으면 빈 딕셔너리)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_settings(data_dir, preset_name, text_settings_name=None, color_scheme='light'):
+    """프리셋과 텍스트 설정을 읽어 RenderSettings 생성
+
+    본문 글자색은 GUI처럼 프리셋이 아니라 색상 모드(light/dark)의 STYLES['text']를 사용합니다.
+    """
+    presets = load_json(os.path.join(data_dir, 'color_presets.json'))
+    if preset_name not in presets:
+        raise ValueError(f'프리셋 "{preset_name}"을(를) 찾을 수 없습니다.')
+
+    # 텍스트 설정은 이름을 지정하지 않으면 같은 이름이 있을 때만 사용
+    text_settings = load_json(os.path.join(data_dir, 'text_settings.json'))
+    if text_settings_name is None:
+        text_settings_name = preset_name
+    elif text_settings_name not in text_settings:
+        raise ValueError(f'텍스트 설정 "{text_settings_name}"을(를) 찾을 수 없습니다.')
+
+    return RenderSettings.from_preset(
+        presets[preset_name],
+        text_settings.get(text_settings_name),
+        text_color=THEME_TEXT_COLORS[color_scheme]
+    )
+
+
+def collect_files(input_path, pattern):
+    """변환할 파일 목록 수집"""
+    if os.path.isfile(input_path):
+        return [input_path]
+    return sorted(
+        path for path in glob.glob(os.path.join(input_path, '**', pattern), recursive=True)
+        if os.path.isfile(path)
+    )
+
+
+def _init_worker(settings):
+    """워커 프로세스 초기화"""
+    global _worker_renderer, _worker_settings
+    _worker_renderer = LogRenderer()
+    _worker_settings = settings
+
+
+def convert_file(source, target):
+    """파일 하나 변환 후 (원본, 소요 시간, 입력 바이트, 출력 바이트, 오류) 반환"""
+    start = time.perf_counter()
+    try:
+        # 문단 단위로 변환한 조각을 바로 파일에 써서 큰 로그도 메모리를 적게 사용
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        with open(source, 'r', encoding='utf-8-sig') as src, \
+                open(target, 'w', encoding='utf-8') as dst:
+            for chunk in _worker_renderer.render_iter(src, _worker_settings):
+                dst.write(chunk)
+
+        return (
+            source,
+            time.perf_counter() - start,
+            os.path.getsize(source),
+            os.path.getsize(target),
+            None
+        )
+    except Exception as e:
+        return (source, time.perf_counter() - start, 0, 0, str(e))
+
+
+def run_convert(args):
+    """convert 명령 실행"""
+    data_dir = args.data_dir or default_data_dir()
+    try:
+        settings = load_settings(data_dir, args.preset, args.text_settings, args.color_scheme)
+    except Exception as e:
+        print(f"설정 로드 중 오류 발생: {e}", file=sys.stderr)
+        return 2
+
+    files = collect_files(args.input, args.pattern)
+    if not files:
+        print(f"변환할 파일이 없습니다: {args.input}", file=sys.stderr)
+        return 1
+
+    # 입력 폴더 구조를 유지한 출력 경로
+    base = args.input if os.path.isdir(args.input) else os.path.dirname(args.input)
+    jobs = []
+    for source in files:
+        relative = os.path.splitext(os.path.relpath(source, base))[0] + '.html'
+        jobs.append((source, os.path.join(args.output, relative)))
+
+    workers = max(1, args.jobs or os.cpu_count() or 1)
+    print(f"{len(jobs)}개 파일 변환 시작 (프리셋: {args.preset}, 프로세스: {workers})")
+
+    failed = 0
+    total_in = 0
+    total_out = 0
+    start = time.perf_counter()
+
+    def report(result):
+        nonlocal failed, total_in, total_out
+        source, elapsed, in_bytes, out_bytes, error = result
+        if error:
+            failed += 1
+            print(f"  실패 {source}: {error}", file=sys.stderr)
+            return
+        total_in += in_bytes
+        total_out += out_bytes
+        print(f"  {source}: {elapsed * 1000:.1f}ms ({in_bytes / 1024:.1f}KB -> {out_bytes / 1024:.1f}KB)")
+
+    if workers == 1:
+        # 단일 프로세스는 풀 없이 바로 처리
+        _init_worker(settings)
+        for source, target in jobs:
+            report(convert_file(source, target))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(settings,)
+        ) as executor:
+            futures = [executor.submit(convert_file, source, target) for source, target in jobs]
+            for future in as_completed(futures):
+                report(future.result())
+
+    elapsed = time.perf_counter() - start
+    done = len(jobs) - failed
+    print(
+        f"완료: {done}/{len(jobs)}개, {elapsed:.2f}초, "
+        f"{done / elapsed if elapsed else 0:.1f} 파일/초, "
+        f"{total_in / 1048576 / elapsed if elapsed else 0:.2f} MB/초"
+    )
+    return 1 if failed else 0
+
+
+def _run_threads(count, target):
+    """스레드 count개를 동시에 출발시켜 target(번호) 실행 후 (소요 시간, 예외 목록) 반환"""
+    barrier = threading.Barrier(count + 1)
+    errors = []
+
+    def run(number):
+        barrier.wait()
+        try:
+            target(number)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(number,)) for number in range(count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, errors
+
+
+def stress_cache(shards=16, threads=8, increments=20000, keys=64):
+    """동시 갱신 검사: 같은 키들을 여러 스레드가 update로 올린 합계가 맞는지 확인
+
+    문제가 있으면 설명 문자열 목록을, 없으면 빈 목록을 반환합니다.
+    """
+    problems = []
+    # 1. 원자적 증가 - 잃어버린 갱신이 있으면 합계가 모자람
+    counter = ShardedCache(keys, max_age=None, shards=shards)
+
+    def increment(number):
+        rng = random.Random(number)
+        for _ in range(increments):
+            counter.update(rng.randrange(keys), lambda value: value + 1, 0)
+
+    _, errors = _run_threads(threads, increment)
+    total = sum(counter.get(key) or 0 for key in range(keys))
+    if errors:
+        problems.append(f"증가 중 예외 {len(errors)}개: {errors[0]!r}")
+    if total != threads * increments:
+        problems.append(f"갱신 유실: 합계 {total}, 기대값 {threads * increments}")
+
+    # 2. 제거가 일어나는 get/set/remove 혼합 - 예외 없이 용량을 지켜야 함
+    cache = ShardedCache(keys, max_age=None, shards=shards)
+
+    def churn(number):
+        rng = random.Random(number)
+        for _ in range(increments):
+            key = rng.randrange(keys * 8)
+            operation = rng.random()
+            if operation < 0.6:
+                value = cache.get(key)
+                if value is not None and value != key * 2:
+                    raise AssertionError(f"키 {key}의 값이 {value}")
+            elif operation < 0.95:
+                cache.set(key, key * 2)
+            else:
+                cache.remove(key)
+
+    _, errors = _run_threads(threads, churn)
+    if errors:
+        problems.append(f"혼합 작업 중 예외 {len(errors)}개: {errors[0]!r}")
+    if len(cache) > cache.shard_size * len(cache.shards):
+        problems.append(f"용량 초과: {len(cache)}개")
+    return problems
+
+
+def bench_cache(shards, threads=8, ops=200000, keys=4096, read_ratio=0.8):
+    """get 80% / set 20% 혼합 작업의 초당 처리량 측정"""
+    cache = ShardedCache(keys, max_age=None, shards=shards)
+    for key in range(keys):
+        cache.set(key, key)
+    per_thread = ops // threads
+
+    def work(number):
+        rng = random.Random(number)
+        operations = [(rng.randrange(keys * 2), rng.random() < read_ratio) for _ in range(per_thread)]
+        for key, read in operations:
+            if read:
+                cache.get(key)
+            else:
+                cache.set(key, key)
+
+    elapsed, errors = _run_threads(threads, work)
+    if errors:
+        raise errors[0]
+    return per_thread * threads / elapsed, cache.get_stats()
+
+
+def run_cache_bench(args):
+    """cache-bench 명령 실행"""
+    print(f"동시성 검사 (스레드 {args.threads}, 스레드당 {args.ops // args.threads}회)")
+    failed = False
+    for shards in (1, args.shards):
+        problems = stress_cache(shards, args.threads, args.ops // args.threads)
+        failed = failed or bool(problems)
+        print(f"  샤드 {shards}: {'실패' if problems else '통과'}")
+        for problem in problems:
+            print(f"    {problem}", file=sys.stderr)
+
+    print(f"처리량 (get {args.read_ratio:.0%} / set {1 - args.read_ratio:.0%}, 최선 {args.repeat}회)")
+    results = {}
+    for shards in (1, args.shards):
+        best = 0
+        for _ in range(args.repeat):
+            ops_per_sec, stats = bench_cache(shards, args.threads, args.ops, read_ratio=args.read_ratio)
+            best = max(best, ops_per_sec)
+        results[shards] = best
+        print(
+            f"  샤드 {shards:>3}: {best:,.0f} ops/초 "
+            f"(적중률 {stats['hit_rate']}, 평균 조회 {stats['mean_lookup_us']:.2f}us)"
+        )
+    print(f"  샤드 {args.shards} / 샤드 1: {results[args.shards] / results[1]:.2f}배")
+    return 1 if failed else 0
+
+
+# 무작위 검사 입력을 만드는 조각 (대화문, 속마음, 이미지 태그, 줄바꿈 등)
+_MINIFY_CASE_PIECES = (
+    'She smiled.', '"Hello there," ', "'thinking' ", ' and left.', '*grin*', '...',
+    '{{img::cat}}', '{{image::dog}}', '<img src="cat">', '{{img=cat}}', '<b>x</b>',
+    '\n', '\n\n', ' ', '  '
+)
+
+
+def random_minify_case(rng):
+    """무작위 (텍스트, 설정) - 켜고 끄는 설정은 모두 무작위로 선택"""
+    text = ''.join(rng.choice(_MINIFY_CASE_PIECES) for _ in range(rng.randrange(1, 30)))
+    toggles = {field.name: rng.random() < 0.5 for field in fields(RenderSettings) if field.type in (bool, 'bool')}
+    settings = RenderSettings(
+        image_mappings=(('cat', 'https://example.com/cat.png'), ('dog', 'https://example.com/dog.png')),
+        tags=(TagStyle(text='태그', style=rng.choice(('기본', '투명 배경', '그라데이션'))), TagStyle()),
+        bot_name='봇',
+        image_url='https://example.com/profile.png',
+        frame_style=rng.choice(('배너', '동그라미', '직사각형')),
+        divider_style=rng.choice(('그라데이션', '단색')),
+        **toggles
+    )
+    return text, settings
+
+
+def check_minify(renderer, text, settings, chunk_size=65536):
+    """전체/최소화 출력 비교 후 문제 설명 목록 반환 (render와 render_iter 모두)"""
+    full = replace(settings, minify_output=False)
+    minified = replace(settings, minify_output=True)
+    problems = []
+    for mode, render in (
+        ('render', lambda current: renderer.render(text, current)),
+        ('render_iter', lambda current: ''.join(renderer.render_iter(text, current, chunk_size)))
+    ):
+        full_html = render(full)
+        minified_html = render(minified)
+        saved = renderer.last_minify_saved_bytes
+        if dom_signature(full_html) != dom_signature(minified_html):
+            problems.append(f"{mode}: 태그/속성이 다름")
+        if len(full_html) - len(minified_html) != saved:
+            problems.append(f"{mode}: 절약 {saved}바이트로 표시, 실제 {len(full_html) - len(minified_html)}바이트")
+    return problems
+
+
+def run_minify_check(args):
+    """minify-check 명령 실행"""
+    renderer = LogRenderer()
+    cases = []
+    if args.files:
+        if not args.preset:
+            print("로그 파일을 검사하려면 --preset이 필요합니다.", file=sys.stderr)
+            return 2
+        try:
+            settings = load_settings(
+                args.data_dir or default_data_dir(), args.preset, args.text_settings, args.color_scheme
+            )
+        except Exception as e:
+            print(f"설정 로드 중 오류 발생: {e}", file=sys.stderr)
+            return 2
+        for path in args.files:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                cases.append((path, f.read(), settings, 65536))
+    for number in range(args.cases):
+        text, settings = random_minify_case(random.Random(args.seed + number))
+        # 작은 조각으로 나누어 render_iter의 조각 경계도 함께 검사
+        cases.append((f"무작위 #{args.seed + number}", text, settings, 64))
+
+    failed = 0
+    for name, text, settings, chunk_size in cases:
+        problems = check_minify(renderer, text, settings, chunk_size)
+        if problems:
+            failed += 1
+            print(f"  실패 {name}: {'; '.join(problems)}", file=sys.stderr)
+    print(f"최소화 출력 검사: {len(cases) - failed}/{len(cases)}개 통과")
+    return 1 if failed else 0
+
+
+def build_parser():
+    """명령줄 인자 정의"""
+    parser = argparse.ArgumentParser(prog='log_generator_pro', description='LogGenerator Pro 명령줄 도구')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser('convert', help='로그 파일 일괄 HTML 변환')
+    convert.add_argument('--preset', required=True, help='color_presets.json에 저장된 프리셋 이름')
+    convert.add_argument('--text-settings', help='text_settings.json의 설정 이름 (기본: 프리셋과 같은 이름)')
+    convert.add_argument('--color-scheme', choices=sorted(THEME_TEXT_COLORS), default='light',
+                        help='본문 글자색을 정할 GUI 색상 모드 (기본: light)')
+    convert.add_argument('--jobs', type=int, default=0, help='프로세스 수 (기본: CPU 수)')
+    convert.add_argument('--pattern', default='*.txt', help='입력 폴더에서 찾을 파일 패턴 (기본: *.txt)')
+    convert.add_argument('--data-dir', help='설정 폴더 (기본: GUI 설정 폴더)')
+    convert.add_argument('input', help='입력 파일 또는 폴더')
+    convert.add_argument('output', help='출력 폴더')
+    convert.set_defaults(func=run_convert)
+
+    bench = commands.add_parser('cache-bench', help='ShardedCache 동시성 검사와 처리량 비교')
+    bench.add_argument('--threads', type=int, default=8, help='스레드 수 (기본: 8)')
+    bench.add_argument('--ops', type=int, default=200000, help='전체 작업 수 (기본: 200000)')
+    bench.add_argument('--shards', type=int, default=16, help='비교할 샤드 수 (기본: 16)')
+    bench.add_argument('--read-ratio', type=float, default=0.8, help='get 비율 (기본: 0.8)')
+    bench.add_argument('--repeat', type=int, default=3, help='처리량 측정 반복 횟수 (기본: 3)')
+    bench.set_defaults(func=run_cache_bench)
+
+    check = commands.add_parser('minify-check', help='최소화 출력과 전체 출력의 태그/속성 비교')
+    check.add_argument('--cases', type=int, default=500, help='무작위 입력 수 (기본: 500)')
+    check.add_argument('--seed', type=int, default=0, help='무작위 입력 시작 번호 (기본: 0)')
+    check.add_argument('--preset', help='로그 파일 검사에 쓸 프리셋 이름')
+    check.add_argument('--text-settings', help='text_settings.json의 설정 이름 (기본: 프리셋과 같은 이름)')
+    check.add_argument('--color-scheme', choices=sorted(THEME_TEXT_COLORS), default='light',
+                        help='본문 글자색을 정할 GUI 색상 모드 (기본: light)')
+    check.add_argument('--data-dir', help='설정 폴더 (기본: GUI 설정 폴더)')
+    check.add_argument('files', nargs='*', help='검사할 로그 파일 (--preset 필요)')
+    check.set_defaults(func=run_minify_check)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,44 +1,58 @@
-/* 
- * This file is part of <LogGenerator Pro>.
- * 
- * <LogGenerator Pro> is free software: you can redistribute it and/or modify
- * it under the terms of the GNU General Public License as published by
- * the Free Software Foundation, either version 3 of the License, or
- * (at your option) any later version.
- * 
- * This program is distributed in the hope that it will be useful,
- * but WITHOUT ANY WARRANTY; without even the implied warranty of
- * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
- * GNU General Public License for more details.
- * 
- * You should have received a copy of the GNU General Public License
- * along with this program.  If not, see <https://www.gnu.org/licenses/>.
- */
+#
+# This file is part of <LogGenerator Pro>.
+#
+# <LogGenerator Pro> is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
 
 
 import base64
 import contextlib
 import glob
+import heapq
 import json
+import multiprocessing
 import os
 import re
 import shutil
 import struct
 import sys
+import threading
 import traceback
 import gc
+import urllib.request
 from collections import OrderedDict
 from datetime import datetime
 from enum import Enum
 from io import BytesIO
-from time import time
+from time import perf_counter, time
 
 # PyQt6 관련
 from PyQt6.QtCore import (
+    QAbstractAnimation,
+    QAbstractTableModel,
+    QEasingCurve,
+    QModelIndex,
+    QMimeData,
+    QObject,
+    QPropertyAnimation,
+    QRunnable,
     QSettings,
     QSize,
+    QSortFilterProxyModel,
     QStandardPaths,
     Qt,
+    QThreadPool,
     QTimer,
     pyqtSignal
 )
@@ -48,9 +62,16 @@ from PyQt6.QtGui import (
     QCursor,
     QFont,
     QIcon,
-    QPalette
+    QImage,
+    QPalette,
+    QSyntaxHighlighter,
+    QTextCharFormat,
+    QTextCursor,
+    QTextDocument,
+    QTextFrameFormat
 )
 from PyQt6.QtWidgets import (
+    QAbstractItemView,
     QApplication,
     QCheckBox,
     QColorDialog,
@@ -59,9 +80,11 @@ from PyQt6.QtWidgets import (
     QDialogButtonBox,
     QFileDialog,
     QFrame,
+    QGraphicsOpacityEffect,
     QGridLayout,
     QGroupBox,
     QHBoxLayout,
+    QHeaderView,
     QInputDialog,
     QLabel,
     QLineEdit,
@@ -76,6 +99,10 @@ from PyQt6.QtWidgets import (
     QSpinBox,
     QSplitter,
     QTabWidget,
+    QTableView,
+    QTableWidget,
+    QTableWidgetItem,
+    QTextBrowser,
     QTextEdit,
     QVBoxLayout,
     QWidget
@@ -84,6 +111,21 @@ from PyQt6.QtWidgets import (
 # 추가 라이브러리
 import zipfile
 
+# 렌더링 엔진
+from log_renderer import (
+    ImageDiskCache,
+    LogRenderer,
+    RenderDiskCache,
+    RenderSettings,
+    THEME_TEXT_COLORS,
+    TagStyle,
+    WordReplacer,
+    cache_stats,
+    extract_tag_identifier,
+    processed_line_tokens,
+    url_normalizer
+)
+
 
 
 class CacheManager:
@@ -93,189 +135,303 @@ class CacheManager:
         self.cache = OrderedDict()
         self.timestamps = {}
         self.templates = TEMPLATE_PRESETS.copy()
+        # 여러 스레드에서 함께 쓸 수 있도록 보호 (get/set 안에서 remove를 부르므로 재진입 잠금)
+        self.lock = threading.RLock()
         
     def get(self, key):
         """캐시에서 값 가져오기"""
-        try:
-            if key in self.cache:
-                # 만료 확인
-                if time() - self.timestamps[key] > self.max_age:
-                    self.remove(key)
-                    return None
+        with self.lock:
+            try:
+                if key in self.cache:
+                    # 만료 확인
+                    if time() - self.timestamps[key] > self.max_age:
+                        self.remove(key)
+                        return None
                     
-                # LRU 업데이트
-                self.cache.move_to_end(key)
-                return self.cache[key]
-            return None
+                    # LRU 업데이트
+                    self.cache.move_to_end(key)
+                    return self.cache[key]
+                return None
             
-        except Exception as e:
-            print(f"캐시 조회 중 오류: {str(e)}")
-            return None
+            except Exception as e:
+                print(f"캐시 조회 중 오류: {str(e)}")
+                return None
             
     def set(self, key, value):
         """캐시에 값 저장"""
-        try:
-            # 용량 초과 시 가장 오래된 항목 제거
-            if len(self.cache) >= self.max_size:
-                oldest_key = next(iter(self.cache))
-                self.remove(oldest_key)
+        with self.lock:
+            try:
+                # 용량 초과 시 가장 오래된 항목 제거
+                if len(self.cache) >= self.max_size:
+                    oldest_key = next(iter(self.cache))
+                    self.remove(oldest_key)
                 
-            self.cache[key] = value
-            self.timestamps[key] = time()
-            self.cache.move_to_end(key)
+                self.cache[key] = value
+                self.timestamps[key] = time()
+                self.cache.move_to_end(key)
             
-        except Exception as e:
-            print(f"캐시 저장 중 오류: {str(e)}")
+            except Exception as e:
+                print(f"캐시 저장 중 오류: {str(e)}")
             
     def remove(self, key):
         """캐시에서 항목 제거"""
-        try:
-            if key in self.cache:
-                del self.cache[key]
-                del self.timestamps[key]
+        with self.lock:
+            try:
+                if key in self.cache:
+                    del self.cache[key]
+                    del self.timestamps[key]
                 
-        except Exception as e:
-            print(f"캐시 항목 제거 중 오류: {str(e)}")
+            except Exception as e:
+                print(f"캐시 항목 제거 중 오류: {str(e)}")
             
     def clear(self):
         """캐시 전체 초기화"""
-        try:
-            self.cache.clear()
-            self.timestamps.clear()
+        with self.lock:
+            try:
+                self.cache.clear()
+                self.timestamps.clear()
             
-        except Exception as e:
-            print(f"캐시 초기화 중 오류: {str(e)}")
+            except Exception as e:
+                print(f"캐시 초기화 중 오류: {str(e)}")
             
     def cleanup_expired(self):
         """만료된 캐시 항목 정리"""
-        try:
-            current_time = time()
-            expired_keys = [
-                key for key, timestamp in self.timestamps.items()
-                if current_time - timestamp > self.max_age
-            ]
+        with self.lock:
+            try:
+                current_time = time()
+                expired_keys = [
+                    key for key, timestamp in self.timestamps.items()
+                    if current_time - timestamp > self.max_age
+                ]
             
-            for key in expired_keys:
-                self.remove(key)
+                for key in expired_keys:
+                    self.remove(key)
                 
-            return len(expired_keys)
+                return len(expired_keys)
             
-        except Exception as e:
-            print(f"만료 캐시 정리 중 오류: {str(e)}")
-            return 0
+            except Exception as e:
+                print(f"만료 캐시 정리 중 오류: {str(e)}")
+                return 0
             
     def get_stats(self):
         """캐시 상태 통계"""
-        try:
-            return {
-                'total_items': len(self.cache),
-                'max_size': self.max_size,
-                'current_size': len(self.cache),
-                'utilization': f"{(len(self.cache) / self.max_size * 100):.1f}%",
-                'oldest_item_age': time() - min(self.timestamps.values()) if self.timestamps else 0,
-                'newest_item_age': time() - max(self.timestamps.values()) if self.timestamps else 0
-            }
+        with self.lock:
+            try:
+                return {
+                    'total_items': len(self.cache),
+                    'max_size': self.max_size,
+                    'current_size': len(self.cache),
+                    'utilization': f"{(len(self.cache) / self.max_size * 100):.1f}%",
+                    'oldest_item_age': time() - min(self.timestamps.values()) if self.timestamps else 0,
+                    'newest_item_age': time() - max(self.timestamps.values()) if self.timestamps else 0
+                }
             
-        except Exception as e:
-            print(f"통계 수집 중 오류: {str(e)}")
-            return {}
+            except Exception as e:
+                print(f"통계 수집 중 오류: {str(e)}")
+                return {}
+
+class ImageCacheEntry:
+    """이미지 캐시 항목"""
+    __slots__ = ('data', 'size', 'timestamp', 'expires', 'seq')
+
+    def __init__(self, data, size, timestamp, expires, seq):
+        self.data = data
+        self.size = size            # 바이트 단위
+        self.timestamp = timestamp  # 저장 시각
+        self.expires = expires      # 만료 시각
+        self.seq = seq              # 만료 힙에서 현재 항목인지 확인하는 번호
+
 
 class ImageCacheManager(CacheManager):
-    """이미지 전용 캐시 매니저"""
+    """이미지 전용 캐시 매니저 (항목 수와 바이트 용량을 함께 제한하는 LRU)
+
+    항목은 사용 순서대로 OrderedDict에 두어 조회, 저장, 가장 오래 안 쓴 항목 제거가
+    모두 O(1)입니다. 만료는 (만료 시각, 번호, 키) 최소 힙으로 관리해서 만료된 항목만
+    꺼내 지우고, 지워지거나 교체된 항목의 힙 자리는 꺼낼 때 건너뜁니다.
+    용량 초과, 만료, 초기화로 항목이 빠지면 on_drop(키)을 호출해서, 같은 이미지를
+    따로 들고 있는 쪽(미리보기 문서)도 놓을 수 있게 합니다.
+    모든 메서드는 CacheManager의 재진입 잠금 안에서 실행됩니다.
+    """
     def __init__(self, max_size=50, max_age=3600*24, max_total_size_mb=100):
         super().__init__(max_size, max_age)
         self.total_size = 0  # 바이트 단위
         self.max_total_size = max_total_size_mb * 1024 * 1024  # MB를 바이트로 변환
-        
+        self.expiry_heap = []
+        self.seq = 0
+        self.on_drop = None  # 항목이 빠질 때 호출할 함수 (키)
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.lookup_time = 0.0
+
+    @staticmethod
+    def sizeof(value):
+        """캐시 값의 바이트 크기 (QImage, bytes, 문자열 지원)"""
+        if hasattr(value, 'sizeInBytes'):
+            return value.sizeInBytes()
+        if isinstance(value, str):
+            return len(value.encode('utf-8'))
+        return len(value)
+
+    def get(self, key):
+        """캐시에서 값 가져오기 (만료된 항목은 지우고 None)"""
+        with self.lock:
+            start = perf_counter()
+            try:
+                return self._get(key)
+            finally:
+                self.lookup_time += perf_counter() - start
+
+    def _get(self, key):
+        entry = self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if time() >= entry.expires:
+            self.remove(key)
+            self.expirations += 1
+            self.misses += 1
+            self._dropped(key)
+            return None
+
+        self.cache.move_to_end(key)
+        self.hits += 1
+        return entry.data
+
     def set(self, key, image_data):
         """이미지 데이터 캐시 저장"""
-        if not image_data:
-            return
-            
-        try:
-            data_size = len(image_data)
-            
+        with self.lock:
+            if not image_data:
+                return
+
+            data_size = self.sizeof(image_data)
+
             # 새 데이터가 최대 크기를 초과하는 경우
             if data_size > self.max_total_size:
                 raise ValueError("이미지가 최대 허용 크기를 초과합니다")
-            
+
+            # 같은 키는 교체 (제거 통계에는 넣지 않음)
+            self.remove(key)
+
             # 공간 확보
             self._ensure_space_available(data_size)
-            
+
             # 새 항목 추가
-            super().set(key, image_data)
+            now = time()
+            self.seq += 1
+            entry = ImageCacheEntry(image_data, data_size, now, now + self.max_age, self.seq)
+            self.cache[key] = entry
             self.total_size += data_size
-            
-        except Exception as e:
-            logger.error(f"이미지 캐시 저장 중 오류: {str(e)}")
-            raise
-            
+            heapq.heappush(self.expiry_heap, (entry.expires, entry.seq, key))
+
+            # 지워진 항목의 힙 자리가 많이 쌓이면 다시 구성
+            if len(self.expiry_heap) > 2 * len(self.cache) + 64:
+                self.expiry_heap = [(e.expires, e.seq, k) for k, e in self.cache.items()]
+                heapq.heapify(self.expiry_heap)
+
     def _ensure_space_available(self, required_size):
-        """필요한 공간을 확보하기 위해 오래된 항목들을 제거"""
-        while self.cache and self.total_size + required_size > self.max_total_size:
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k].timestamp)
-            self.remove(oldest_key)
-            
+        """항목 수와 용량 한도 안에 들도록 가장 오래 안 쓴 항목부터 제거"""
+        while self.cache and (
+            len(self.cache) >= self.max_size
+            or self.total_size + required_size > self.max_total_size
+        ):
+            key, entry = self.cache.popitem(last=False)
+            self.total_size -= entry.size
+            self.evictions += 1
+            self._dropped(key)
+
+    def _dropped(self, key):
+        """용량 초과나 만료로 빠진 항목 알림"""
+        if self.on_drop is not None:
+            self.on_drop(key)
+
     def remove(self, key):
         """이미지 캐시 항목 제거"""
-        try:
-            if key in self.cache:
-                self.total_size -= len(self.cache[key].data)
-                super().remove(key)
-                
-        except Exception as e:
-            logger.error(f"이미지 캐시 제거 중 오류: {str(e)}")
-            
+        with self.lock:
+            entry = self.cache.pop(key, None)
+            if entry is not None:
+                self.total_size -= entry.size
+
+    def clear(self):
+        """캐시 전체 초기화 (통계 포함)"""
+        with self.lock:
+            keys = list(self.cache)
+            self.cache.clear()
+            self.expiry_heap.clear()
+            self.total_size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+            self.lookup_time = 0.0
+            for key in keys:
+                self._dropped(key)
+
     def cleanup_expired(self):
-        """만료된 캐시 항목 정리"""
-        try:
-            cleaned_count = 0
-            current_time = time.time()
-            
-            # 만료된 항목들을 찾아서 제거
-            expired_keys = [
-                key for key, item in self.cache.items()
-                if current_time - item.timestamp > self.max_age
-            ]
-            
-            for key in expired_keys:
-                self.remove(key)
-                cleaned_count += 1
-                
-            if cleaned_count > 0:
-                logger.info(f"캐시 정리 완료: {cleaned_count}개 항목 제거")
-                logger.debug(f"현재 캐시 상태: {self.get_stats()}")
-                
-            return cleaned_count
-            
-        except Exception as e:
-            logger.error(f"캐시 정리 중 오류: {str(e)}")
-            return 0
-            
+        """만료된 캐시 항목 정리 (만료된 항목 수만큼만 처리)"""
+        with self.lock:
+            try:
+                cleaned_count = 0
+                current_time = time()
+                heap = self.expiry_heap
+
+                while heap and heap[0][0] <= current_time:
+                    _, seq, key = heapq.heappop(heap)
+                    entry = self.cache.get(key)
+                    if entry is not None and entry.seq == seq:
+                        self.remove(key)
+                        cleaned_count += 1
+                        self._dropped(key)
+
+                self.expirations += cleaned_count
+                return cleaned_count
+
+            except Exception as e:
+                print(f"캐시 정리 중 오류: {str(e)}")
+                return 0
+
+    def next_expiry(self):
+        """다음 항목이 만료될 때까지 남은 초 (항목이 없으면 None)"""
+        with self.lock:
+            heap = self.expiry_heap
+            while heap:
+                expires, seq, key = heap[0]
+                entry = self.cache.get(key)
+                if entry is not None and entry.seq == seq:
+                    return max(0.0, expires - time())
+                heapq.heappop(heap)
+            return None
+
     def get_stats(self):
         """이미지 캐시 상태 통계"""
-        try:
-            stats = super().get_stats()
-            current_time = time.time()
-            
-            # 기존 통계에 이미지 관련 정보 추가
-            image_stats = {
-                'total_size_mb': f"{self.total_size / 1024 / 1024:.2f}MB",
-                'max_size_mb': f"{self.max_total_size / 1024 / 1024:.2f}MB",
-                'size_utilization': f"{(self.total_size / self.max_total_size * 100):.1f}%",
-                'items_age_stats': {
-                    'min': min((current_time - item.timestamp for item in self.cache.values()), default=0),
-                    'max': max((current_time - item.timestamp for item in self.cache.values()), default=0),
-                    'avg': sum((current_time - item.timestamp for item in self.cache.values()), default=0) / len(self.cache) if self.cache else 0
-                }
-            }
-            
-            stats.update(image_stats)
-            return stats
-            
-        except Exception as e:
-            logger.error(f"이미지 캐시 통계 수집 중 오류: {str(e)}")
-            return {}            
+        with self.lock:
+            try:
+                current_time = time()
+                ages = [current_time - entry.timestamp for entry in self.cache.values()]
+                stats = cache_stats(
+                    len(self.cache), self.total_size, self.hits, self.misses, self.evictions, self.lookup_time
+                )
+                stats.update({
+                    'total_items': len(self.cache),
+                    'max_size': self.max_size,
+                    'current_size': len(self.cache),
+                    'utilization': f"{(len(self.cache) / self.max_size * 100):.1f}%",
+                    'oldest_item_age': max(ages, default=0),
+                    'newest_item_age': min(ages, default=0),
+                    'total_size_mb': self.total_size / 1024 / 1024,
+                    'max_size_mb': self.max_total_size / 1024 / 1024,
+                    'size_utilization': f"{(self.total_size / self.max_total_size * 100):.1f}%",
+                    'expirations': self.expirations,
+                })
+                return stats
+
+            except Exception as e:
+                print(f"통계 수집 중 오류: {str(e)}")
+                return {}
 
 
 class ErrorSeverity(Enum):
@@ -393,6 +549,207 @@ class ErrorHandler:
             print(f"로그 기록 실패: {str(e)}")
 
 
+class ListModel(QObject):
+    """위젯과 분리된 목록 데이터 모델
+
+    항목은 키로 구분하며 추가한 순서를 유지합니다. 값이 바뀔 때마다 버전이 올라가고
+    changed 시그널이 발생합니다. 위젯은 항목을 보여주고 고치는 뷰일 뿐이고,
+    변환할 때는 위젯 트리를 훑지 않고 버전마다 한 번만 계산된 데이터를 읽습니다.
+    """
+    changed = pyqtSignal(int)  # 새 버전 번호
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = {}    # 항목 키 → 값
+        self._next_key = 0
+        self._derived = {}  # 현재 버전에서 계산해 둔 데이터
+        self.version = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def keys(self):
+        return list(self._items)
+
+    def values(self):
+        return list(self._items.values())
+
+    def get(self, key, default=None):
+        return self._items.get(key, default)
+
+    def add(self, value):
+        """항목 추가 후 키 반환"""
+        key = self._next_key
+        self._next_key += 1
+        self._items[key] = value
+        self._bump()
+        return key
+
+    def extend(self, values):
+        """여러 항목을 한 번의 변경으로 추가 후 키 목록 반환"""
+        keys = []
+        for value in values:
+            keys.append(self._next_key)
+            self._items[self._next_key] = value
+            self._next_key += 1
+        if keys:
+            self._bump()
+        return keys
+
+    def update(self, key, value):
+        """항목 값 변경 (같은 값이면 무시)"""
+        if key in self._items and self._items[key] != value:
+            self._items[key] = value
+            self._bump()
+
+    def remove(self, key):
+        """항목 삭제 (없는 키는 무시)"""
+        if key in self._items:
+            del self._items[key]
+            self._bump()
+
+    def clear(self):
+        """모든 항목 삭제"""
+        if self._items:
+            self._items.clear()
+            self._bump()
+
+    def derived(self, name, build):
+        """현재 버전에서 한 번만 계산되는 파생 데이터"""
+        if name not in self._derived:
+            self._derived[name] = build(self.values())
+        return self._derived[name]
+
+    def bind(self, entry, read_value, changed_signal):
+        """위젯을 항목 하나의 뷰로 연결 (위젯 변경 → 값 갱신, 위젯 제거 → 항목 삭제)"""
+        key = self.add(read_value())
+        changed_signal.connect(lambda *args: self.update(key, read_value()))
+        entry.removed.connect(lambda: self.remove(key))
+        return key
+
+    def _bump(self):
+        self.version += 1
+        self._derived.clear()
+        self.changed.emit(self.version)
+
+
+class ImageMappingModel(ListModel):
+    """이미지 매핑 모델 (값: (태그, URL))"""
+
+    def pairs(self):
+        """태그와 URL이 모두 있는 (태그, URL) 쌍 튜플"""
+        return self.derived('pairs', lambda values: tuple((tag, url) for tag, url in values if tag and url))
+
+    def mapping(self):
+        """태그 → URL 딕셔너리 (같은 태그는 나중 항목 우선)"""
+        return self.derived('mapping', lambda values: dict(self.pairs()))
+
+
+class ImageMappingTableModel(QAbstractTableModel):
+    """이미지 매핑 모델을 표로 보여주는 Qt 모델
+
+    QTableView는 화면에 보이는 행만 그리고 편집기도 편집할 때만 만들므로,
+    매핑이 수천 개여도 위젯을 만드는 비용이 들지 않습니다.
+    """
+    HEADERS = ("이미지 태그", "이미지 URL")
+    edited = pyqtSignal(int, int)  # 사용자가 편집한 행, 열
+
+    def __init__(self, mapping_model, parent=None):
+        super().__init__(parent)
+        self.mapping_model = mapping_model
+        self._keys = mapping_model.keys()  # 행 → 항목 키
+        self._updating = False             # 이 모델이 직접 바꾸는 중이면 초기화 생략
+        mapping_model.changed.connect(self._on_model_changed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        return self.mapping_model.get(self._keys[index.row()], ('', ''))[index.column()]
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+
+        pair = list(self.pair_at(index.row()))
+        pair[index.column()] = str(value).strip()
+        self.set_pair(index.row(), tuple(pair))
+        self.edited.emit(index.row(), index.column())
+        return True
+
+    def pair_at(self, row):
+        return self.mapping_model.get(self._keys[row], ('', ''))
+
+    def set_pair(self, row, pair):
+        """행의 (태그, URL) 변경 (표 전체를 다시 그리지 않음)"""
+        self._updating = True
+        try:
+            self.mapping_model.update(self._keys[row], pair)
+        finally:
+            self._updating = False
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def add_row(self, tag='', url=''):
+        """행 하나 추가 후 행 번호 반환"""
+        row = len(self._keys)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._updating = True
+        try:
+            self._keys.append(self.mapping_model.add((tag.strip(), url.strip())))
+        finally:
+            self._updating = False
+        self.endInsertRows()
+        return row
+
+    def remove_rows(self, rows):
+        """여러 행 삭제 (뒤에서부터 지워 행 번호 유지)"""
+        self._updating = True
+        try:
+            for row in sorted(set(rows), reverse=True):
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self.mapping_model.remove(self._keys.pop(row))
+                self.endRemoveRows()
+        finally:
+            self._updating = False
+
+    def _on_model_changed(self, version):
+        """다른 곳에서 모델을 바꾸면 (불러오기, 초기화 등) 표 전체 갱신"""
+        if self._updating:
+            return
+        self.beginResetModel()
+        self._keys = self.mapping_model.keys()
+        self.endResetModel()
+
+
+class WordReplaceModel(ListModel):
+    """단어 변경 모델 (값: (변환할 단어, 변환될 단어, 정규식 여부))"""
+
+    def rules(self):
+        """변환할 단어가 있는 규칙 튜플"""
+        return self.derived('rules', lambda values: tuple(rule for rule in values if rule[0]))
+
+
+class TagModel(ListModel):
+    """태그 모델 (값: TagEntry.get_style_dict() 형식의 딕셔너리)"""
+
+    def styles(self):
+        """렌더링용 TagStyle 튜플"""
+        return self.derived('styles', lambda values: tuple(TagStyle.from_dict(value) for value in values))
+
+
 class ResourceManager:
     def __init__(self, main_window):
         self.main_window = main_window
@@ -410,9 +767,8 @@ class ResourceManager:
         """리소스 정리"""
         try:
             # 1. 먼저 타이머 정리
-            if hasattr(self.main_window, 'preview_timer'):
-                self.main_window.preview_timer.stop()
-                self.main_window.preview_timer.deleteLater()
+            if hasattr(self.main_window, 'preview_scheduler'):
+                self.main_window.preview_scheduler.stop()
                 
             if hasattr(self.main_window, 'auto_save_timer'):
                 self.main_window.auto_save_timer.stop()
@@ -879,51 +1235,51 @@ class TemplateManager:
 
             template = self.templates[template_name]["theme"]["colors"]
             
-            # 기존 색상 설정 적용
-            self.main_window.outer_box_color.setColor(template["outer_box"])
-            self.main_window.inner_box_color.setColor(template["inner_box"])
-            self.main_window.bot_name_color.setColor(template["bot_name"])
-            self.main_window.dialog_color.setColor(template["dialog"])
-            self.main_window.narration_color.setColor(template["narration"])
-            self.main_window.profile_border_color.setColor(template["profile_border"])
-            self.main_window.divider_outer_color.setColor(template["divider_outer"])
-            self.main_window.divider_inner_color.setColor(template["divider_inner"])
-            
-            # 새로 추가된 색상 설정 적용
-            if hasattr(self.main_window, 'inner_thoughts_color'):
-                self.main_window.inner_thoughts_color.setColor(template["inner_thoughts"])
-            if hasattr(self.main_window, 'box_border_color'):
-                self.main_window.box_border_color.setColor(template["box_border"])
-            if hasattr(self.main_window, 'image_border_color'):
-                self.main_window.image_border_color.setColor(template["image_border"])
-
-            # 태그 색상 및 스타일 적용
-            tags = self.templates[template_name]["theme"]["tags"]
-            
-            # 태그 영역의 모든 TagEntry 위젯 찾기
-            tag_entries = self.main_window.findChildren(TagEntry)
-            
-            # 각 태그 엔트리에 템플릿 스타일 적용
-            for i, tag_entry in enumerate(tag_entries):
-                if i < len(tags):
-                    tag_data = tags[i]
-                    # 배경색 설정
-                    tag_entry.color_btn.setColor(tag_data["color"])
-                    # 텍스트 색상 설정
-                    tag_entry.text_color_btn.setColor(tag_data["text_color"])
-                    # 테두리 색상이 있는 경우 설정
-                    if "border_color" in tag_data:
-                        tag_entry.border_color = tag_data["border_color"]
-                    # 스타일 콤보박스가 있는 경우 템플릿의 스타일로 설정
-                    if hasattr(tag_entry, 'style_combo'):
-                        style = tag_data.get("style", "기본")
-                        index = tag_entry.style_combo.findText(style)
-                        if index >= 0:
-                            tag_entry.style_combo.setCurrentIndex(index)
-
-            # 메인 윈도우의 미리보기 업데이트
-            self.main_window.update_preview()
-            
+            with self.main_window.settings_transaction():
+                # 기존 색상 설정 적용
+                self.main_window.outer_box_color.setColor(template["outer_box"])
+                self.main_window.inner_box_color.setColor(template["inner_box"])
+                self.main_window.bot_name_color.setColor(template["bot_name"])
+                self.main_window.dialog_color.setColor(template["dialog"])
+                self.main_window.narration_color.setColor(template["narration"])
+                self.main_window.profile_border_color.setColor(template["profile_border"])
+                self.main_window.divider_outer_color.setColor(template["divider_outer"])
+                self.main_window.divider_inner_color.setColor(template["divider_inner"])
+            
+                # 새로 추가된 색상 설정 적용
+                if hasattr(self.main_window, 'inner_thoughts_color'):
+                    self.main_window.inner_thoughts_color.setColor(template["inner_thoughts"])
+                if hasattr(self.main_window, 'box_border_color'):
+                    self.main_window.box_border_color.setColor(template["box_border"])
+                if hasattr(self.main_window, 'image_border_color'):
+                    self.main_window.image_border_color.setColor(template["image_border"])
+
+                # 태그 색상 및 스타일 적용
+                tags = self.templates[template_name]["theme"]["tags"]
+            
+                # 태그 영역의 TagEntry 위젯 (태그 레이아웃 순서)
+                tag_entries = self.main_window.tag_entries()
+            
+                # 각 태그 엔트리에 템플릿 스타일 적용
+                for i, tag_entry in enumerate(tag_entries):
+                    if i < len(tags):
+                        tag_data = tags[i]
+                        # 배경색 설정
+                        tag_entry.color_btn.setColor(tag_data["color"])
+                        # 텍스트 색상 설정
+                        tag_entry.text_color_btn.setColor(tag_data["text_color"])
+                        # 테두리 색상이 있는 경우 설정
+                        if "border_color" in tag_data:
+                            tag_entry.border_color = tag_data["border_color"]
+                        # 스타일 콤보박스가 있는 경우 템플릿의 스타일로 설정
+                        if hasattr(tag_entry, 'style_combo'):
+                            style = tag_data.get("style", "기본")
+                            index = tag_entry.style_combo.findText(style)
+                            if index >= 0:
+                                tag_entry.style_combo.setCurrentIndex(index)
+                        # 색상 버튼 변경은 시그널이 없으므로 모델에 직접 반영
+                        tag_entry.on_tag_changed()
+
             return True
 
         except Exception as e:
@@ -1000,7 +1356,9 @@ class TextSettingsManager:
                     'use_text_size': self.main_window.use_text_size.isChecked(),
                     'text_size': self.main_window.text_size.value(),
                     'use_text_indent': self.main_window.use_text_indent.isChecked(),
-                    'use_padding': self.main_window.use_padding.isChecked()  # 여백 설정 추가
+                    'use_padding': self.main_window.use_padding.isChecked(),  # 여백 설정 추가
+                    'compact_output': self.main_window.compact_output.isChecked(),
+                    'use_style_classes': self.main_window.use_style_classes.isChecked()
                 }
                 self.settings[name] = current_settings
                 self.save_settings()
@@ -1029,25 +1387,28 @@ class TextSettingsManager:
 
             settings = self.settings[name]
             
-            # 설정 적용
-            self.main_window.text_indent.setValue(settings['text_indent'])
-            self.main_window.dialog_color.setColor(settings['dialog_color'])
-            self.main_window.narration_color.setColor(settings['narration_color'])
-            self.main_window.inner_thoughts_color.setColor(settings.get('inner_thoughts_color', '#718096'))
-            self.main_window.dialog_bold.setChecked(settings['dialog_bold'])
-            self.main_window.dialog_newline.setChecked(settings.get('dialog_newline', True))  # 대화문 줄바꿈 설정 로드
-            self.main_window.inner_thoughts_bold.setChecked(settings.get('inner_thoughts_bold', False))
-            self.main_window.remove_asterisk.setChecked(settings['remove_asterisk'])
-            self.main_window.convert_ellipsis.setChecked(settings['convert_ellipsis'])
-            self.main_window.use_text_size.setChecked(settings['use_text_size'])
-            self.main_window.text_size.setValue(settings['text_size'])
-            self.main_window.use_text_indent.setChecked(settings['use_text_indent'])
-            self.main_window.use_padding.setChecked(settings.get('use_padding', True))  # 여백 설정 로드
-
-            # UI 상태 업데이트
-            self.main_window.update_text_size_state()
-            self.main_window.update_indent_state()
-            self.main_window.update_preview()
+            with self.main_window.settings_transaction():
+                # 설정 적용
+                self.main_window.text_indent.setValue(settings['text_indent'])
+                self.main_window.dialog_color.setColor(settings['dialog_color'])
+                self.main_window.narration_color.setColor(settings['narration_color'])
+                self.main_window.inner_thoughts_color.setColor(settings.get('inner_thoughts_color', '#718096'))
+                self.main_window.dialog_bold.setChecked(settings['dialog_bold'])
+                self.main_window.dialog_newline.setChecked(settings.get('dialog_newline', True))  # 대화문 줄바꿈 설정 로드
+                self.main_window.inner_thoughts_bold.setChecked(settings.get('inner_thoughts_bold', False))
+                self.main_window.remove_asterisk.setChecked(settings['remove_asterisk'])
+                self.main_window.convert_ellipsis.setChecked(settings['convert_ellipsis'])
+                self.main_window.use_text_size.setChecked(settings['use_text_size'])
+                self.main_window.text_size.setValue(settings['text_size'])
+                self.main_window.use_text_indent.setChecked(settings['use_text_indent'])
+                self.main_window.use_padding.setChecked(settings.get('use_padding', True))  # 여백 설정 로드
+                self.main_window.compact_output.setChecked(settings.get('compact_output', False))
+                self.main_window.use_style_classes.setChecked(settings.get('use_style_classes', False))
+
+                # UI 상태 업데이트
+                self.main_window.update_text_size_state()
+                self.main_window.update_indent_state()
+                self.main_window.update_compact_output_state()
 
             QMessageBox.information(
                 self.main_window,
@@ -1150,43 +1511,43 @@ class ProfileManager:
             with open(file_path, 'r', encoding='utf-8') as f:
                 profile_data = json.load(f)
 
-            # 기존 프로필 데이터 로드
-            self.main_window.bot_name.setText(profile_data.get('bot_name', ''))
-            self.main_window.bot_name_color.setColor(profile_data.get('bot_name_color', '#4a4a4a'))
-            self.main_window.show_profile.setChecked(profile_data.get('show_profile', True))
-            self.main_window.show_profile_image.setChecked(profile_data.get('show_profile_image', True))
-            self.main_window.show_bot_name.setChecked(profile_data.get('show_bot_name', True))
-            self.main_window.show_tags.setChecked(profile_data.get('show_tags', True))
-            self.main_window.show_divider.setChecked(profile_data.get('show_divider', True))
-            
-            # 프레임 스타일과 크기 설정 순서 변경
-            size_settings = profile_data.get('size_settings', {})
-            
-            # 먼저 프레임 스타일 설정
-            self.main_window.frame_style.setCurrentText(size_settings.get('frame_style', '동그라미'))
-            
-            # 그 다음 저장된 크기 값 설정
-            self.main_window.width_input.setValue(size_settings.get('width', 80))
-            self.main_window.height_input.setValue(size_settings.get('height', 80))
-            
-            # 나머지 설정들 로드
-            self.main_window.image_url.setText(profile_data.get('image_url', ''))
-            self.main_window.profile_border_color.setColor(profile_data.get('profile_border_color', '#ffffff'))
-            self.main_window.show_profile_border.setChecked(profile_data.get('show_profile_border', True))
-            self.main_window.show_profile_shadow.setChecked(profile_data.get('show_profile_shadow', True))
-
-            # 구분선 설정 로드
-            self.main_window.divider_style.setCurrentText(profile_data.get('divider_style', '그라데이션'))
-            self.main_window.divider_thickness.setValue(profile_data.get('divider_thickness', 1))
-            self.main_window.divider_outer_color.setColor(profile_data.get('divider_outer_color', STYLES['divider_outer_color']))
-            self.main_window.divider_inner_color.setColor(profile_data.get('divider_inner_color', STYLES['divider_inner_color']))
-            self.main_window.divider_solid_color.setColor(profile_data.get('divider_solid_color', STYLES['divider_outer_color']))
-
-            # UI 상태 업데이트
-            self.main_window.update_profile_element_states()
-            self.main_window.update_profile_style_states()
-            self.main_window.toggle_divider_color_settings(self.main_window.divider_style.currentText())
-            self.main_window.update_preview()
+            with self.main_window.settings_transaction():
+                # 기존 프로필 데이터 로드
+                self.main_window.bot_name.setText(profile_data.get('bot_name', ''))
+                self.main_window.bot_name_color.setColor(profile_data.get('bot_name_color', '#4a4a4a'))
+                self.main_window.show_profile.setChecked(profile_data.get('show_profile', True))
+                self.main_window.show_profile_image.setChecked(profile_data.get('show_profile_image', True))
+                self.main_window.show_bot_name.setChecked(profile_data.get('show_bot_name', True))
+                self.main_window.show_tags.setChecked(profile_data.get('show_tags', True))
+                self.main_window.show_divider.setChecked(profile_data.get('show_divider', True))
+            
+                # 프레임 스타일과 크기 설정 순서 변경
+                size_settings = profile_data.get('size_settings', {})
+            
+                # 먼저 프레임 스타일 설정
+                self.main_window.frame_style.setCurrentText(size_settings.get('frame_style', '동그라미'))
+            
+                # 그 다음 저장된 크기 값 설정
+                self.main_window.width_input.setValue(size_settings.get('width', 80))
+                self.main_window.height_input.setValue(size_settings.get('height', 80))
+            
+                # 나머지 설정들 로드
+                self.main_window.image_url.setText(profile_data.get('image_url', ''))
+                self.main_window.profile_border_color.setColor(profile_data.get('profile_border_color', '#ffffff'))
+                self.main_window.show_profile_border.setChecked(profile_data.get('show_profile_border', True))
+                self.main_window.show_profile_shadow.setChecked(profile_data.get('show_profile_shadow', True))
+
+                # 구분선 설정 로드
+                self.main_window.divider_style.setCurrentText(profile_data.get('divider_style', '그라데이션'))
+                self.main_window.divider_thickness.setValue(profile_data.get('divider_thickness', 1))
+                self.main_window.divider_outer_color.setColor(profile_data.get('divider_outer_color', STYLES['divider_outer_color']))
+                self.main_window.divider_inner_color.setColor(profile_data.get('divider_inner_color', STYLES['divider_inner_color']))
+                self.main_window.divider_solid_color.setColor(profile_data.get('divider_solid_color', STYLES['divider_outer_color']))
+
+                # UI 상태 업데이트
+                self.main_window.update_profile_element_states()
+                self.main_window.update_profile_style_states()
+                self.main_window.toggle_divider_color_settings(self.main_window.divider_style.currentText())
             
             return True, f"프로필 세트 '{name}'을(를) 불러왔습니다."
             
@@ -1294,18 +1655,35 @@ class WordReplaceManager:
         )
         os.makedirs(os.path.dirname(self.word_sets_file), exist_ok=True)
 
+    def add_entry(self, from_word='', to_word='', use_regex=False):
+        """단어 변경 입력 항목 추가"""
+        entry = WordReplaceEntry(self.main_window.word_replace_container)
+        entry.from_word.setText(from_word)
+        entry.to_word.setText(to_word)
+        entry.use_regex.setChecked(use_regex)
+        self.main_window.word_replace_model.bind(
+            entry, entry.get_replacement_rule, entry.replacementChanged
+        )
+        self.main_window.word_replace_layout.addWidget(entry)
+        return entry
+
+    def get_rules(self):
+        """현재 단어 변경 규칙 튜플 (변경이 없으면 같은 객체 반환)"""
+        return self.main_window.word_replace_model.rules()
+
     def save_word_set(self, name):
         """현재 단어 변경 설정을 저장"""
         try:
             # 단어 변경 데이터 수집
             word_pairs = []
-            for entry in self.main_window.word_replace_container.findChildren(WordReplaceEntry):
-                from_word = entry.from_word.text().strip()
-                to_word = entry.to_word.text().strip()
+            for from_word, to_word, use_regex in self.main_window.word_replace_model.values():
+                from_word = from_word.strip()
+                to_word = to_word.strip()
                 if from_word or to_word:  # 둘 중 하나라도 있으면 저장
                     word_pairs.append({
                         'from': from_word,
-                        'to': to_word
+                        'to': to_word,
+                        'regex': use_regex
                     })
 
             if not word_pairs:
@@ -1334,15 +1712,14 @@ class WordReplaceManager:
             # 기존 항목 제거
             for i in reversed(range(self.main_window.word_replace_layout.count())):
                 widget = self.main_window.word_replace_layout.itemAt(i).widget()
-                if widget:
+                if isinstance(widget, WordReplaceEntry):
+                    widget.remove_self()
+                elif widget:
                     widget.deleteLater()
 
             # 새 항목 추가
             for pair in word_pairs:
-                entry = WordReplaceEntry(self.main_window.word_replace_container)
-                entry.from_word.setText(pair.get('from', ''))
-                entry.to_word.setText(pair.get('to', ''))
-                self.main_window.word_replace_layout.addWidget(entry)
+                self.add_entry(pair.get('from', ''), pair.get('to', ''), pair.get('regex', False))
 
             return True, f"단어 변경 세트 '{name}'을(를) 불러왔습니다."
         except Exception as e:
@@ -1485,15 +1862,11 @@ class MappingManager:
         """현재 매핑 세트를 저장"""
         try:
             # 매핑 데이터 수집
-            mappings = []
-            for entry in self.parent.image_url_container.findChildren(ImageUrlEntry):
-                tag = entry.tag_input.text().strip()
-                url = entry.url_input.text().strip()
-                if tag and url:  # 태그와 URL이 모두 있는 경우만 저장
-                    mappings.append({
-                        'tag': tag,
-                        'url': url
-                    })
+            # 태그와 URL이 모두 있는 경우만 저장
+            mappings = [
+                {'tag': tag, 'url': url}
+                for tag, url in self.parent.image_mapping_model.pairs()
+            ]
 
             if not mappings:
                 raise ValueError("저장할 매핑이 없습니다.")
@@ -1519,14 +1892,12 @@ class MappingManager:
                 mappings = json.load(f)
 
             # 기존 매핑 제거
-            for widget in self.parent.image_url_container.findChildren(ImageUrlEntry):
-                widget.deleteLater()
+            self.parent.clear_image_url_entries()
 
             # 새 매핑 추가
-            for mapping in mappings:
-                entry = ImageUrlEntry(self.parent.image_url_container)
-                entry.from_dict(mapping)
-                self.parent.image_url_layout.addWidget(entry)
+            self.parent.image_mapping_model.extend(
+                (mapping.get('tag', '').strip(), mapping.get('url', '').strip()) for mapping in mappings
+            )
 
             return True, f"매핑 세트 '{name}'을(를) 불러왔습니다."
         except Exception as e:
@@ -1628,6 +1999,9 @@ class CharacterCardHandler:
         self.character_data = None
         self.image_data = {}
         self.image_uri_map = {}
+        self.hits = 0
+        self.misses = 0
+        self.lookup_time = 0.0
         self.assets_folder = os.path.join(
             QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation),
             'temp_assets'
@@ -1922,7 +2296,7 @@ class CharacterCardHandler:
             # 매핑 검증
             print("\nMapping verification:")
             for asset_name, key in self.image_uri_map.items():
-                img_data = self.image_data.get(key)
+                img_data = self.get_image(key)
                 if img_data:
                     print(f"Verified: {asset_name} -> {key} ({len(img_data)} bytes)")
                 else:
@@ -1935,6 +2309,24 @@ class CharacterCardHandler:
             traceback.print_exc()
             return False
 
+    def get_image(self, key):
+        """에셋 이미지 데이터 조회 (없으면 None)"""
+        start = perf_counter()
+        data = self.image_data.get(key)
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.lookup_time += perf_counter() - start
+        return data
+
+    def get_stats(self):
+        """카드 에셋 캐시 통계"""
+        values = list(self.image_data.values())
+        return cache_stats(
+            len(values), sum(len(value) for value in values), self.hits, self.misses, 0, self.lookup_time
+        )
+
     def debug_print_asset_info(self):
         """에셋 정보 출력 (디버깅용)"""
         print("\n=== Asset Debug Information ===")
@@ -2104,6 +2496,7 @@ class PresetManager:
                     'use_box_border': self.main_window.use_box_border.isChecked(),
                     'box_border_thickness': self.main_window.box_border_thickness.value(),
                     'show_inner_box': self.main_window.show_inner_box.isChecked(),
+                    'minify_output': self.main_window.minify_output.isChecked(),
                     
                     # 프로필 설정 추가
                     'profile_settings': {
@@ -2152,63 +2545,63 @@ class PresetManager:
 
             settings = self.presets[name]
             
-            # 기존 색상 설정 적용
-            self.main_window.outer_box_color.setColor(settings['outer_box_color'])
-            self.main_window.inner_box_color.setColor(settings['inner_box_color'])
-            self.main_window.bot_name_color.setColor(settings['bot_name_color'])
-            self.main_window.dialog_color.setColor(settings['dialog_color'])
-            self.main_window.narration_color.setColor(settings['narration_color'])
-            self.main_window.profile_border_color.setColor(settings['profile_border_color'])
-            self.main_window.divider_outer_color.setColor(settings['divider_outer_color'])
-            self.main_window.divider_inner_color.setColor(settings['divider_inner_color'])
-            self.main_window.divider_solid_color.setColor(settings['divider_solid_color'])
-            self.main_window.image_border_color.setColor(settings['image_border_color'])
-
-            # 새로 추가된 설정 적용
-            if 'inner_thoughts_color' in settings:
-                self.main_window.inner_thoughts_color.setColor(settings['inner_thoughts_color'])
-            if 'box_border_color' in settings:
-                self.main_window.box_border_color.setColor(settings['box_border_color'])
-            
-            # 체크박스 상태 적용
-            if 'inner_thoughts_bold' in settings:
-                self.main_window.inner_thoughts_bold.setChecked(settings['inner_thoughts_bold'])
-            if 'use_box_border' in settings:
-                self.main_window.use_box_border.setChecked(settings['use_box_border'])
-            if 'box_border_thickness' in settings:
-                self.main_window.box_border_thickness.setValue(settings['box_border_thickness'])
-            if 'show_inner_box' in settings:
-                self.main_window.show_inner_box.setChecked(settings['show_inner_box'])
-
-            # 태그 색상 적용
-            for i, color in enumerate(settings['tag_colors']):
-                if i < len(self.main_window.tag_colors):
-                    self.main_window.tag_colors[i].setColor(color)
-
-            # 프로필 설정 적용
-            if 'profile_settings' in settings:
-                profile = settings['profile_settings']
-                self.main_window.show_profile.setChecked(profile['show_profile'])
-                self.main_window.show_profile_image.setChecked(profile['show_profile_image'])
-                self.main_window.show_bot_name.setChecked(profile['show_bot_name'])
-                self.main_window.show_tags.setChecked(profile['show_tags'])
-                self.main_window.show_divider.setChecked(profile['show_divider'])
-                self.main_window.bot_name.setText(profile['bot_name'])
-                self.main_window.frame_style.setCurrentText(profile['frame_style'])
-                self.main_window.image_url.setText(profile['image_url'])
-                self.main_window.show_profile_border.setChecked(profile['show_profile_border'])
-                self.main_window.show_profile_shadow.setChecked(profile['show_profile_shadow'])
-                self.main_window.width_input.setValue(profile['width'])
-                self.main_window.height_input.setValue(profile['height'])
-                self.main_window.divider_style.setCurrentText(profile['divider_style'])
-                self.main_window.divider_thickness.setValue(profile['divider_thickness'])
-
-                # UI 상태 업데이트
-                self.main_window.update_profile_element_states()
-                self.main_window.update_profile_style_states()
-
-            # UI 업데이트
-            self.main_window.update_preview()
+            with self.main_window.settings_transaction():
+                # 기존 색상 설정 적용
+                self.main_window.outer_box_color.setColor(settings['outer_box_color'])
+                self.main_window.inner_box_color.setColor(settings['inner_box_color'])
+                self.main_window.bot_name_color.setColor(settings['bot_name_color'])
+                self.main_window.dialog_color.setColor(settings['dialog_color'])
+                self.main_window.narration_color.setColor(settings['narration_color'])
+                self.main_window.profile_border_color.setColor(settings['profile_border_color'])
+                self.main_window.divider_outer_color.setColor(settings['divider_outer_color'])
+                self.main_window.divider_inner_color.setColor(settings['divider_inner_color'])
+                self.main_window.divider_solid_color.setColor(settings['divider_solid_color'])
+                self.main_window.image_border_color.setColor(settings['image_border_color'])
+
+                # 새로 추가된 설정 적용
+                if 'inner_thoughts_color' in settings:
+                    self.main_window.inner_thoughts_color.setColor(settings['inner_thoughts_color'])
+                if 'box_border_color' in settings:
+                    self.main_window.box_border_color.setColor(settings['box_border_color'])
+            
+                # 체크박스 상태 적용
+                if 'inner_thoughts_bold' in settings:
+                    self.main_window.inner_thoughts_bold.setChecked(settings['inner_thoughts_bold'])
+                if 'use_box_border' in settings:
+                    self.main_window.use_box_border.setChecked(settings['use_box_border'])
+                if 'box_border_thickness' in settings:
+                    self.main_window.box_border_thickness.setValue(settings['box_border_thickness'])
+                if 'show_inner_box' in settings:
+                    self.main_window.show_inner_box.setChecked(settings['show_inner_box'])
+                if 'minify_output' in settings:
+                    self.main_window.minify_output.setChecked(settings['minify_output'])
+
+                # 태그 색상 적용
+                for i, color in enumerate(settings['tag_colors']):
+                    if i < len(self.main_window.tag_colors):
+                        self.main_window.tag_colors[i].setColor(color)
+
+                # 프로필 설정 적용
+                if 'profile_settings' in settings:
+                    profile = settings['profile_settings']
+                    self.main_window.show_profile.setChecked(profile['show_profile'])
+                    self.main_window.show_profile_image.setChecked(profile['show_profile_image'])
+                    self.main_window.show_bot_name.setChecked(profile['show_bot_name'])
+                    self.main_window.show_tags.setChecked(profile['show_tags'])
+                    self.main_window.show_divider.setChecked(profile['show_divider'])
+                    self.main_window.bot_name.setText(profile['bot_name'])
+                    self.main_window.frame_style.setCurrentText(profile['frame_style'])
+                    self.main_window.image_url.setText(profile['image_url'])
+                    self.main_window.show_profile_border.setChecked(profile['show_profile_border'])
+                    self.main_window.show_profile_shadow.setChecked(profile['show_profile_shadow'])
+                    self.main_window.width_input.setValue(profile['width'])
+                    self.main_window.height_input.setValue(profile['height'])
+                    self.main_window.divider_style.setCurrentText(profile['divider_style'])
+                    self.main_window.divider_thickness.setValue(profile['divider_thickness'])
+
+                    # UI 상태 업데이트
+                    self.main_window.update_profile_element_states()
+                    self.main_window.update_profile_style_states()
 
             QMessageBox.information(
                 self.main_window,
@@ -2280,12 +2673,7 @@ class TagManager:
         """현재 태그 세트를 저장"""
         try:
             # 태그 데이터 수집
-            tags = []
-            for i in range(self.main_window.tag_layout.count()):
-                widget = self.main_window.tag_layout.itemAt(i).widget()
-                if isinstance(widget, TagEntry):
-                    tag_data = widget.get_style_dict()
-                    tags.append(tag_data)
+            tags = self.main_window.tag_model.values()
 
             if not tags:
                 raise ValueError("저장할 태그가 없습니다.")
@@ -2311,16 +2699,11 @@ class TagManager:
                 tags = json.load(f)
 
             # 기존 태그 제거
-            while self.main_window.tag_layout.count():
-                widget = self.main_window.tag_layout.takeAt(0).widget()
-                if widget:
-                    widget.deleteLater()
+            self.main_window.clear_tags()
 
             # 새 태그 추가
             for tag_data in tags:
-                entry = TagEntry(self.main_window.tag_container)
-                entry.load_style_dict(tag_data)
-                self.main_window.tag_layout.addWidget(entry)
+                self.main_window.add_new_tag(tag_data)
 
             return True, f"태그 세트 '{name}'을(를) 불러왔습니다."
         except Exception as e:
@@ -2785,9 +3168,6 @@ TEMPLATE_PRESETS = {
 }
 
 
-# 기본 프로필 이미지 (placeholder)
-DEFAULT_PROFILE_IMAGE = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAGQAAABkCAYAAABw4pVUAAAABmJLR0QA/wD/AP+gvaeTAAAACXBIWXMAAAsTAAALEwEAmpwYAAAAB3RJTUUH4wYJBhYRN2n7qQAAAB1pVFh0Q29tbWVudAAAAAAAQ3JlYXRlZCB3aXRoIEdJTVBkLmUHAAAEiUlEQVR42u2dW2hcVRSGv3XOxEmTmTRp2kziJU0UqUVriy+CLxZfi1gUX3wTfPBJ8EkQwQteMFIfLFoQxQteMCJeULQoquKDgheCbdHWam0vMW3TJm0ymUzmnJk5e/kwt7SSOSdNOpN91v+0YQ577T3/f9bea6+99hgTExMTExMTExMTE5NbE2lNRapr+xUwD8gFEWB4dJQrAyfo6+1JXGsAD4vgSQgbj0EkLgcKqAocxeWkOJwgrr+1JR1CJovpKDxbgUfFY4vApgJJACIgHkioIghYgDCwLlCjsV4mE3YyELBDQRYEHVKOEhKQEYFMURaLsAhYPr5wYkBEGFOXIZcEtjE2DWgmWYagSEwGXWVxWvGKpcQR+qIW5wYsCm5K7DQXn4xSEu/Hw0J9LyeOg0e2RTgrmALZYEfIlDCHew6xvKjEpuXsKHiJcqNUqWAsEzFPt8QRxK+A/lCIU/lFtM8PsXdVmBdiZXyiNluIc6hrPxt6HYpkmGTa5CWbQ48cUBIFxMJjXuEALyaWcPp4DesWb2N/SnycGPPxqABfimIMSUBJpAYRDwXm5vXxQayaV2QZO4kTlJAvn7xgwqe3bkEAevKEJUWCiUQNIuCJ0lR3lb3HDpC32SZzk6QaE0EBRBhVDxEhLh4RD0Q9clQoFEhcwPd6BcwXGRIYU6VPhJj6FOARBo6ny9kYGuRo1zeMxEcoWxtlUEEFJKSAqjKkMKxCSISwQDEQUsETxRXBQ7BE8EQQVVxbKVCbEYHjwEsiZxAsgWVWnPq2GNUt7URo5GTNaZbVDnKnZdN0vJY3B7JZIw4t6pPGElx1cUUZE2FYlYgqloArQlCUAlXyVclWiKsyKoIliqseYVEUYVSVfhFCAlFVRgSiojjq4agQUyVPhDCAqBAVxRMlR4SQKq7CkAhRUVwRPIGwKo5ATABPsVWIq4cnQlCVuAoeEBTBUSWkEFElLEKBKDnq4QKOQESEYVXiqgQFwqpEFWSszTiqOCLY6hEX8LQ8hwc74OIcIVB9nJbmTr7rPMzg0EUcN0aWVo5n6AW27XB5YjfHA6V8r1kuEXFwhZAqriioKo4IUYGoCIUKeaqERMhWIU+VHFGGBIZViaq/fPl/OHIcXBRbBFshLkqOQESUiEJIBFuUQYVRVWz1CAmoCrZ6xFSxEQLqkSsQFigQxVXBFsUVGFPwRHBViSsEBBRBRQmJkqNg64R4iHi4ohQi2KLYAiEVXFVy1CMoSgQIihATxRXFq0mQHspmLmA8BRFQhJgqYVFsAVdASYiHCGFV8kSwx1NX4fV5ZrE9nMfF+BD5JQrFDsUWBEUIixBTxRbBBkSUMYGQKA5gixJXJSxQKEKY8fM4FWwEVyAmQlyEkCpxEYIK+QIB9chRGD/pE2KixFUJq2IrBEQJiRBRZUQgJEJQwRMQEYbVI6Yg6hFQwEU8EWyBoCqOQFggR5SQguv5OxGDIgQEHBWiAjGBoHrkC4RFGQMiAgHAdYW5IgSBEQHiEMWlQqBIICJCXAVHYNAVBgUyRYgJxBDiOHQrZIsy6qZRzxsmJiYmJiYmJiYmJiYmJiYmJiYmJiYmJiYmJiYmJiYmJtPI3wlK8GXlSW/WAAAAAElFTkSuQmCC"
-
     
 
 class ModernButton(QPushButton):
@@ -2996,6 +3376,9 @@ class ModernSpinBox(QSpinBox):
 
 
 class WordReplaceEntry(QWidget):
+    replacementChanged = pyqtSignal()  # 규칙 변경 시그널
+    removed = pyqtSignal()             # 삭제 시그널
+
     def __init__(self, parent=None):
         super().__init__(parent)
         layout = QHBoxLayout(self)
@@ -3004,6 +3387,7 @@ class WordReplaceEntry(QWidget):
         # 변환할 단어 입력
         self.from_word = QLineEdit()
         self.from_word.setPlaceholderText("변환할 단어")
+        self.from_word.textChanged.connect(self.on_replacement_changed)
         layout.addWidget(self.from_word)
         
         # 화살표 라벨
@@ -3013,7 +3397,14 @@ class WordReplaceEntry(QWidget):
         # 변환될 단어 입력
         self.to_word = QLineEdit()
         self.to_word.setPlaceholderText("변환될 단어")
+        self.to_word.textChanged.connect(self.on_replacement_changed)
         layout.addWidget(self.to_word)
+
+        # 정규식 사용 여부
+        self.use_regex = ModernCheckBox("정규식")
+        self.use_regex.setToolTip("변환할 단어를 정규식으로 사용 (변환될 단어에서 \\1, \\g<이름> 사용 가능)")
+        self.use_regex.toggled.connect(self.on_replacement_changed)
+        layout.addWidget(self.use_regex)
         
         # 삭제 버튼
         delete_btn = ModernButton("삭제")
@@ -3027,57 +3418,25 @@ class WordReplaceEntry(QWidget):
         to_word = self.to_word.text()  # strip() 제거
         return from_word, to_word
 
-    def remove_self(self):
-        """안전하게 자신을 제거"""
-        self.setParent(None)  # 부모로부터 분리
-        self.deleteLater()    # 나중에 삭제되도록 예약
+    def get_replacement_rule(self):
+        """변환 규칙 반환 (변환할 단어, 변환될 단어, 정규식 여부)"""
+        from_word, to_word = self.get_replacement_pair()
+        return from_word, to_word, self.use_regex.isChecked()
 
-class ImageUrlEntry(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        layout = QHBoxLayout(self)  # 수평 레이아웃으로 변경
-        layout.setContentsMargins(0, 0, 0, 0)
-        
-        # 태그 입력
-        self.tag_input = QLineEdit()
-        self.tag_input.setPlaceholderText("이미지 태그 (예: Orca_surprised)")
-        layout.addWidget(self.tag_input)
-        
-        # 화살표 레이블
-        arrow_label = QLabel("→")
-        layout.addWidget(arrow_label)
-        
-        # URL 입력
-        self.url_input = QLineEdit()
-        self.url_input.setPlaceholderText("이미지 URL")
-        layout.addWidget(self.url_input)
-        
-        # 삭제 버튼
-        delete_btn = ModernButton("삭제")
-        delete_btn.setFixedWidth(60)
-        delete_btn.clicked.connect(self.remove_self)
-        layout.addWidget(delete_btn)
+    def on_replacement_changed(self):
+        """규칙 변경 시그널 발생"""
+        self.replacementChanged.emit()
 
     def remove_self(self):
         """안전하게 자신을 제거"""
-        self.setParent(None)
-        self.deleteLater()
-
-    def to_dict(self):
-        """현재 매핑 정보를 딕셔너리로 반환"""
-        return {
-            'tag': self.tag_input.text().strip(),
-            'url': self.url_input.text().strip()
-        }
-
-    def from_dict(self, data):
-        """딕셔너리에서 매핑 정보 로드"""
-        self.tag_input.setText(data.get('tag', ''))
-        self.url_input.setText(data.get('url', ''))
+        self.setParent(None)  # 부모로부터 분리
+        self.deleteLater()    # 나중에 삭제되도록 예약
+        self.removed.emit()
 
 class TagEntry(QWidget):
     """개선된 태그 입력 컴포넌트"""
     tagChanged = pyqtSignal()  # 태그 변경 시그널
+    removed = pyqtSignal()     # 삭제 시그널
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -3162,6 +3521,7 @@ class TagEntry(QWidget):
         """안전하게 자신을 제거"""
         self.setParent(None)
         self.deleteLater()
+        self.removed.emit()
         
     def get_style_dict(self):
         """태그 스타일 정보를 딕셔너리로 반환"""
@@ -3188,59 +3548,654 @@ class TagEntry(QWidget):
             "bottom": 0.2, "left": 0.8
         })
 
-class ModernLogGenerator(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        
-        self.error_handler = ErrorHandler(self)
+class PreviewScheduler:
+    """미리보기 갱신 예약
 
-        # bot_name 속성 추가
-        self.bot_name = QLineEdit()
-        self.bot_name.setPlaceholderText("봇 이름")
-        
-        # 매니저 초기화
-        self.profile_manager = ProfileManager(self)
-        
-        # 캐시 매니저 초기화
-        self.image_cache_manager = ImageCacheManager()
-        
-        # 캐시 정리 타이머 설정
-        self.cache_cleanup_timer = QTimer()
-        self.cache_cleanup_timer.setInterval(3600000)  # 1시간마다
-        self.cache_cleanup_timer.timeout.connect(self.cleanup_caches)
-        self.cache_cleanup_timer.start()
+    하나의 타이머로 연속된 요청을 모아 한 번만 변환합니다. 대기 시간은 직전 변환에서
+    측정한 문자당 비용과 현재 입력 크기로 정하고, 계속 입력 중이어도 최대 대기 시간이
+    지나면 한 번은 갱신합니다.
+    """
+    MIN_DELAY = 30       # 작은 입력의 대기 시간 (ms)
+    MAX_DELAY = 1000     # 큰 입력의 대기 시간 상한 (ms)
+    MAX_WAIT = 1500      # 첫 요청 후 갱신까지 최대 대기 시간 (ms)
 
-        self.preview_timer = None
-        self.resource_manager = ResourceManager(self)
-        
-        # Settings & Cache Initialization
-        self.settings = QSettings('YourCompany', 'LogGenerator')
-        self.image_cache = ImageCache()
-        
-        # 매니저 초기화
-        self.template_manager = TemplateManager(self)
-        self.mapping_manager = MappingManager(self)
-        self.tag_manager = TagManager(self)
-        self.word_replace_manager = WordReplaceManager(self)
-        self.preset_manager = PresetManager(self)
-        
-        # Character Card Handler
-        self.card_handler = CharacterCardHandler()
-        self.asset_name_img_tag_map = {}
-        
-        # Splitter
-        self.splitter = None
-        
-        # Tag Related Initialization
-        self.tag_boxes = []
-        self.tag_colors = []
-        self.tag_transparent = []
-        self.tag_presets = {}
-        self.load_tag_presets_from_file()
-        
-        # UI Initialization
-        self.init_ui()
-        self.restore_geometry_and_state()
+    def __init__(self, main_window, callback):
+        self.main_window = main_window
+        self.callback = callback
+        self.cost_per_char = 0.0    # 직전 변환의 문자당 비용 (ms)
+        self.first_request = None   # 아직 처리하지 않은 첫 요청 시각 (perf_counter 기준 ms)
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._fire)
+
+    def input_size(self):
+        """입력 문자 수 (문서 전체를 복사하지 않음)"""
+        input_text = getattr(self.main_window, 'input_text', None)
+        return input_text.document().characterCount() if input_text else 0
+
+    def estimate_cost(self, size=None):
+        """현재 입력의 예상 변환 시간 (ms)"""
+        return self.cost_per_char * (self.input_size() if size is None else size)
+
+    def current_delay(self):
+        """예상 비용의 두 배를 기다리되, 최소/최대 대기 시간 안으로 제한"""
+        return int(min(self.MAX_DELAY, max(self.MIN_DELAY, self.estimate_cost() * 2)))
+
+    def request(self):
+        """갱신 요청 (이미 예약되어 있으면 대기 시간만 다시 계산)"""
+        now = perf_counter() * 1000
+        if self.first_request is None:
+            self.first_request = now
+
+        # 최대 대기 시간은 한 번의 변환이 끝날 수 있을 만큼은 보장
+        max_wait = max(self.MAX_WAIT, self.estimate_cost() * 2)
+        remaining = max_wait - (now - self.first_request)
+        self.timer.start(int(max(0, min(self.current_delay(), remaining))))
+
+    def record_cost(self, elapsed_ms, size):
+        """변환에 걸린 시간 기록 (다음 대기 시간 계산에 사용)"""
+        if size > 0:
+            cost = elapsed_ms / size
+            # 한 번의 튀는 값에 흔들리지 않도록 이전 값과 섞음
+            self.cost_per_char = cost if not self.cost_per_char else (self.cost_per_char + cost) / 2
+
+    def stop(self):
+        """예약된 갱신 취소"""
+        self.timer.stop()
+        self.first_request = None
+
+    def _fire(self):
+        self.first_request = None
+        self.callback()
+
+
+class AnimationManager:
+    """미리보기 갱신 애니메이션 관리
+
+    위젯마다 투명도 효과와 애니메이션을 한 번만 만들어 재사용하고, 끝나면 효과를 꺼서
+    평소 그리기 비용이 들지 않게 합니다. 이전 페이드가 아직 진행 중이거나 변환이
+    시간 예산을 넘었으면 페이드를 생략하며, 성능 모드에서는 전혀 실행하지 않습니다.
+    """
+    FADE_DURATION = 200       # 페이드 시간 (ms)
+    CONVERSION_BUDGET = 100   # 변환이 이보다 오래 걸리면 페이드 생략 (ms)
+
+    def __init__(self, main_window):
+        self.main_window = main_window
+        self.enabled = True
+        self.animations = {}  # 위젯 → (투명도 효과, 애니메이션)
+
+    def set_enabled(self, enabled):
+        """애니메이션 사용 여부 설정 (끄면 진행 중인 페이드도 정리)"""
+        self.enabled = enabled
+        if not enabled:
+            for effect, animation in self.animations.values():
+                animation.stop()
+                effect.setEnabled(False)
+
+    def fade_in(self, widget, elapsed_ms=0):
+        """위젯 페이드 인 (실행했으면 True)"""
+        if not self.enabled or widget is None or elapsed_ms > self.CONVERSION_BUDGET:
+            return False
+
+        try:
+            entry = self.animations.get(widget)
+            if entry is None:
+                # 처음 한 번만 효과와 애니메이션 생성
+                effect = QGraphicsOpacityEffect(widget)
+                effect.setEnabled(False)
+                widget.setGraphicsEffect(effect)
+
+                animation = QPropertyAnimation(effect, b"opacity", widget)
+                animation.setDuration(self.FADE_DURATION)
+                animation.setStartValue(0.5)
+                animation.setEndValue(1.0)
+                animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+                animation.finished.connect(lambda: effect.setEnabled(False))
+
+                entry = self.animations[widget] = (effect, animation)
+
+            effect, animation = entry
+
+            # 이전 페이드가 끝나기 전에 다시 갱신되면 이어서 그리지 않고 생략
+            if animation.state() == QAbstractAnimation.State.Running:
+                return False
+
+            effect.setEnabled(True)
+            animation.start()
+            return True
+
+        except RuntimeError:
+            # 이미 삭제된 위젯
+            self.animations.pop(widget, None)
+            return False
+        except Exception as e:
+            print(f"Widget animation error: {str(e)}")
+            return False
+
+
+class ConversationHighlighter(QSyntaxHighlighter):
+    """입력 창의 대화문/속마음/나레이션 구분 표시
+
+    변환과 같은 단어 변경, 에스터리스크 제거, 말줄임표 변환을 거친 결과를
+    tokenize_line으로 나눠 원본 위치에 칠합니다. 변환 규칙이 줄 단위라서 따옴표가
+    다음 줄로 이어지지 않으므로 블록 상태를 바꾸지 않고, 편집된 블록만 다시 칠합니다.
+    문서가 MAX_CHARS를 넘거나 성능 모드에서는 문서에서 떼어 내 강조하지 않고,
+    다시 작아지면 입력이 멈춘 뒤에 붙입니다.
+    """
+    MAX_CHARS = 100000     # 이보다 긴 문서는 강조하지 않음 (문자 수)
+    REATTACH_DELAY = 500   # 다시 붙이기 전 대기 시간 (ms)
+
+    def __init__(self, document):
+        # 문서 변경을 강조보다 먼저 받도록 연결한 뒤 문서에 붙임
+        super().__init__(None)
+        self.target = document
+        self.enabled = True
+        self.settings = RenderSettings()
+        self.replacer = WordReplacer(self.settings.word_replacements)
+        dialogue = QTextCharFormat()
+        dialogue.setForeground(QColor(STYLES['secondary']))
+        bold_dialogue = QTextCharFormat(dialogue)
+        bold_dialogue.setFontWeight(QFont.Weight.Bold)
+        inner_thoughts = QTextCharFormat()
+        inner_thoughts.setForeground(QColor(STYLES['text_secondary']))
+        inner_thoughts.setFontItalic(True)
+        self.formats = {
+            'dialogue': dialogue,
+            'bold_dialogue': bold_dialogue,
+            'inner_thoughts': inner_thoughts,
+        }
+
+        self.reattach_timer = QTimer(self)
+        self.reattach_timer.setSingleShot(True)
+        self.reattach_timer.setInterval(self.REATTACH_DELAY)
+        self.reattach_timer.timeout.connect(self.update_attachment)
+        document.contentsChange.connect(self.on_contents_change)
+        self.update_attachment()
+
+    def should_attach(self):
+        return self.enabled and self.target.characterCount() <= self.MAX_CHARS
+
+    def update_attachment(self):
+        """문서 크기와 성능 모드에 따라 문서에 붙이거나 떼어 냄"""
+        if self.should_attach():
+            if self.document() is None:
+                self.setDocument(self.target)
+        elif self.document() is not None:
+            self.setDocument(None)
+
+    def on_contents_change(self, position, removed, added):
+        # 큰 붙여넣기나 setPlainText는 강조가 전체를 칠하기 전에 떼어 냄
+        if self.document() is not None:
+            if not self.should_attach():
+                self.setDocument(None)
+        elif self.should_attach():
+            self.reattach_timer.start()
+
+    def set_enabled(self, enabled):
+        """강조 사용 여부 설정 (성능 모드에서 끔)"""
+        self.enabled = enabled
+        self.reattach_timer.stop()
+        self.update_attachment()
+
+    def set_settings(self, settings):
+        """변환 설정 반영 (강조 결과가 바뀌는 설정이 달라졌을 때만 다시 칠함)"""
+        previous = self.settings
+        self.settings = settings
+        if (
+            previous.word_replacements == settings.word_replacements
+            and previous.remove_asterisk == settings.remove_asterisk
+            and previous.convert_ellipsis == settings.convert_ellipsis
+        ):
+            return
+        self.replacer = WordReplacer(settings.word_replacements)
+        if self.document() is not None:
+            self.rehighlight()
+
+    def highlightBlock(self, text):
+        # 1. 변환과 같은 전처리 후 토큰 분리 (빈 줄과 태그 줄은 빈 결과)
+        tokens = processed_line_tokens(text, self.settings, self.replacer)
+        if not tokens:
+            return
+
+        # 2. 원본 위치를 UTF-16 단위로 맞춤 (이모지 등 BMP 밖 문자)
+        wide = not text.isascii() and max(text) > '\uffff'
+        for kind, start, end in tokens:
+            text_format = self.formats.get(kind)
+            if text_format is None:
+                continue
+            if wide:
+                length = len(text[start:end].encode('utf-16-le')) // 2
+                start = len(text[:start].encode('utf-16-le')) // 2
+            else:
+                length = end - start
+            self.setFormat(start, length, text_format)
+
+
+class LazyMimeData(QMimeData):
+    """변환 결과 클립보드 데이터
+
+    text/plain과 text/html을 다른 프로그램이 실제로 요청할 때 버퍼에서 꺼내 주므로,
+    큰 결과를 복사해도 미리 문서로 만들거나 복사본을 만들지 않습니다.
+    """
+    FORMATS = ('text/plain', 'text/html')
+
+    def __init__(self, html):
+        super().__init__()
+        self.html = html
+
+    def formats(self):
+        return list(self.FORMATS)
+
+    def hasFormat(self, mime_type):
+        return mime_type in self.FORMATS
+
+    def retrieveData(self, mime_type, preferred_type):
+        if mime_type in self.FORMATS:
+            return self.html
+        return super().retrieveData(mime_type, preferred_type)
+
+
+class ConversionSignals(QObject):
+    """변환 작업 결과 시그널 (QRunnable은 시그널을 가질 수 없음)"""
+    finished = pyqtSignal(int, list, int)  # 요청 번호, 결과 HTML 조각, 공백 제거로 줄인 바이트
+    failed = pyqtSignal(int, str)         # 요청 번호, 오류 메시지
+
+
+class ConversionWorker(QRunnable):
+    """백그라운드 스레드에서 실행되는 미리보기 변환 작업
+
+    문단 조각마다 자신이 최신 요청인지 확인하고, 더 새 요청이 들어왔으면
+    결과를 만들지 않고 바로 중단합니다.
+    """
+    CHUNK_SIZE = 16384  # 취소 확인 간격 (입력 문자 수)
+
+    def __init__(self, renderer, text, settings, generation, is_current, disk_cache=None):
+        super().__init__()
+        self.renderer = renderer
+        self.disk_cache = disk_cache
+        self.text = text
+        self.settings = settings
+        self.generation = generation
+        self.is_current = is_current
+        self.signals = ConversionSignals()
+
+    def run(self):
+        try:
+            # 1. 디스크 캐시에 같은 입력과 설정의 결과가 있으면 변환하지 않음
+            key = self.disk_cache.key(self.text, self.settings) if self.disk_cache else None
+            cached = self.disk_cache.get(key) if key else None
+            if cached is not None:
+                if self.is_current(self.generation):
+                    self.signals.finished.emit(self.generation, *cached)
+                return
+
+            # 2. 변환
+            started = perf_counter()
+            chunks = []
+            for chunk in self.renderer.render_iter(self.text, self.settings, self.CHUNK_SIZE):
+                if not self.is_current(self.generation):
+                    return
+                chunks.append(chunk)
+            saved_bytes = self.renderer.last_minify_saved_bytes
+
+            # 3. 오래 걸린 변환만 디스크 캐시에 저장
+            if key and (perf_counter() - started) * 1000 >= self.disk_cache.MIN_RENDER_MS:
+                self.disk_cache.put(key, chunks, saved_bytes)
+
+            if self.is_current(self.generation):
+                self.signals.finished.emit(self.generation, chunks, saved_bytes)
+        except Exception as e:
+            print(f"Conversion error: {str(e)}")
+            self.signals.failed.emit(self.generation, str(e))
+
+
+class ImageFetchSignals(QObject):
+    """미리보기 이미지 로드 결과 시그널"""
+    loaded = pyqtSignal(str, QImage)  # 이미지 URL, 이미지
+    failed = pyqtSignal(str)          # 이미지 URL
+
+
+class ImageFetchWorker(QRunnable):
+    """원격 이미지를 디스크 캐시 또는 네트워크에서 읽어 오는 백그라운드 작업"""
+    TIMEOUT = 10  # 초
+
+    def __init__(self, url, disk_cache, max_width):
+        super().__init__()
+        self.url = url
+        self.disk_cache = disk_cache
+        self.max_width = max_width
+        self.signals = ImageFetchSignals()
+
+    def run(self):
+        try:
+            # 1. 디스크 캐시 확인
+            key = self.disk_cache.key(self.url)
+            data = self.disk_cache.load(key)
+            cached = data is not None
+            if not cached:
+                # 2. 네트워크에서 받아 디스크에 저장 (용량 한도를 넘으면 오래된 파일부터 삭제)
+                request = urllib.request.Request(self.url, headers={'User-Agent': 'Mozilla/5.0'})
+                with urllib.request.urlopen(request, timeout=self.TIMEOUT) as response:
+                    data = response.read()
+
+            # 3. 디코딩과 축소도 이 스레드에서 처리
+            image = QImage()
+            if not image.loadFromData(data):
+                if cached:
+                    self.disk_cache.remove(key)
+                raise ValueError("이미지를 읽을 수 없습니다")
+            if not cached:
+                self.disk_cache.store(key, data)
+            if image.width() > self.max_width:
+                image = image.scaledToWidth(self.max_width, Qt.TransformationMode.SmoothTransformation)
+            self.signals.loaded.emit(self.url, image)
+
+        except Exception as e:
+            print(f"미리보기 이미지 로드 실패 ({self.url}): {str(e)}")
+            self.signals.failed.emit(self.url)
+
+
+class RenderedPreview(QTextBrowser):
+    """변환 결과를 실제 모양으로 보여 주는 미리보기
+
+    템플릿 앞부분(프로필 영역)과 문단마다 QTextFrame을 하나씩 두고, 바뀐 문단의
+    프레임만 다시 그립니다. 앞부분은 설정이 바뀌었을 때만 다시 그립니다.
+    원격 이미지(프로필 이미지 포함)는 백그라운드에서 디스크 캐시를 거쳐 불러오고,
+    디코딩한 이미지는 용량 한도가 있는 image_cache(ImageCacheManager)에 두며, 도착하면
+    다시 배치합니다. 문서는 loadResource로 받은 이미지를 비울 때까지 따로 들고 있으므로,
+    캐시에서 빠진 이미지가 더 이상 표시되지 않으면 문서를 다시 만들어 놓아 줍니다.
+    화면에 보이지 않는 동안에는 마지막 결과만 기억해 두었다가 보일 때 반영합니다.
+    """
+    MAX_CHARS = 200000        # 미리보기에 표시할 최대 HTML 글자 수
+    MAX_IMAGE_WIDTH = 800     # 미리보기 이미지 최대 너비
+    IMAGE_THREADS = 4
+
+    def __init__(self, image_cache, parent=None):
+        super().__init__(parent)
+        self.image_cache = image_cache
+        self.image_cache.on_drop = self.on_image_dropped
+        self.setOpenExternalLinks(True)
+        self.setUndoRedoEnabled(False)
+
+        self.head = None
+        self.head_frame = None
+        self.paragraphs = []         # 표시 중인 문단 HTML
+        self.paragraph_frames = []   # 문단별 프레임
+        self.pending = None          # 숨겨져 있는 동안 도착한 (앞부분, 문단 목록)
+
+        # 원격 이미지 로드 상태
+        self.image_disk_cache = ImageDiskCache(os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation),
+            'preview_images'
+        ))
+        self.image_pool = QThreadPool()
+        self.image_pool.setMaxThreadCount(self.IMAGE_THREADS)
+        self.loading = set()
+        self.failed = set()
+        self.document_images = set()  # 문서가 들고 있는 이미지 URL
+        self.dropped_images = set()   # 그중 캐시에서 빠진 URL
+
+        # 캐시에서 빠진 이미지는 모아서 한 번에 정리
+        self.release_timer = QTimer()
+        self.release_timer.setSingleShot(True)
+        self.release_timer.setInterval(500)
+        self.release_timer.timeout.connect(self.release_dropped_images)
+
+        # 이미지가 여러 장 도착해도 다시 배치는 한 번만
+        self.relayout_timer = QTimer()
+        self.relayout_timer.setSingleShot(True)
+        self.relayout_timer.setInterval(50)
+        self.relayout_timer.timeout.connect(self.relayout)
+
+    def set_parts(self, parts):
+        """render_iter 조각(앞부분, 문단들, 끝부분)으로 미리보기 갱신"""
+        if len(parts) < 2:
+            head, paragraphs = None, []
+        else:
+            head = parts[0]
+            paragraphs = []
+            size = len(head)
+            for index, part in enumerate(parts[1:-1]):
+                paragraph = part[1:] if index else part
+                size += len(paragraph)
+                if size > self.MAX_CHARS:
+                    break
+                paragraphs.append(paragraph)
+
+        if not self.isVisible():
+            self.pending = (head, paragraphs)
+            return
+        self.apply(head, paragraphs)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.pending is not None:
+            head, paragraphs = self.pending
+            self.pending = None
+            self.apply(head, paragraphs)
+
+    def apply(self, head, paragraphs):
+        """앞부분과 문단 목록을 현재 문서와 비교해 바뀐 프레임만 교체"""
+        document = self.document()
+
+        # 1. 내용이 없으면 문서 비우기
+        if head is None:
+            self.clear()
+            self.document_images.clear()
+            self.head = self.head_frame = None
+            self.paragraphs = []
+            self.paragraph_frames = []
+            return
+
+        # 2. 앞부분은 설정이 바뀌었을 때만 다시 그림
+        if self.head_frame is None:
+            self.clear()
+            self.document_images.clear()
+            self.head_frame = self.insert_frame(0, head)
+            self.paragraphs = []
+            self.paragraph_frames = []
+        elif head != self.head:
+            self.replace_frame(self.head_frame, head)
+        self.head = head
+
+        # 3. 앞뒤로 같은 문단 수 계산
+        old = self.paragraphs
+        limit = min(len(old), len(paragraphs))
+        prefix = 0
+        while prefix < limit and old[prefix] == paragraphs[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == paragraphs[-1 - suffix]:
+            suffix += 1
+
+        # 4. 가운데 구간: 같은 자리는 내용 교체, 남는 프레임은 삭제, 모자란 프레임은 추가
+        frames = self.paragraph_frames
+        old_middle = frames[prefix:len(old) - suffix]
+        new_middle = paragraphs[prefix:len(paragraphs) - suffix]
+        reused = min(len(old_middle), len(new_middle))
+        for frame, paragraph in zip(old_middle, new_middle):
+            self.replace_frame(frame, paragraph)
+
+        if len(old_middle) > reused:
+            first, last = old_middle[reused], old_middle[-1]
+            cursor = QTextCursor(document)
+            cursor.setPosition(first.firstPosition() - 1)
+            cursor.setPosition(last.lastPosition() + 1, QTextCursor.MoveMode.KeepAnchor)
+            cursor.removeSelectedText()
+
+        added = []
+        previous = old_middle[reused - 1] if reused else (frames[prefix - 1] if prefix else self.head_frame)
+        for paragraph in new_middle[reused:]:
+            previous = self.insert_frame(previous.lastPosition() + 1, paragraph)
+            added.append(previous)
+
+        self.paragraph_frames = frames[:prefix] + old_middle[:reused] + added + frames[len(old) - suffix:]
+        self.paragraphs = list(paragraphs)
+
+    def insert_frame(self, position, html):
+        """position에 프레임을 만들고 HTML 삽입"""
+        cursor = QTextCursor(self.document())
+        cursor.setPosition(position)
+        frame = cursor.insertFrame(QTextFrameFormat())
+        cursor.insertHtml(html)
+        return frame
+
+    def replace_frame(self, frame, html):
+        """프레임 안의 내용만 새 HTML로 교체"""
+        cursor = frame.firstCursorPosition()
+        cursor.setPosition(frame.lastPosition(), QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertHtml(html)
+
+    def loadResource(self, resource_type, url):
+        """원격 이미지는 캐시에 있으면 반환하고, 없으면 백그라운드 로드 시작"""
+        if resource_type == QTextDocument.ResourceType.ImageResource.value and url.scheme() in ('http', 'https'):
+            key = url.toString()
+            image = self.image_cache.get(key)
+            if image is not None:
+                self.document_images.add(key)
+            elif key not in self.loading and key not in self.failed:
+                self.loading.add(key)
+                worker = ImageFetchWorker(key, self.image_disk_cache, self.MAX_IMAGE_WIDTH)
+                worker.signals.loaded.connect(self.on_image_loaded)
+                worker.signals.failed.connect(self.on_image_failed)
+                self.image_pool.start(worker)
+            return image
+        return super().loadResource(resource_type, url)
+
+    def on_image_loaded(self, url, image):
+        """캐시에 넣고 다시 배치 (문서는 loadResource로 캐시에서 가져감)"""
+        self.loading.discard(url)
+        try:
+            self.image_cache.set(url, image)
+        except ValueError as e:
+            print(f"미리보기 이미지 캐시 저장 실패 ({url}): {str(e)}")
+            self.failed.add(url)
+            return
+        self.relayout_timer.start()
+
+    def on_image_dropped(self, url):
+        """캐시에서 빠진 이미지를 문서도 들고 있으면 정리 예약"""
+        if url in self.document_images:
+            self.dropped_images.add(url)
+            self.release_timer.start()
+
+    def release_dropped_images(self):
+        """캐시에서 빠지고 표시되지도 않는 이미지가 있으면 문서를 다시 만들어 해제
+
+        표시 중인 이미지는 그릴 때 필요하므로 문서에 남겨 둡니다.
+        """
+        dropped = self.dropped_images
+        self.dropped_images = set()
+        if not dropped or self.head is None:
+            return
+        shown = set(re.findall(r'src="(https?://[^"]+)"', self.head))
+        for paragraph in self.paragraphs:
+            shown.update(re.findall(r'src="(https?://[^"]+)"', paragraph))
+        if dropped - shown:
+            head, paragraphs = self.head, self.paragraphs
+            self.head_frame = None
+            self.apply(head, paragraphs)
+
+    def on_image_failed(self, url):
+        self.loading.discard(url)
+        self.failed.add(url)
+
+    def relayout(self):
+        """도착한 이미지 크기로 문서 다시 배치"""
+        document = self.document()
+        document.markContentsDirty(0, document.characterCount())
+
+    def clear_failed_images(self):
+        """로드에 실패한 이미지 기록 초기화 (다음 표시 때 다시 시도)"""
+        self.failed.clear()
+
+
+class ModernLogGenerator(QMainWindow):
+    OUTPUT_VIEW_LIMIT = 200000  # 출력 창에 표시할 최대 글자 수
+
+    def __init__(self):
+        super().__init__()
+        
+        self.error_handler = ErrorHandler(self)
+
+        # bot_name 속성 추가
+        self.bot_name = QLineEdit()
+        self.bot_name.setPlaceholderText("봇 이름")
+        
+        # 매니저 초기화
+        self.profile_manager = ProfileManager(self)
+        
+        # 캐시 매니저 초기화
+        self.image_cache_manager = ImageCacheManager()
+
+        # 렌더링 엔진
+        self.renderer = LogRenderer()
+
+        # 세션 사이에 유지되는 변환 결과 캐시 (옵션)
+        self.render_disk_cache = RenderDiskCache(
+            os.path.join(
+                QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation),
+                'render_cache'
+            )
+        )
+
+        # 변환 결과 버퍼 (출력 창에는 큰 결과의 앞부분만 표시)
+        self.output_html = ''
+        self.output_view_lines = []  # 출력 창 문서의 블록별 텍스트
+
+        # 미리보기 변환 스레드 (렌더러 캐시를 공유하므로 한 번에 하나씩 실행)
+        self.conversion_pool = QThreadPool()
+        self.conversion_pool.setMaxThreadCount(1)
+        self.conversion_generation = 0
+        self.conversion_started = 0
+        self.conversion_size = 0
+        
+        # 캐시 정리 타이머 설정
+        self.cache_cleanup_timer = QTimer()
+        self.cache_cleanup_timer.setInterval(3600000)  # 1시간마다
+        self.cache_cleanup_timer.timeout.connect(self.cleanup_caches)
+        self.cache_cleanup_timer.start()
+
+        self.preview_scheduler = PreviewScheduler(self, self.refresh_preview)
+        self.settings_transaction_depth = 0  # 진행 중인 settings_transaction 중첩 수
+        self.animation_manager = AnimationManager(self)
+        self.resource_manager = ResourceManager(self)
+        
+        # 이미지 매핑, 단어 변경, 태그 데이터 모델 (위젯은 이 모델의 뷰)
+        self.image_mapping_model = ImageMappingModel()
+        self.word_replace_model = WordReplaceModel()
+        self.tag_model = TagModel()
+        for model in (self.image_mapping_model, self.word_replace_model, self.tag_model):
+            model.changed.connect(self.update_preview)
+
+        # Settings & Cache Initialization
+        self.settings = QSettings('YourCompany', 'LogGenerator')
+        self.image_cache = ImageCache()
+        
+        # 매니저 초기화
+        self.template_manager = TemplateManager(self)
+        self.mapping_manager = MappingManager(self)
+        self.tag_manager = TagManager(self)
+        self.word_replace_manager = WordReplaceManager(self)
+        self.preset_manager = PresetManager(self)
+        
+        # Character Card Handler
+        self.card_handler = CharacterCardHandler()
+        self.asset_name_img_tag_map = {}
+        
+        # Splitter
+        self.splitter = None
+        
+        # Tag Related Initialization
+        self.tag_boxes = []
+        self.tag_colors = []
+        self.tag_transparent = []
+        self.tag_presets = {}
+        self.load_tag_presets_from_file()
+        
+        # UI Initialization
+        self.init_ui()
+        self.restore_geometry_and_state()
 
         # Icon Setup
         icon_path = resource_path('log_icon.ico')
@@ -3277,6 +4232,11 @@ class ModernLogGenerator(QMainWindow):
             if cleaned_count > 0:
                 print(f"캐시 정리 완료: {cleaned_count}개 항목 제거")
                 print(f"현재 캐시 상태: {stats}")
+
+            # 다음 정리는 가장 먼저 만료되는 항목 시각에 맞춤 (최대 1시간)
+            next_expiry = self.image_cache_manager.next_expiry()
+            interval = 3600000 if next_expiry is None else int(next_expiry * 1000) + 1000
+            self.cache_cleanup_timer.start(min(interval, 3600000))
                 
         except Exception as e:
             self.error_handler.handle_error(
@@ -3285,49 +4245,113 @@ class ModernLogGenerator(QMainWindow):
                 e
             )
             
-    def process_image_url(self, url):
-        """이미지 URL 처리 (캐시 활용)"""
-        try:
-            # 캐시 확인
-            cached_data = self.image_cache_manager.get(url)
-            if cached_data:
-                return cached_data
-                
-            # 캐시에 없으면 처리
-            processed_url = super().process_image_url(url)
-            
-            # 캐시 저장
-            self.image_cache_manager.set(url, processed_url)
-            
-            return processed_url
-            
-        except Exception as e:
-            self.error_handler.handle_error(
-                "이미지 URL 처리 중 오류가 발생했습니다.",
-                ErrorSeverity.MEDIUM,
-                e
-            )
-            return DEFAULT_PROFILE_IMAGE
-            
+    def cache_sources(self):
+        """통계를 모을 캐시 목록 (이름 → get_stats를 가진 객체)"""
+        return {
+            '이미지 캐시': self.image_cache_manager,
+            'URL 정규화': url_normalizer,
+            '문단 캐시': self.renderer.paragraph_cache,
+            '템플릿 머리 캐시': self.renderer.profile_cache,
+            '카드 에셋': self.card_handler,
+            '미리보기 이미지 디스크 캐시': self.rendered_preview.image_disk_cache,
+            '변환 결과 디스크 캐시': self.render_disk_cache,
+        }
+
+    def clear_caches(self):
+        """이미지와 변환 결과 캐시 비우기 (메모리와 디스크, 카드 에셋은 유지)"""
+        self.image_cache_manager.clear()
+        self.rendered_preview.image_disk_cache.clear()
+        self.rendered_preview.clear_failed_images()
+        self.render_disk_cache.clear()
+        url_normalizer.clear()
+
+    def collect_cache_stats(self):
+        """모든 캐시의 공통 통계"""
+        stats = {}
+        for name, cache in self.cache_sources().items():
+            try:
+                stats[name] = cache.get_stats()
+            except Exception as e:
+                print(f"캐시 통계 수집 중 오류 ({name}): {str(e)}")
+        return stats
+
     def show_cache_stats(self):
-        """캐시 상태 표시 다이얼로그"""
+        """캐시 상태 표시 다이얼로그 (1초마다 갱신, JSON 내보내기)"""
         try:
-            stats = self.image_cache_manager.get_stats()
-            
-            msg = (
-                f"캐시 상태 정보:\n\n"
-                f"총 항목 수: {stats['total_items']}\n"
-                f"최대 항목 수: {stats['max_size']}\n"
-                f"사용률: {stats['utilization']}\n"
-                f"총 용량: {stats['total_size_mb']}\n"
-                f"최대 용량: {stats['max_size_mb']}\n"
-                f"용량 사용률: {stats['size_utilization']}\n"
-                f"가장 오래된 항목: {stats['oldest_item_age']:.1f}초\n"
-                f"최신 항목: {stats['newest_item_age']:.1f}초"
-            )
-            
-            QMessageBox.information(self, "캐시 상태", msg)
-            
+            dialog = QDialog(self)
+            dialog.setWindowTitle("캐시 통계")
+            dialog.resize(820, 320)
+            layout = QVBoxLayout(dialog)
+
+            columns = [
+                ('항목', 'items'), ('용량', 'bytes'), ('적중', 'hits'), ('실패', 'misses'),
+                ('적중률', 'hit_rate'), ('제거', 'evictions'), ('평균 조회', 'mean_lookup_us')
+            ]
+            table = QTableWidget(0, len(columns))
+            table.setHorizontalHeaderLabels([label for label, _ in columns])
+            table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+            layout.addWidget(table)
+
+            def format_value(key, value):
+                if key == 'bytes':
+                    return f"{value / 1024 / 1024:.2f}MB" if value >= 1048576 else f"{value / 1024:.1f}KB"
+                if key == 'mean_lookup_us':
+                    return f"{value:.1f}µs"
+                return str(value)
+
+            def refresh():
+                stats = self.collect_cache_stats()
+                table.setRowCount(len(stats))
+                table.setVerticalHeaderLabels(list(stats))
+                for row, values in enumerate(stats.values()):
+                    for column, (_, key) in enumerate(columns):
+                        table.setItem(row, column, QTableWidgetItem(format_value(key, values.get(key, 0))))
+
+            def export():
+                file_path, _ = QFileDialog.getSaveFileName(
+                    dialog, "캐시 통계 내보내기", "cache_stats.json", "JSON (*.json)"
+                )
+                if file_path:
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        json.dump(
+                            {'time': datetime.now().isoformat(), 'caches': self.collect_cache_stats()},
+                            f, ensure_ascii=False, indent=2
+                        )
+
+            def clear():
+                reply = QMessageBox.question(
+                    dialog,
+                    '캐시 비우기',
+                    '이미지와 변환 결과 캐시를 모두 지우시겠습니까?\n(디스크에 저장된 미리보기 이미지 포함)',
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+                if reply == QMessageBox.StandardButton.Yes:
+                    self.clear_caches()
+                    refresh()
+
+            button_layout = QHBoxLayout()
+            export_btn = ModernButton("JSON 내보내기")
+            export_btn.clicked.connect(export)
+            button_layout.addWidget(export_btn)
+            clear_btn = ModernButton("캐시 비우기")
+            clear_btn.clicked.connect(clear)
+            button_layout.addWidget(clear_btn)
+            close_btn = ModernButton("닫기")
+            close_btn.clicked.connect(dialog.close)
+            button_layout.addWidget(close_btn)
+            layout.addLayout(button_layout)
+
+            # 다이얼로그가 열려 있는 동안 1초마다 갱신
+            timer = QTimer(dialog)
+            timer.setInterval(1000)
+            timer.timeout.connect(refresh)
+            timer.start()
+            refresh()
+
+            dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+            dialog.show()
+
         except Exception as e:
             self.error_handler.handle_error(
                 "캐시 상태 확인 중 오류가 발생했습니다.",
@@ -3335,7 +4359,6 @@ class ModernLogGenerator(QMainWindow):
                 e
             )
 
-
     def auto_save(self):
         """자동 저장 기능"""
         try:
@@ -3603,7 +4626,7 @@ class ModernLogGenerator(QMainWindow):
             new_styles = {
                 'background': '#1C1C1E' if is_dark else '#FFFFFF',
                 'surface': '#2C2C2E' if is_dark else '#F2F2F7',
-                'text': '#FFFFFF' if is_dark else '#000000',
+                'text': THEME_TEXT_COLORS['dark' if is_dark else 'light'],
                 'text_secondary': '#98989D' if is_dark else '#6C6C70',
                 'border': '#3A3A3C' if is_dark else '#C6C6C8',
             }
@@ -3628,73 +4651,73 @@ class ModernLogGenerator(QMainWindow):
             )
 
     def update_preview(self):
-        """미리보기 업데이트"""
+        """미리보기 업데이트 예약 (연속된 요청은 한 번으로 모음)"""
         try:
-            # 이전 타이머 중지
-            if hasattr(self, 'preview_timer') and self.preview_timer:
-                self.preview_timer.stop()
-            
-            # 새 타이머 생성
-            self.preview_timer = QTimer()
-            self.preview_timer.setSingleShot(True)
-            
-            def do_update():
-                try:
-                    if hasattr(self, 'input_text') and hasattr(self, 'output_text'):
-                        # 현재 커서 위치 저장
-                        cursor = self.output_text.textCursor()
-                        scroll_pos = self.output_text.verticalScrollBar().value()
-                        
-                        # 텍스트 변환
-                        self.convert_text()
-                        
-                        # 커서 위치와 스크롤 위치 복원
-                        self.output_text.setTextCursor(cursor)
-                        self.output_text.verticalScrollBar().setValue(scroll_pos)
-                        
-                        # UI 요소들 애니메이션 효과
-                        for widget in self.findChildren(QWidget, "tag_container"):
-                            # 페이드 효과
-                            opacity_effect = QGraphicsOpacityEffect(widget)
-                            widget.setGraphicsEffect(opacity_effect)
-                            
-                            animation = QPropertyAnimation(opacity_effect, b"opacity")
-                            animation.setDuration(200)
-                            animation.setStartValue(0.5)
-                            animation.setEndValue(1.0)
-                            animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-                            animation.start(QAbstractAnimation.DeletionPolicy.DeleteWhenStopped)
-                            
-                except Exception as e:
-                    print(f"Preview update error: {str(e)}")
-            
-            # 타이머에 업데이트 함수 연결 및 시작
-            self.preview_timer.timeout.connect(do_update)
-            self.preview_timer.start(300)  # 300ms 디바운싱
-            
+            # 설정 트랜잭션 중에는 끝날 때 한 번만 갱신
+            if self.settings_transaction_depth:
+                return
+            self.preview_scheduler.request()
         except Exception as e:
             print(f"Preview timer setup error: {str(e)}")
- 
 
-    def animate_widget(self, widget):
-        """위젯 페이드 인 애니메이션"""
+    @contextlib.contextmanager
+    def settings_transaction(self):
+        """여러 설정 위젯을 한꺼번에 바꾸는 동안 미리보기 갱신을 모았다가 한 번만 실행
+
+        with 블록 안의 update_preview 요청은 무시하고, 끝날 때 블록 전후의 렌더링 설정을
+        비교해 바뀐 영역('profile', 'text', 'other')을 yield한 집합에 기록합니다.
+        바뀐 영역이 있으면 예약된 갱신을 취소하고 변환을 한 번만 실행합니다.
+        중첩되면 가장 바깥 블록이 끝날 때만 처리합니다.
+        """
+        dirty = set()
+        outermost = self.settings_transaction_depth == 0
+        before = self.settings_snapshot() if outermost else None
+        self.settings_transaction_depth += 1
         try:
-            # 투명도 효과
-            opacity_effect = QGraphicsOpacityEffect(widget)
-            widget.setGraphicsEffect(opacity_effect)
-            
-            # 애니메이션 설정
-            animation = QPropertyAnimation(opacity_effect, b"opacity")
-            animation.setDuration(200)
-            animation.setStartValue(0.5)
-            animation.setEndValue(1.0)
-            animation.setEasingCurve(QEasingCurve.Type.OutCubic)
-            
-            # 애니메이션 시작
-            animation.start(QAbstractAnimation.DeletionPolicy.DeleteWhenStopped)
-            
+            yield dirty
+        finally:
+            self.settings_transaction_depth -= 1
+            if outermost:
+                after = self.settings_snapshot()
+                if before is None or after is None:
+                    dirty.update(('profile', 'text', 'other'))
+                elif before != after:
+                    if before.profile_fingerprint() != after.profile_fingerprint():
+                        dirty.add('profile')
+                    if before.paragraph_fingerprint() != after.paragraph_fingerprint():
+                        dirty.add('text')
+                    if not dirty:
+                        dirty.add('other')
+                if dirty:
+                    self.preview_scheduler.stop()
+                    self.refresh_preview()
+
+    def settings_snapshot(self):
+        """현재 렌더링 설정 (위젯이 아직 준비되지 않았으면 None)"""
+        try:
+            return self.get_render_settings()
+        except Exception:
+            return None
+
+    def refresh_preview(self):
+        """예약된 미리보기 갱신 실행"""
+        try:
+            if hasattr(self, 'input_text') and hasattr(self, 'output_text'):
+                # 텍스트 변환 (백그라운드 스레드, 결과와 애니메이션은 on_conversion_finished에서 반영)
+                self.start_conversion()
+
         except Exception as e:
-            print(f"Widget animation error: {str(e)}")
+            print(f"Preview update error: {str(e)}")
+
+    def animate_widget(self, widget):
+        """위젯 페이드 인 애니메이션"""
+        self.animation_manager.fade_in(widget)
+
+    def set_performance_mode(self, enabled):
+        """성능 모드 (미리보기 갱신 애니메이션과 입력 창 강조 끄기)"""
+        self.animation_manager.set_enabled(not enabled)
+        self.input_highlighter.set_enabled(not enabled)
+        self.settings.setValue('performance_mode', enabled)
 
     def get_scrollbar_style(self):
         """스크롤바 스타일 반환"""
@@ -3914,6 +4937,16 @@ class ModernLogGenerator(QMainWindow):
             box_layout.addStretch()
             group.addLayout(box_layout)
 
+            # 출력 HTML 공백 제거
+            minify_layout = QHBoxLayout()
+            self.minify_output = ModernCheckBox("공백 제거 (HTML 최소화)")
+            self.minify_output.setToolTip("템플릿의 들여쓰기와 줄바꿈 없이 출력합니다.")
+            self.minify_output.setChecked(False)
+            self.minify_output.stateChanged.connect(self.update_preview)
+            minify_layout.addWidget(self.minify_output)
+            minify_layout.addStretch()
+            group.addLayout(minify_layout)
+
             # 색상 설정 컨테이너
             colors_container = QWidget()
             colors_layout = QVBoxLayout(colors_container)
@@ -4548,6 +5581,7 @@ class ModernLogGenerator(QMainWindow):
             entry.color_btn.setColor(default_style['color'])
             entry.text_color_btn.setColor(default_style['text_color'])
         
+        self.tag_model.bind(entry, entry.get_style_dict, entry.tagChanged)
         self.tag_layout.addWidget(entry)
         self.tag_container.update()  # 레이아웃 갱신
 
@@ -4575,11 +5609,7 @@ class ModernLogGenerator(QMainWindow):
         name, ok = QInputDialog.getText(self, '태그 프리셋 저장', '프리셋 이름을 입력하세요:')
         if ok and name:
             # 현재 태그 설정 수집
-            tags = []
-            for i in range(self.tag_layout.count()):
-                widget = self.tag_layout.itemAt(i).widget()
-                if isinstance(widget, TagEntry):
-                    tags.append(widget.get_style_dict())
+            tags = self.tag_model.values()
             
             # 전역 설정도 포함
             preset_data = {
@@ -4606,8 +5636,18 @@ class ModernLogGenerator(QMainWindow):
 
 
 
+    def tag_entries(self):
+        """태그 레이아웃의 TagEntry 위젯 목록"""
+        entries = []
+        for i in range(self.tag_layout.count()):
+            widget = self.tag_layout.itemAt(i).widget()
+            if isinstance(widget, TagEntry):
+                entries.append(widget)
+        return entries
+
     def clear_tags(self):
         """모든 태그 제거"""
+        self.tag_model.clear()
         while self.tag_layout.count():
             widget = self.tag_layout.takeAt(0).widget()
             if widget:
@@ -4618,12 +5658,8 @@ class ModernLogGenerator(QMainWindow):
     def sort_tags(self):
         """태그 정렬"""
         # 현재 태그 데이터 수집
-        tags = []
-        while self.tag_layout.count():
-            widget = self.tag_layout.takeAt(0).widget()
-            if isinstance(widget, TagEntry):
-                tags.append(widget.get_style_dict())
-                widget.deleteLater()
+        tags = self.tag_model.values()
+        self.clear_tags()
         
         # 태그 텍스트 기준으로 정렬
         tags.sort(key=lambda x: x['text'])
@@ -4824,9 +5860,26 @@ class ModernLogGenerator(QMainWindow):
         preprocess_layout.addWidget(self.convert_ellipsis)
 
         group.addLayout(preprocess_layout)
+
+        # 출력 형식
+        output_layout = QVBoxLayout()
+        self.compact_output = ModernCheckBox("압축 출력 (같은 스타일 병합)")
+        self.compact_output.setChecked(False)
+        self.compact_output.stateChanged.connect(self.update_compact_output_state)
+        output_layout.addWidget(self.compact_output)
+
+        style_classes_layout = QHBoxLayout()
+        style_classes_layout.setContentsMargins(20, 0, 0, 0)  # 왼쪽 여백으로 하위 설정임을 표시
+        self.use_style_classes = ModernCheckBox("<style> 클래스 사용")
+        self.use_style_classes.setToolTip("<style> 태그를 허용하는 사이트에서만 사용하세요.")
+        style_classes_layout.addWidget(self.use_style_classes)
+        output_layout.addLayout(style_classes_layout)
+
+        group.addLayout(output_layout)
         
         # 초기 들여쓰기 상태 설정
         self.update_indent_state()
+        self.update_compact_output_state()
         
         return group
 
@@ -4864,6 +5917,10 @@ class ModernLogGenerator(QMainWindow):
         is_indent_enabled = self.use_text_indent.isChecked()
         self.text_indent.setEnabled(is_indent_enabled)    
 
+    def update_compact_output_state(self):
+        """압축 출력 설정 상태 업데이트"""
+        self.use_style_classes.setEnabled(self.compact_output.isChecked())
+
     def create_word_replace_settings(self):
         """단어 변경 설정 그룹 생성"""
         group = SettingsGroup("단어 변경")
@@ -5004,16 +6061,46 @@ class ModernLogGenerator(QMainWindow):
         
         content_layout.addWidget(buttons_container)
         
-        # 이미지 URL 매핑 컨테이너
-        self.image_url_container = QWidget()
-        self.image_url_layout = QVBoxLayout(self.image_url_container)
-        self.image_url_layout.setSpacing(STYLES['spacing_small'])
-        
+        # 이미지 URL 매핑 표 (검색, 정렬 가능)
+        filter_layout = QHBoxLayout()
+        self.image_mapping_filter = QLineEdit()
+        self.image_mapping_filter.setPlaceholderText("태그 또는 URL 검색")
+        filter_layout.addWidget(self.image_mapping_filter)
+
+        remove_rows_btn = ModernButton("선택 항목 삭제")
+        remove_rows_btn.clicked.connect(self.remove_selected_image_mappings)
+        filter_layout.addWidget(remove_rows_btn)
+        content_layout.addLayout(filter_layout)
+
+        self.image_mapping_table_model = ImageMappingTableModel(self.image_mapping_model, self)
+        self.image_mapping_table_model.edited.connect(self.on_image_mapping_edited)
+
+        self.image_mapping_proxy = QSortFilterProxyModel(self)
+        self.image_mapping_proxy.setSourceModel(self.image_mapping_table_model)
+        self.image_mapping_proxy.setFilterKeyColumn(-1)  # 태그와 URL 모두 검색
+        self.image_mapping_proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.image_mapping_filter.textChanged.connect(self.image_mapping_proxy.setFilterFixedString)
+
+        self.image_mapping_table = QTableView()
+        self.image_mapping_table.setModel(self.image_mapping_proxy)
+        self.image_mapping_table.setSortingEnabled(True)
+        self.image_mapping_table.sortByColumn(-1, Qt.SortOrder.AscendingOrder)  # 처음에는 추가한 순서
+        self.image_mapping_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.image_mapping_table.setEditTriggers(
+            QAbstractItemView.EditTrigger.DoubleClicked
+            | QAbstractItemView.EditTrigger.EditKeyPressed
+            | QAbstractItemView.EditTrigger.AnyKeyPressed
+        )
+        self.image_mapping_table.verticalHeader().setVisible(False)
+        # 행 높이를 고정해 스크롤할 때 행마다 크기를 계산하지 않음
+        self.image_mapping_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.image_mapping_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.image_mapping_table.setMinimumHeight(240)
+        content_layout.addWidget(self.image_mapping_table)
+
         # 기본 항목 추가
         for _ in range(3):
-            self.add_image_url_entry()
-        
-        content_layout.addWidget(self.image_url_container)
+            self.create_image_url_entry()
         
         # 스트레치 추가하여 내용물을 위로 정렬
         content_layout.addStretch()
@@ -5045,20 +6132,8 @@ class ModernLogGenerator(QMainWindow):
     def extract_url_from_html(self, html_text):
         """HTML 텍스트에서 이미지 URL 추출"""
         try:
-            # 이미지 태그에서 URL 추출
-            url_match = re.search(r'src=["\'](.*?)["\']', html_text)
-            if url_match:
-                url = url_match.group(1)
-                
-                # 프로토콜이 없는 URL 처리
-                if url.startswith('//'):
-                    url = 'https:' + url
-                
-                # HTML 엔티티 디코딩
-                url = re.sub(r'&amp;', '&', url)
-                
-                return url.strip()
-            return None
+            # 이미지 태그에서 URL 추출 (프로토콜 보정, 엔티티 디코딩 포함)
+            return url_normalizer.image_src(html_text) or None
         except Exception as e:
             print(f"URL 추출 중 오류 발생: {str(e)}")
             return None
@@ -5072,60 +6147,47 @@ class ModernLogGenerator(QMainWindow):
         """이미지 URL 매핑 불러오기"""
         return self.image_cache.mappings.get(tag)
 
+    def create_image_url_entry(self, tag='', url=''):
+        """이미지 매핑 표에 행 추가 후 원본 모델의 행 번호 반환"""
+        return self.image_mapping_table_model.add_row(tag, url)
+
+    def clear_image_url_entries(self):
+        """모든 이미지 매핑 제거"""
+        self.image_mapping_model.clear()
+
     def add_image_url_entry(self):
-        """이미지 URL 입력 항목 추가"""
-        entry = ImageUrlEntry(self.image_url_container)
+        """이미지 URL 입력 항목 추가 (추가한 행의 태그 편집 시작)"""
+        row = self.create_image_url_entry()
+
+        # 검색 중이면 새 빈 행이 보이도록 검색어 초기화
+        self.image_mapping_filter.clear()
+        index = self.image_mapping_proxy.mapFromSource(self.image_mapping_table_model.index(row, 0))
+        if index.isValid():
+            self.image_mapping_table.scrollTo(index)
+            self.image_mapping_table.setCurrentIndex(index)
+            self.image_mapping_table.edit(index)
 
-        # 태그 입력 시 자동으로 캐시된 URL 검색
-        def check_cached_url():
-            tag = entry.tag_input.text().strip()
-            if tag:
-                cached_url = self.load_image_mapping(tag)
-                if cached_url:
-                    entry.url_input.setText(cached_url)
-        
-        entry.tag_input.editingFinished.connect(check_cached_url)
-        
-        # URL 입력 시 자동으로 캐시 저장
-        def cache_url():
-            tag = entry.tag_input.text().strip()
-            url = entry.url_input.text().strip()
-            if tag and url:
-                self.save_image_mapping(tag, url)
-        
-        entry.url_input.editingFinished.connect(cache_url)
-        
-        self.image_url_layout.addWidget(entry)
-            
-        # 레이아웃 업데이트 및 스크롤 영역 조정
-        self.image_url_container.adjustSize()
-        if hasattr(self, 'asset_status'):
-            self.asset_status.setText(
-                "사용 방법:\n"
-                "1. 이미지 태그에 식별자를 입력하세요 (예: character_happy)\n"
-                "2. 해당하는 이미지 URL을 입력하세요\n"
-                "3. 본문에서 다음과 같이 사용하세요:\n"
-                "   - <img src=\"character_happy\">\n"
-                "   - {{img::\"character_happy\"}}\n"
-                "   - [img:character_happy]"
-            )
-        
-        # URL 입력 시 자동으로 캐시 저장
-        def cache_url():
-            tag = entry.tag_input.text().strip()
-            url = entry.url_input.text().strip()
-            if tag and url:
-                self.save_image_mapping(tag, url)
-        
-        entry.url_input.editingFinished.connect(cache_url)
-        
-        self.image_url_layout.addWidget(entry)
-        
-        # 레이아웃 업데이트 및 스크롤 영역 조정
-        self.image_url_container.adjustSize()
         if hasattr(self, 'asset_status'):
             self.asset_status.setText("아카라이브 글쓰기에서 이미지 HTML 코드를 이미지 URL에 붙여넣습니다.")
 
+    def remove_selected_image_mappings(self):
+        """표에서 선택한 매핑 삭제"""
+        rows = [
+            self.image_mapping_proxy.mapToSource(index).row()
+            for index in self.image_mapping_table.selectionModel().selectedRows()
+        ]
+        self.image_mapping_table_model.remove_rows(rows)
+
+    def on_image_mapping_edited(self, row, column):
+        """매핑 편집 후 처리 (태그 입력 시 캐시된 URL 채우기, URL 입력 시 캐시 저장)"""
+        tag, url = self.image_mapping_table_model.pair_at(row)
+        if column == 0 and tag and not url:
+            cached_url = self.load_image_mapping(tag)
+            if cached_url:
+                self.image_mapping_table_model.set_pair(row, (tag, cached_url))
+        elif column == 1 and tag and url:
+            self.save_image_mapping(tag, url)
+
     def upload_character_card(self):
         """캐릭터 카드 업로드 처리"""
         file_filter = "Character Card Files (*.json *.png *.charx);;All Files (*.*)"
@@ -5261,8 +6323,7 @@ class ModernLogGenerator(QMainWindow):
 
     def add_word_replace_entry(self):
         """단어 변경 입력 항목 추가"""
-        entry = WordReplaceEntry(self.word_replace_container)
-        self.word_replace_layout.addWidget(entry)
+        self.word_replace_manager.add_entry()
 
     def update_text_size_state(self):
         """텍스트 크기 설정 상태 업데이트"""
@@ -5285,6 +6346,7 @@ class ModernLogGenerator(QMainWindow):
         
         self.input_text = QTextEdit()
         self.input_text.setPlaceholderText("여기에 텍스트를 입력하세요...")
+        self.input_highlighter = ConversationHighlighter(self.input_text.document())
         input_group.addWidget(self.input_text)
         layout.addWidget(input_group)
         
@@ -5293,8 +6355,15 @@ class ModernLogGenerator(QMainWindow):
         
         self.output_text = QTextEdit()
         self.output_text.setReadOnly(True)
+        self.output_text.setUndoRedoEnabled(False)
         self.output_text.setFont(QFont("Consolas", STYLES['font_size_normal']))
-        output_group.addWidget(self.output_text)
+
+        # HTML 원문과 실제 모양 미리보기를 탭으로 전환
+        self.rendered_preview = RenderedPreview(self.image_cache_manager)
+        self.output_tabs = QTabWidget()
+        self.output_tabs.addTab(self.output_text, "HTML")
+        self.output_tabs.addTab(self.rendered_preview, "미리보기")
+        output_group.addWidget(self.output_tabs)
         layout.addWidget(output_group)
         
         # 버튼 영역
@@ -5310,6 +6379,22 @@ class ModernLogGenerator(QMainWindow):
         copy_btn = ModernButton("HTML 복사")
         copy_btn.clicked.connect(self.copy_to_clipboard)
         button_layout.addWidget(copy_btn)
+
+        # 성능 모드 (저사양 PC에서 미리보기 애니메이션 끄기)
+        self.performance_mode = ModernCheckBox("성능 모드")
+        self.performance_mode.setToolTip("미리보기 갱신 시 애니메이션과 입력 창 강조를 사용하지 않습니다.")
+        self.performance_mode.setChecked(self.settings.value('performance_mode', False, type=bool))
+        self.performance_mode.toggled.connect(self.set_performance_mode)
+        self.animation_manager.set_enabled(not self.performance_mode.isChecked())
+        self.input_highlighter.set_enabled(not self.performance_mode.isChecked())
+        button_layout.addWidget(self.performance_mode)
+
+        # 변환 결과 디스크 캐시 (같은 로그를 같은 설정으로 다시 열 때 변환 생략)
+        self.use_render_cache = ModernCheckBox("결과 캐시")
+        self.use_render_cache.setToolTip("오래 걸린 변환 결과를 저장해 두고, 같은 입력과 설정이면 다시 변환하지 않습니다.")
+        self.use_render_cache.setChecked(self.settings.value('render_disk_cache', False, type=bool))
+        self.use_render_cache.toggled.connect(self.set_render_disk_cache)
+        button_layout.addWidget(self.use_render_cache)
         
         layout.addWidget(button_container)
         
@@ -5404,202 +6489,20 @@ class ModernLogGenerator(QMainWindow):
         self.solid_settings.setVisible(not is_gradient)
 
     def process_image_tags(self, content):
-        """이미지 태그 처리 - 성능 개선 버전"""
-        if not content:
-            return content
-            
-        try:
-            # 1. URL 매핑 한 번만 수집
-            url_mappings = self._collect_url_mappings()
-            
-            # 2. 스타일 설정 한 번만 생성
-            style_settings = self.get_image_style_settings()
-            base_style = self._create_base_style(style_settings)
-            
-            # 3. 태그 변환 함수
-            def replace_tag(match):
-                try:
-                    full_match = match.group(0)
-                    
-                    # 3.1 따옴표 정규화
-                    full_match = full_match.replace('″', '"').replace('"', '"').replace('"', '"')
-                    
-                    # 3.2 태그 추출
-                    tag = self._extract_tag_from_match(full_match)
-                    
-                    # 3.3 매핑된 URL이 있으면 HTML 생성
-                    if tag and tag in url_mappings:
-                        return self._create_image_html(
-                            url_mappings[tag],
-                            tag,
-                            base_style
-                        )
-                        
-                    return full_match
-                    
-                except Exception as e:
-                    print(f"태그 처리 중 오류: {str(e)}")
-                    return full_match
+        """이미지 태그 처리"""
+        return self.renderer.process_image_tags(content, self.get_render_settings())
 
-            # 4. 모든 패턴에 대해 처리
-            result = content
-            for pattern in self._get_image_patterns():
-                result = re.sub(pattern, replace_tag, result)
-            
-            return result
-            
-        except Exception as e:
-            print(f"이미지 처리 중 오류: {str(e)}")
-            return content
+    def _collect_image_mapping_pairs(self):
+        """이미지 매핑 모델의 (태그, URL) 쌍"""
+        return self.image_mapping_model.pairs()
 
     def _collect_url_mappings(self):
         """URL 매핑 수집"""
-        mappings = {}
-        for entry in self.image_url_container.findChildren(ImageUrlEntry):
-            tag = entry.tag_input.text().strip()
-            url = entry.url_input.text().strip()
-            if tag and url:
-                if 'style="width: 0px; height: 0px;"' in url:
-                    url = url.replace('style="width: 0px; height: 0px;"', '')
-                tag = self._extract_tag_identifier(tag)
-                url = self._clean_url(url)
-                mappings[tag] = url
-        return mappings
-
-    def _create_base_style(self, settings):
-        """기본 이미지 스타일 생성"""
-        style = f"""
-            max-width:{settings['size']}%;
-            margin:{settings['margin']}px 0;
-            border-radius:12px;
-        """
-        
-        if settings['use_border']:
-            style += f"border:2px solid {settings['border_color']};"
-        if settings['use_shadow']:
-            style += "box-shadow:rgba(0,0,0,0.12) 0px 4px 16px;"
-            
-        return style
-
-    def _extract_tag_from_match(self, full_match):
-        """태그 추출"""
-        tag = None
-        
-        if '{{' in full_match:
-            if 'img::' in full_match or 'image::' in full_match:
-                tag = full_match.split('::')[1].rstrip('}}').strip('"\'')
-            elif 'img=' in full_match or 'image=' in full_match:
-                tag = full_match.split('=')[1].strip('{}"\' ')
-        elif '<img' in full_match or '<image' in full_match:
-            if 'src=' in full_match:
-                tag_match = re.search(r'src=[\'"″""](.*?)[\'"″""]', full_match)
-                if tag_match:
-                    tag = tag_match.group(1)
-            else:
-                tag_match = re.search(r'=([\'"″""](.*?)[\'"″""])', full_match)
-                if tag_match:
-                    tag = tag_match.group(2)
-                    
-        return tag
-
-    def _create_image_html(self, url, tag, style):
-        """이미지 HTML 생성"""
-        return f'''
-            <div style="margin-bottom:1rem; width:100%; text-align:center;">
-                <img style="{style}" 
-                    src="{url}" alt="{tag}" class="fr-fic fr-dii">
-            </div>
-        '''
-
-    def _get_image_patterns(self):
-        """이미지 태그 패턴 목록"""
-        return [
-            r'\{\{(img|image)::[\'""″""]*[^}]+[\'""″""]*\}\}',
-            r'\{\{(img|image)=[\'""″""]*[^}]+[\'""″""]*\}\}',
-            r'<(img|image)\s+src=[\'""″""]*[^\'""″""]+[\'""″""]*>',
-            r'<(img|image)=[\'""″""]*[^>]+[\'""″""]*>',
-            r'<img=[\'""″""]*[^>]+[\'""″""]*>',  # 새로운 패턴 추가
-        ]
+        return self.renderer.collect_url_mappings(self._collect_image_mapping_pairs())
+
     def _extract_tag_identifier(self, tag):
         """이미지 태그에서 식별자만 추출"""
-        # img 태그에서 식별자 추출
-        if '<img' in tag:
-            match = re.search(r'src=[\'"](.*?)[\'"]', tag)
-            if match:
-                tag = match.group(1)
-        
-        # {{img::}} 형식에서 식별자 추출
-        elif tag.startswith('{{img::'):
-            tag = tag.split('::')[1].rstrip('}}').strip('"\'')
-        
-        # {{img=}} 형식에서 식별자 추출
-        elif '{{img=' in tag:
-            tag = tag.split('=')[1].strip('{}"\'')
-        
-        # .png 확장자 제거
-        if tag.lower().endswith('.png'):
-            tag = tag[:-4]
-        
-        return tag.strip()
-
-    def _clean_url(self, url):
-        """URL 정리"""
-        # img 태그에서 URL 추출
-        if '<img' in url:
-            match = re.search(r'src=[\'"](.*?)[\'"]', url)
-            if match:
-                url = match.group(1)
-        
-        # 프로토콜 처리
-        if url.startswith('//'):
-            url = 'https:' + url
-        
-        # HTML 엔티티 디코딩
-        url = re.sub(r'&amp;', '&', url)
-        
-        return url.strip()
-
-    def process_image_url(self, url):
-        """이미지 URL 처리"""
-        if not url or not url.strip():
-            print("No URL provided, using default image")
-            return DEFAULT_PROFILE_IMAGE
-        
-        try:
-            url = url.strip()
-            print(f"Processing URL: {url}")
-            
-            # HTML 태그에서 URL 추출
-            if '<img' in url:
-                src_match = re.search(r'src=["\'](.*?)["\']', url)
-                if src_match:
-                    url = src_match.group(1)
-                    print(f"Extracted URL from img tag: {url}")
-            
-            # 프로토콜 처리
-            if url.startswith('//'):
-                url = 'https:' + url
-                print(f"Added https protocol: {url}")
-            
-            # 커뮤니티 이미지 URL 처리 (쿼리 파라미터 유지)
-            if 'namu.la' in url or 'dcinside.com' in url:
-                # 전체 URL을 캡처하도록 패턴 수정
-                url_match = re.search(r'((?:https?:)?//[^\s<>"]+?\.(?:jpg|jpeg|png|gif)(?:\?[^"\s<>]*)?)', url)
-                if url_match:
-                    url = url_match.group(1)
-                    if url.startswith('//'):
-                        url = 'https:' + url
-                    print(f"Processed community URL: {url}")
-            
-            # HTML 엔티티 디코딩
-            url = re.sub(r'&amp;', '&', url)
-            
-            print(f"Final processed URL: {url}")
-            return url
-
-        except Exception as e:
-            print(f"Error processing image URL: {str(e)}")
-            return DEFAULT_PROFILE_IMAGE
+        return extract_tag_identifier(tag)
 
     def update_profile_image(self):
         """프로필 이미지 업데이트"""
@@ -5608,15 +6511,6 @@ class ModernLogGenerator(QMainWindow):
             if not self.show_profile.isChecked() or not self.show_profile_image.isChecked():
                 return
             
-            # URL 처리
-            image_url = self.process_image_url(self.image_url.text())
-            print(f"Using image URL: {image_url}")
-            
-            # 프레임 스타일에 따른 설정
-            frame_style = self.frame_style.currentText()
-            width = self.width_input.value()
-            height = self.height_input.value()
-            
             # 미리보기 업데이트
             self.update_preview()
             
@@ -5637,333 +6531,164 @@ class ModernLogGenerator(QMainWindow):
 
     def get_image_mappings(self):
         """현재 설정된 이미지 매핑 정보 반환"""
-        mappings = {}
-        for entry in self.image_url_container.findChildren(ImageUrlEntry):
-            tag = entry.tag_input.text().strip()
-            url = entry.url_input.text().strip()
-            if tag and url:
-                mappings[tag] = url
-        return mappings
+        return dict(self.image_mapping_model.mapping())
 
     def format_conversation(self, text):
-        """대화문 포맷팅 - 대화문에만 선택적 줄바꿈 적용, 공백 보존, 따옴표 스타일링"""
-        indent = self.text_indent.value() if self.use_text_indent.isChecked() else 0
-        dialog_color = self.dialog_color.get_color()
-        inner_thoughts_color = self.inner_thoughts_color.get_color()
-        narration_color = self.narration_color.get_color()
-        
-        dialog_bold = "font-weight:bold;" if self.dialog_bold.isChecked() else ""
-        inner_thoughts_bold = "font-weight:bold;" if self.inner_thoughts_bold.isChecked() else ""
-        text_size = f"font-size:{self.text_size.value()}px;" if self.use_text_size.isChecked() else ""
-        
-        if self.convert_ellipsis.isChecked():
-            text = text.replace('...', '…')
-        
-        # 공백을 보존하면서 따옴표를 포함하는 패턴
-        # 모든 종류의 따옴표를 한꺼번에 매칭하도록 수정
-        # 모든 종류의 따옴표 및 볼드 패턴 매칭
-        dialog_pattern = r'(\*\*".*?"\*\*|["""″“""]\s*.+?\s*["""″”""]|".*?")'
-
-        # 속마음 패턴은 그대로 유지
-        inner_thoughts_pattern = r'([\'\'\']\s*.+?\s*[\'\'\'])'
-        
-        lines = text.split('\n')
-        formatted_lines = []
-        
-        for line in lines:
-            if not line.strip():
-                formatted_lines.append('<p><br></p>')
-                continue
-                
-            if line.strip().startswith('<') and line.strip().endswith('>'):
-                continue
-            
-            parts_to_process = []
-            
-            # 대화문 처리: re.split 대신 re.finditer 사용
-            last_end = 0
-            for match in re.finditer(dialog_pattern, line):
-                # 대화문 이전의 나레이션 처리
-                if match.start() > last_end:
-                    narration = line[last_end:match.start()]
-                    if narration.strip():
-                        # 나레이션 내의 속마음 처리
-                        for inner_match in re.finditer(inner_thoughts_pattern, narration):
-                            # 속마음 이전 텍스트
-                            prev_text = narration[0:inner_match.start()]
-                            if prev_text.strip():
-                                style = f"color:{narration_color}; {text_size}"
-                                parts_to_process.append(f'<span style="{style}">{prev_text}</span>')
-                            
-                            # 속마음 텍스트
-                            inner_thought = inner_match.group()
-                            style = f"color:{inner_thoughts_color}; {inner_thoughts_bold} {text_size}"
-                            parts_to_process.append(f'<span style="{style}">{inner_thought}</span>')
-                            
-                            narration = narration[inner_match.end():]
-                        
-                        # 남은 나레이션 처리
-                        if narration.strip():
-                            style = f"color:{narration_color}; {text_size}"
-                            parts_to_process.append(f'<span style="{style}">{narration}</span>')
-                
-                # 대화문 처리
-                dialog = match.group()
-                style = f"color:{dialog_color}; {dialog_bold} {text_size}"
-                if self.dialog_newline.isChecked():
-                    content = f'<span style="{style}">{dialog}</span>'
-                    parts_to_process.append(f'<div style="margin-top:1em; margin-bottom:1em;">{content}</div>')
-                else:
-                    parts_to_process.append(f'<span style="{style}">{dialog}</span>')
-                    
-                last_end = match.end()
-            
-            # 마지막 대화문 이후의 나레이션 처리
-            if last_end < len(line):
-                remaining = line[last_end:]
-                if remaining.strip():
-                    style = f"color:{narration_color}; {text_size}"
-                    parts_to_process.append(f'<span style="{style}">{remaining}</span>')
-            
-            # 들여쓰기 처리
-            if self.use_text_indent.isChecked():
-                formatted_lines.append(
-                    f'<div style="margin-bottom:1rem; text-indent:{indent}px">{"".join(parts_to_process)}</div>'
-                )
-            else:
-                formatted_lines.append(
-                    f'<div style="margin-bottom:1rem;">{"".join(parts_to_process)}</div>'
-                )
-        
-        return '\n'.join(formatted_lines)
+        """대화문 포맷팅"""
+        return self.renderer.format_conversation(text, self.get_render_settings())
 
     def create_template(self, content):
         """템플릿 HTML 생성"""
-        try:
-            template_name = self.template_combo.currentText()
-            padding_html = '<p><br></p>' if self.use_padding.isChecked() else ''
-            
-            # 박스 색상
-            box_outer_color = self.outer_box_color.get_color()
-            box_inner_color = self.inner_box_color.get_color()
-            shadow_value = self.shadow_intensity.value()
-            
-            # 테두리 설정
-            border_style = ""
-            if self.use_box_border.isChecked():
-                border_color = self.box_border_color.get_color()
-                border_thickness = self.box_border_thickness.value()
-                border_style = f"border: {border_thickness}px solid {border_color};"
-        
-            if self.show_inner_box.isChecked():
-                # 내부 박스가 있을 때
-                background_color = box_outer_color
-                inner_box_style = f"""
-                    font-size:{STYLES['font_size_normal']}px;
-                    background:{box_inner_color};
-                    padding:{STYLES['spacing_large']}px;
-                    border-radius:{STYLES['radius_normal']}px;"""
-            else:
-                # 내부 박스가 없을 때
-                background_color = box_inner_color
-                inner_box_style = f"""
-                    font-size:{STYLES['font_size_normal']}px;
-                    padding:0;"""
-
-            # 프로필 영역 HTML 생성
-            profile_section_html = ''
-            if self.show_profile.isChecked():
-                try:
-                    profile_parts = []
-                    
-                    # 프로필 이미지
-                    if self.show_profile_image.isChecked():
-                        profile_border_color = self.profile_border_color.get_color()
-                        width = self.width_input.value()
-                        height = self.height_input.value()
-                        image_url = self.process_image_url(self.image_url.text())
-                        
-                        # 기본 이미지 스타일 설정
-                        common_style = f'''
-                            max-width:100%;
-                            {f'box-shadow:rgba(0,0,0,0.12) 0px 4px 16px;' if self.show_profile_shadow.isChecked() else ''}
-                            {f'border:3px solid {profile_border_color};' if self.show_profile_border.isChecked() else ''}
-                        '''
-                        
-                        if self.frame_style.currentText() == "배너":
-                            profile_style = f"{common_style} border-radius:12px;"
-                            container_style = "width:100%;"
-                        elif self.frame_style.currentText() == "동그라미":
-                            profile_style = f"{common_style} width:{width}px; height:{width}px; border-radius:50%; object-fit:cover;"
-                            container_style = "width:auto;"
-                        else:  # 직사각형
-                            profile_style = f"{common_style} width:{width}px; height:{height}px; border-radius:8px; object-fit:cover;"
-                            container_style = "width:auto;"
-                        
-                        profile_html = f'''
-                        <div style="margin-bottom:1rem; text-align:center; {container_style}">
-                            <img style="{profile_style}" 
-                                src="{image_url}" 
-                                alt="profile" 
-                                class="fr-fic fr-dii">
-                        </div>
-                        '''
-                        profile_parts.append(profile_html)
-                    
-                    # 봇 이름
-                    if self.show_bot_name.isChecked():
-                        bot_name = self.bot_name.text() or "봇 이름"
-                        bot_name_color = self.bot_name_color.get_color()
-                        bot_name_html = f'''
-                            <h3 style="color:{bot_name_color};font-weight:{STYLES['font_weight_bold']};">{bot_name}</h3>
-                        '''
-                        profile_parts.append(bot_name_html)
-
-                    # 태그 처리
-                    if self.show_tags.isChecked():
-                        tags_html = []
-                        for i in range(self.tag_layout.count()):
-                            widget = self.tag_layout.itemAt(i).widget()
-                            if isinstance(widget, TagEntry):
-                                style_dict = widget.get_style_dict()
-                                tag_text = style_dict['text'] or f"태그 {i+1}"
-                                
-                                css_styles = [
-                                    "display:inline-block",
-                                    f"border-radius:{style_dict['border_radius']}px",
-                                    f"font-size:{style_dict['font_size']}rem",
-                                    f"padding:{style_dict['padding']['top']}rem {style_dict['padding']['right']}rem "
-                                    f"{style_dict['padding']['bottom']}rem {style_dict['padding']['left']}rem",
-                                    f"color:{style_dict['text_color']}",
-                                    "margin:0.15rem 0.2rem",
-                                    "white-space:nowrap"
-                                ]
-                                
-                                if style_dict['style'] == "투명 배경":
-                                    css_styles.extend([
-                                        f"background:transparent",
-                                        f"border:1px solid {style_dict['color']}"
-                                    ])
-                                elif style_dict['style'] == "그라데이션":
-                                    base_color = QColor(style_dict['color'])
-                                    light_color = base_color.lighter(120).name()
-                                    dark_color = base_color.darker(120).name()
-                                    css_styles.extend([
-                                        f"background:linear-gradient(135deg, {light_color}, {dark_color})",
-                                        "border:none"
-                                    ])
-                                else:
-                                    css_styles.extend([
-                                        f"background:{style_dict['color']}",
-                                        "border:none"
-                                    ])
-                                
-                                tag_html = f'''
-                                    <span style="{';'.join(css_styles)}">{tag_text}</span>
-                                '''
-                                tags_html.append(tag_html)
-                        
-                        if tags_html:
-                            tags_container = f'''
-                                <div style="text-align:center;margin:0 auto;max-width:fit-content;">
-                                    {''.join(tags_html)}
-                                </div>
-                            '''
-                            profile_parts.append(tags_container)
-                    
-                    # 구분선
-                    if self.show_divider.isChecked():
-                        thickness = self.divider_thickness.value()
-                        if self.divider_style.currentText() == "그라데이션":
-                            divider_outer_color = self.divider_outer_color.get_color()
-                            divider_inner_color = self.divider_inner_color.get_color()
-                            divider_style = f"background:linear-gradient(to right,{divider_outer_color} 0%,{divider_inner_color} 50%,{divider_outer_color} 100%);"
-                        else:
-                            solid_color = self.divider_solid_color.get_color()
-                            divider_style = f"background:{solid_color};"
-
-                        divider_html = f'''
-                            <div style="height:{thickness}px;{divider_style}margin:1rem 0;border-radius:{thickness/2}px;">
-                                <br>
-                            </div>
-                        '''
-                        profile_parts.append(divider_html)
-                    
-                    # 전체 프로필 섹션 조합
-                    if profile_parts:
-                        profile_section_html = f'''
-                            <div style="display:flex;flex-direction:column;text-align:center;margin-bottom:1.25rem;">
-                                {''.join(profile_parts)}
-                            </div>
-                        '''
-                
-                except Exception as e:
-                    print(f"Error in profile creation: {str(e)}")
-            
-            # 최종 템플릿 반환
-            return f'''{padding_html}
-                <div style="font-family:{STYLES['font_family']};
-                            color:{STYLES['text']};
-                            line-height:1.8;
-                            width:100%;
-                            max-width:600px;
-                            margin:1rem auto;
-                            background:{background_color};
-                            border-radius:{STYLES['radius_large']}px;
-                            box-shadow:0px {shadow_value}px {shadow_value * 2}px rgba(0,0,0,0.2);
-                            {border_style}">
-                    <div style="padding:{STYLES['spacing_large']}px;">
-                        <div style="{inner_box_style}">
-                            {profile_section_html}
-                            {content}
-                        </div>
-                    </div>
-                </div>
-                {padding_html}'''
-                
-        except Exception as e:
-            print(f"Error in template creation: {str(e)}")
-            return f"<div>{content}</div>"
+        return self.renderer.create_template(content, self.get_render_settings())
+
+    def get_render_settings(self):
+        """현재 위젯 값으로 렌더링 설정 스냅샷 생성"""
+        return RenderSettings(
+            # 텍스트 설정
+            use_text_indent=self.use_text_indent.isChecked(),
+            text_indent=self.text_indent.value(),
+            dialog_color=self.dialog_color.get_color(),
+            narration_color=self.narration_color.get_color(),
+            inner_thoughts_color=self.inner_thoughts_color.get_color(),
+            dialog_bold=self.dialog_bold.isChecked(),
+            dialog_newline=self.dialog_newline.isChecked(),
+            inner_thoughts_bold=self.inner_thoughts_bold.isChecked(),
+            use_text_size=self.use_text_size.isChecked(),
+            text_size=self.text_size.value(),
+            convert_ellipsis=self.convert_ellipsis.isChecked(),
+            remove_asterisk=self.remove_asterisk.isChecked(),
+            use_padding=self.use_padding.isChecked(),
+            compact_output=self.compact_output.isChecked(),
+            use_style_classes=self.use_style_classes.isChecked(),
+            # 박스 설정
+            outer_box_color=self.outer_box_color.get_color(),
+            inner_box_color=self.inner_box_color.get_color(),
+            show_inner_box=self.show_inner_box.isChecked(),
+            minify_output=self.minify_output.isChecked(),
+            shadow_intensity=self.shadow_intensity.value(),
+            use_box_border=self.use_box_border.isChecked(),
+            box_border_color=self.box_border_color.get_color(),
+            box_border_thickness=self.box_border_thickness.value(),
+            # 프로필 설정
+            show_profile=self.show_profile.isChecked(),
+            show_profile_image=self.show_profile_image.isChecked(),
+            show_bot_name=self.show_bot_name.isChecked(),
+            show_tags=self.show_tags.isChecked(),
+            show_divider=self.show_divider.isChecked(),
+            bot_name=self.bot_name.text(),
+            bot_name_color=self.bot_name_color.get_color(),
+            image_url=self.image_url.text(),
+            frame_style=self.frame_style.currentText(),
+            profile_width=self.width_input.value(),
+            profile_height=self.height_input.value(),
+            show_profile_border=self.show_profile_border.isChecked(),
+            show_profile_shadow=self.show_profile_shadow.isChecked(),
+            profile_border_color=self.profile_border_color.get_color(),
+            tags=self.tag_model.styles(),
+            # 구분선 설정
+            divider_style=self.divider_style.currentText(),
+            divider_thickness=self.divider_thickness.value(),
+            divider_outer_color=self.divider_outer_color.get_color(),
+            divider_inner_color=self.divider_inner_color.get_color(),
+            divider_solid_color=self.divider_solid_color.get_color(),
+            # 에셋 이미지 설정
+            image_size=self.image_size.value(),
+            image_margin=self.image_margin.value(),
+            use_image_border=self.use_image_border.isChecked(),
+            image_border_color=self.image_border_color.get_color(),
+            use_image_shadow=self.use_image_shadow.isChecked(),
+            image_mappings=self._collect_image_mapping_pairs(),
+            # 단어 변경
+            word_replacements=self.word_replace_manager.get_rules(),
+            # 템플릿 공통 스타일
+            font_family=STYLES['font_family'],
+            text_color=STYLES['text'],
+            font_size_normal=STYLES['font_size_normal'],
+            font_weight_bold=STYLES['font_weight_bold'],
+            spacing_large=STYLES['spacing_large'],
+            radius_normal=STYLES['radius_normal'],
+            radius_large=STYLES['radius_large']
+        )
 
     def convert_text(self):
         """텍스트 변환"""
         try:
+            # 진행 중인 미리보기 변환은 취소하고 끝날 때까지 대기
+            self.cancel_conversion()
+            self.conversion_pool.waitForDone()
+
             input_text = self.input_text.toPlainText()
-            if not input_text.strip():
-                self.output_text.setPlainText("")
-                return
 
-            # 이미지 태그 처리를 먼저 수행
-            content = self.process_image_tags(input_text)
-            
-            # 단어 변경
-            for entry in self.word_replace_container.findChildren(WordReplaceEntry):
-                from_word, to_word = entry.get_replacement_pair()
-                if from_word:  # 변환할 단어가 있으면
-                    # 변환될 단어가 비어있으면 삭제, 아니면 변환
-                    content = content.replace(from_word, to_word if to_word is not None else '')
+            # 위젯 값은 한 번만 읽고, 변환은 렌더링 엔진에 맡김
+            settings = self.get_render_settings()
+            self.input_highlighter.set_settings(settings)
+            parts, saved_bytes = self.render_parts(input_text, settings)
+            self.set_output_html(''.join(parts))
+            self.rendered_preview.set_parts(parts)
+            self.show_minify_savings(settings, saved_bytes)
 
-            # 에스터리스크 제거
-            if self.remove_asterisk.isChecked():
-                content = re.sub(r'\*+', '', content)
+        except Exception as e:
+            self.handle_error(
+                "데이터 처리 중 오류가 발생했습니다.",
+                ErrorSeverity.MEDIUM,
+                e
+            )
+
+    def active_disk_cache(self):
+        """사용 중인 디스크 캐시 (옵션이 꺼져 있으면 None)"""
+        if self.settings.value('render_disk_cache', False, type=bool):
+            return self.render_disk_cache
+        return None
+
+    def render_parts(self, input_text, settings):
+        """GUI 스레드에서 변환 (디스크 캐시에 있으면 변환하지 않음)"""
+        disk_cache = self.active_disk_cache()
+        key = disk_cache.key(input_text, settings) if disk_cache else None
+        cached = disk_cache.get(key) if key else None
+        if cached is not None:
+            return cached
+
+        started = perf_counter()
+        parts = list(self.renderer.render_iter(input_text, settings, len(input_text) + 1))
+        saved_bytes = self.renderer.last_minify_saved_bytes
+        if key and (perf_counter() - started) * 1000 >= disk_cache.MIN_RENDER_MS:
+            disk_cache.put(key, parts, saved_bytes)
+        return parts, saved_bytes
+
+    def set_render_disk_cache(self, enabled):
+        """변환 결과 디스크 캐시 사용 여부"""
+        self.settings.setValue('render_disk_cache', enabled)
+
+    def start_conversion(self):
+        """백그라운드 스레드에서 변환 시작 (이전 요청은 취소)"""
+        try:
+            # 1. 위젯 값은 GUI 스레드에서 읽어 스냅샷으로 전달
+            input_text = self.input_text.toPlainText()
+            settings = self.get_render_settings()
+            self.input_highlighter.set_settings(settings)
+
+            # 2. 새 요청 번호 발급 → 실행 중인 작업은 다음 확인 시점에 중단
+            self.cancel_conversion()
+            generation = self.conversion_generation
+
+            # 변환 비용 측정 시작 (미리보기 대기 시간 계산용)
+            self.conversion_started = perf_counter()
+            self.conversion_size = len(input_text)
+
+            worker = ConversionWorker(
+                self.renderer,
+                input_text,
+                settings,
+                generation,
+                lambda g: g == self.conversion_generation,
+                self.active_disk_cache()
+            )
+            worker.signals.finished.connect(
+                lambda g, parts, saved: self.on_conversion_finished(g, parts, saved, settings)
+            )
+            worker.signals.failed.connect(self.on_conversion_failed)
+            self.conversion_pool.start(worker)
 
-            # 각 문단을 처리
-            paragraphs = []
-            for paragraph in content.split('\n\n'):
-                if paragraph.strip():
-                    # 이미 처리된 HTML이면 그대로 사용, 아니면 대화문 포맷팅
-                    if paragraph.strip().startswith('<div'):
-                        paragraphs.append(paragraph)
-                    else:
-                        formatted_text = self.format_conversation(paragraph)
-                        paragraphs.append(f'<div style="margin-bottom:1.5rem;">{formatted_text}</div>')
-            
-            # 최종 HTML 생성
-            content = '\n'.join(paragraphs)
-            template = self.create_template(content)
-            
-            self.output_text.setPlainText(template)
-            
         except Exception as e:
             self.handle_error(
                 "데이터 처리 중 오류가 발생했습니다.",
@@ -5971,10 +6696,104 @@ class ModernLogGenerator(QMainWindow):
                 e
             )
 
+    def cancel_conversion(self):
+        """대기 중이거나 실행 중인 변환 작업을 무효화"""
+        self.conversion_generation += 1
+        self.conversion_pool.clear()
+
+    def on_conversion_finished(self, generation, parts, saved_bytes, settings):
+        """변환 결과 반영 (최신 요청의 결과만 적용)"""
+        if generation != self.conversion_generation:
+            return
+
+        try:
+            self.set_output_html(''.join(parts))
+            self.rendered_preview.set_parts(parts)
+            self.show_minify_savings(settings, saved_bytes)
+
+            # 결과 반영까지 걸린 시간을 다음 대기 시간에 반영
+            elapsed = (perf_counter() - self.conversion_started) * 1000
+            self.preview_scheduler.record_cost(elapsed, self.conversion_size)
+
+            # 태그 영역 페이드 (예산 초과, 진행 중, 성능 모드면 생략)
+            self.animation_manager.fade_in(getattr(self, 'tag_container', None), elapsed)
+
+        except Exception as e:
+            print(f"Preview update error: {str(e)}")
+
+    def set_output_html(self, html):
+        """변환 결과를 버퍼에 저장하고 출력 창에는 바뀐 블록만 반영"""
+        self.output_html = html
+        new_lines = self.output_view_text(html).split('\n')
+        old_lines = self.output_view_lines
+        document = self.output_text.document()
+
+        # 1. 문서가 비었거나 버퍼와 어긋나 있으면 전체 설정
+        if not old_lines or document.blockCount() != len(old_lines):
+            self.output_text.setPlainText('\n'.join(new_lines))
+            self.output_view_lines = new_lines
+            return
+
+        # 2. 앞뒤로 같은 블록 수 계산
+        limit = min(len(old_lines), len(new_lines))
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        if prefix == len(old_lines) == len(new_lines):
+            return
+        suffix = 0
+        while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+            suffix += 1
+
+        # 3. 바뀐 블록 범위 계산 (뒤에 같은 블록이 있으면 줄바꿈을 뒤에, 없으면 앞에 붙임)
+        middle = new_lines[prefix:len(new_lines) - suffix]
+        if suffix:
+            start = document.findBlockByNumber(prefix).position()
+            end = document.findBlockByNumber(len(old_lines) - suffix).position()
+            text = ''.join(line + '\n' for line in middle)
+        elif prefix:
+            block = document.findBlockByNumber(prefix - 1)
+            start = block.position() + block.length() - 1
+            end = document.characterCount() - 1
+            text = ''.join('\n' + line for line in middle)
+        else:
+            self.output_text.setPlainText('\n'.join(new_lines))
+            self.output_view_lines = new_lines
+            return
+
+        # 4. 바뀐 범위만 한 번의 편집으로 교체 (커서와 스크롤 위치는 그대로 유지됨)
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertText(text)
+        cursor.endEditBlock()
+        self.output_view_lines = new_lines
+
+    def output_view_text(self, html):
+        """출력 창에 표시할 텍스트 (큰 결과는 앞부분만)"""
+        if len(html) <= self.OUTPUT_VIEW_LIMIT:
+            return html
+        return (
+            f"{html[:self.OUTPUT_VIEW_LIMIT]}\n\n"
+            f"<!-- 전체 {len(html):,}자 중 앞부분 {self.OUTPUT_VIEW_LIMIT:,}자만 표시합니다. "
+            f"'HTML 복사'를 누르면 전체가 복사됩니다. -->"
+        )
+
+    def on_conversion_failed(self, generation, message):
+        """변환 오류 처리 (최신 요청의 오류만 표시)"""
+        if generation == self.conversion_generation:
+            self.statusBar().showMessage(f"변환 중 오류 발생: {message}", 5000)
+
+    def show_minify_savings(self, settings, saved_bytes):
+        """공백 제거로 줄인 바이트 수를 상태 표시줄에 표시"""
+        if settings.minify_output:
+            self.statusBar().showMessage(f"공백 제거로 {saved_bytes:,}바이트 절약", 5000)
+
     def copy_to_clipboard(self):
-        """HTML 복사"""
+        """HTML 복사 (출력 창이 아닌 결과 버퍼에서, 요청될 때 제공)"""
         clipboard = QApplication.clipboard()
-        clipboard.setText(self.output_text.toPlainText())
+        clipboard.setMimeData(LazyMimeData(self.output_html))
 
     def create_bulk_url_input_dialog(self):
         """대량 URL 입력 다이얼로그"""
@@ -6093,23 +6912,20 @@ class ModernLogGenerator(QMainWindow):
                 return False
                 
             # 기존 매핑 삭제
-            for i in reversed(range(self.image_url_layout.count())):
-                self.image_url_layout.itemAt(i).widget().deleteLater()
+            self.clear_image_url_entries()
                 
-            # 새 매핑 생성
+            # 새 매핑 생성 (모델에 한 번에 추가하고 캐시 파일도 한 번만 저장)
+            pairs = []
             for tag, url in zip(image_tags, urls):
-                entry = ImageUrlEntry(self.image_url_container)
-                entry.tag_input.setText(tag)
-                
                 # URL이 HTML 태그인 경우 추출
                 if '<img' in url:
                     url = self.extract_url_from_html(url) or url
-                
-                entry.url_input.setText(url)
-                self.image_url_layout.addWidget(entry)
-                
-                # 캐시에도 저장
-                self.save_image_mapping(tag, url)
+                tag, url = tag.strip(), url.strip()
+                pairs.append((tag, url))
+                self.image_cache.mappings[tag] = url
+
+            self.image_mapping_model.extend(pairs)
+            self.image_cache.save_mappings()
                 
             QMessageBox.information(
                 self,
@@ -6128,13 +6944,7 @@ class ModernLogGenerator(QMainWindow):
 
     def save_all_mappings(self):
         """모든 매핑 저장"""
-        mappings = {}
-        for i in range(self.image_url_layout.count()):
-            entry = self.image_url_layout.itemAt(i).widget()
-            tag = entry.tag_input.text().strip()
-            url = entry.url_input.text().strip()
-            if tag and url:
-                mappings[tag] = url
+        mappings = dict(self.image_mapping_model.mapping())
         
         # 파일로 저장
         file_path = QFileDialog.getSaveFileName(
@@ -6179,10 +6989,7 @@ class ModernLogGenerator(QMainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             try:
                 # 기존 매핑 제거
-                for i in reversed(range(self.image_url_layout.count())):
-                    widget = self.image_url_layout.itemAt(i).widget()
-                    if widget:
-                        widget.deleteLater()
+                self.clear_image_url_entries()
                 
                 # 기본 항목 3개 추가
                 for _ in range(3):
@@ -6231,6 +7038,11 @@ class ModernLogGenerator(QMainWindow):
                 # 삭제 메뉴
                 delete_action = delete_menu.addAction(name)
                 delete_action.triggered.connect(lambda checked, n=name: self.preset_manager.delete_preset(n))
+
+        # 캐시 상태 확인
+        menu.addSeparator()
+        stats_action = menu.addAction("캐시 통계")
+        stats_action.triggered.connect(self.show_cache_stats)
         
         # 버튼 위치에 메뉴 표시
         menu.exec(self.sender().mapToGlobal(self.sender().rect().bottomLeft()))
@@ -6253,10 +7065,15 @@ class ModernLogGenerator(QMainWindow):
                     self.input_text.clear()
                     
             if hasattr(self, 'output_text'):
-                if len(self.output_text.toPlainText()) > 1000000:
+                if len(self.output_html) > 1000000:
+                    self.output_html = ''
+                    self.output_view_lines = []
                     self.output_text.clear()
             
             # 2. 이미지 캐시 정리
+            if hasattr(self, 'rendered_preview'):
+                self.rendered_preview.clear_failed_images()
+
             if hasattr(self, 'image_cache_manager'):
                 stats = self.image_cache_manager.get_stats()
                 if stats['total_size_mb'] > 100:  # 100MB 초과
@@ -6328,9 +7145,13 @@ class ModernLogGenerator(QMainWindow):
         """리소스 정리"""
         try:
             # 타이머 정리
-            if hasattr(self, 'preview_timer') and self.preview_timer:
-                self.preview_timer.stop()
-                self.preview_timer.deleteLater()
+            if hasattr(self, 'preview_scheduler'):
+                self.preview_scheduler.stop()
+
+            # 진행 중인 변환 작업 중단
+            if hasattr(self, 'conversion_pool'):
+                self.cancel_conversion()
+                self.conversion_pool.waitForDone()
             
             # 메모리 모니터링 타이머 정리
             if hasattr(self, 'memory_monitor_timer') and self.memory_monitor_timer:
@@ -6408,6 +7229,11 @@ class ModernLogGenerator(QMainWindow):
 
 
 def main():
+    # 명령줄 일괄 변환은 GUI 없이 처리
+    if len(sys.argv) > 1 and sys.argv[1] == 'convert':
+        import log_batch
+        sys.exit(log_batch.main(sys.argv[1:]))
+
     app = QApplication(sys.argv)
     app.setApplicationName("LogGenerator Pro")
     app.setWindowIcon(QIcon('log_icon.ico'))  # 앱 아이콘 설정
@@ -6435,4 +7261,5 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     main()       
@@ -0,0 +1,1937 @@
+#
+# This file is part of <LogGenerator Pro>.
+#
+# <LogGenerator Pro> is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+로그 렌더링 엔진
+
+Qt 위젯에 의존하지 않는 변환 엔진입니다. GUI에서는 위젯 값을 한 번 읽어
+RenderSettings 스냅샷을 만들고, LogRenderer.render()로 HTML을 생성합니다.
+배치 변환이나 워커 프로세스에서도 그대로 사용할 수 있습니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import struct
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields, replace
+from html.parser import HTMLParser
+from time import perf_counter, time
+
+
+DEFAULT_PROFILE_IMAGE = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAGQAAABkCAYAAABw4pVUAAAABmJLR0QA/wD/AP+gvaeTAAAACXBIWXMAAAsTAAALEwEAmpwYAAAAB3RJTUUH4wYJBhYRN2n7qQAAAB1pVFh0Q29tbWVudAAAAAAAQ3JlYXRlZCB3aXRoIEdJTVBkLmUHAAAEiUlEQVR42u2dW2hcVRSGv3XOxEmTmTRp2kziJU0UqUVriy+CLxZfi1gUX3wTfPBJ8EkQwQteMFIfLFoQxQteMCJeULQoquKDgheCbdHWam0vMW3TJm0ymUzmnJk5e/kwt7SSOSdNOpN91v+0YQ577T3/f9bea6+99hgTExMTExMTExMTE5NbE2lNRapr+xUwD8gFEWB4dJQrAyfo6+1JXGsAD4vgSQgbj0EkLgcKqAocxeWkOJwgrr+1JR1CJovpKDxbgUfFY4vApgJJACIgHkioIghYgDCwLlCjsV4mE3YyELBDQRYEHVKOEhKQEYFMURaLsAhYPr5wYkBEGFOXIZcEtjE2DWgmWYagSEwGXWVxWvGKpcQR+qIW5wYsCm5K7DQXn4xSEu/Hw0J9LyeOg0e2RTgrmALZYEfIlDCHew6xvKjEpuXsKHiJcqNUqWAsEzFPt8QRxK+A/lCIU/lFtM8PsXdVmBdiZXyiNluIc6hrPxt6HYpkmGTa5CWbQ48cUBIFxMJjXuEALyaWcPp4DesWb2N/SnycGPPxqABfimIMSUBJpAYRDwXm5vXxQayaV2QZO4kTlJAvn7xgwqe3bkEAevKEJUWCiUQNIuCJ0lR3lb3HDpC32SZzk6QaE0EBRBhVDxEhLh4RD0Q9clQoFEhcwPd6BcwXGRIYU6VPhJj6FOARBo6ny9kYGuRo1zeMxEcoWxtlUEEFJKSAqjKkMKxCSISwQDEQUsETxRXBQ7BE8EQQVVxbKVCbEYHjwEsiZxAsgWVWnPq2GNUt7URo5GTNaZbVDnKnZdN0vJY3B7JZIw4t6pPGElx1cUUZE2FYlYgqloArQlCUAlXyVclWiKsyKoIliqseYVEUYVSVfhFCAlFVRgSiojjq4agQUyVPhDCAqBAVxRMlR4SQKq7CkAhRUVwRPIGwKo5ATABPsVWIq4cnQlCVuAoeEBTBUSWkEFElLEKBKDnq4QKOQESEYVXiqgQFwqpEFWSszTiqOCLY6hEX8LQ8hwc74OIcIVB9nJbmTr7rPMzg0EUcN0aWVo5n6AW27XB5YjfHA6V8r1kuEXFwhZAqriioKo4IUYGoCIUKeaqERMhWIU+VHFGGBIZViaq/fPl/OHIcXBRbBFshLkqOQESUiEJIBFuUQYVRVWz1CAmoCrZ6xFSxEQLqkSsQFigQxVXBFsUVGFPwRHBViSsEBBRBRQmJkqNg64R4iHi4ohQi2KLYAiEVXFVy1CMoSgQIihATxRXFq0mQHspmLmA8BRFQhJgqYVFsAVdASYiHCGFV8kSwx1NX4fV5ZrE9nMfF+BD5JQrFDsUWBEUIixBTxRbBBkSUMYGQKA5gixJXJSxQKEKY8fM4FWwEVyAmQlyEkCpxEYIK+QIB9chRGD/pE2KixFUJq2IrBEQJiRBRZUQgJEJQwRMQEYbVI6Yg6hFQwEU8EWyBoCqOQFggR5SQguv5OxGDIgQEHBWiAjGBoHrkC4RFGQMiAgHAdYW5IgSBEQHiEMWlQqBIICJCXAVHYNAVBgUyRYgJxBDiOHQrZIsy6qZRzxsmJiYmJiYmJiYmJiYmJiYmJiYmJiYmJiYmJiYmJiYmJtPI3wlK8GXlSW/WAAAAAElFTkSuQmCC"
+
+
+@dataclass(frozen=True)
+class TagStyle:
+    """프로필 태그 한 개의 스타일 스냅샷"""
+    text: str = ''
+    color: str = '#E3E3E8'
+    text_color: str = '#000000'
+    style: str = '기본'
+    border_radius: float = 20
+    font_size: float = 0.85
+    padding: tuple = (0.2, 0.8, 0.2, 0.8)  # top, right, bottom, left
+
+    @classmethod
+    def from_dict(cls, style_dict):
+        """TagEntry.get_style_dict() 형식의 딕셔너리에서 생성"""
+        padding = style_dict.get('padding') or {}
+        return cls(
+            text=style_dict.get('text', ''),
+            color=style_dict.get('color', '#E3E3E8'),
+            text_color=style_dict.get('text_color', '#000000'),
+            style=style_dict.get('style', '기본'),
+            border_radius=style_dict.get('border_radius', 20),
+            font_size=style_dict.get('font_size', 0.85),
+            padding=(
+                padding.get('top', 0.2),
+                padding.get('right', 0.8),
+                padding.get('bottom', 0.2),
+                padding.get('left', 0.8)
+            )
+        )
+
+
+@dataclass(frozen=True)
+class RenderSettings:
+    """변환에 필요한 모든 설정의 불변 스냅샷
+
+    위젯 값을 렌더링 시작 시점에 한 번만 읽어서 만들어 두면,
+    변환 도중에는 Qt 객체를 전혀 참조하지 않습니다.
+    """
+    # 텍스트 설정
+    use_text_indent: bool = True
+    text_indent: int = 20
+    dialog_color: str = '#4a4a4a'
+    narration_color: str = '#4a4a4a'
+    inner_thoughts_color: str = '#4a4a4a'
+    dialog_bold: bool = True
+    dialog_newline: bool = True
+    inner_thoughts_bold: bool = False
+    use_text_size: bool = True
+    text_size: int = 14
+    convert_ellipsis: bool = True
+    remove_asterisk: bool = True
+    use_padding: bool = True
+
+    # 출력 형식
+    compact_output: bool = False        # 같은 스타일 병합, 최소 스타일 문자열
+    use_style_classes: bool = False     # 압축 출력에서 <style> 블록과 클래스 사용
+    minify_output: bool = False         # 템플릿의 들여쓰기/줄바꿈 없이 출력
+
+    # 박스 설정
+    outer_box_color: str = '#ffffff'
+    inner_box_color: str = '#f8f9fa'
+    show_inner_box: bool = False
+    shadow_intensity: int = 8
+    use_box_border: bool = False
+    box_border_color: str = '#CCCCCC'
+    box_border_thickness: int = 2
+
+    # 프로필 설정
+    show_profile: bool = True
+    show_profile_image: bool = True
+    show_bot_name: bool = True
+    show_tags: bool = True
+    show_divider: bool = True
+    bot_name: str = ''
+    bot_name_color: str = '#4a4a4a'
+    image_url: str = ''
+    frame_style: str = '동그라미'
+    profile_width: int = 80
+    profile_height: int = 80
+    show_profile_border: bool = True
+    show_profile_shadow: bool = True
+    profile_border_color: str = '#ffffff'
+    tags: tuple = ()
+
+    # 구분선 설정
+    divider_style: str = '그라데이션'
+    divider_thickness: int = 1
+    divider_outer_color: str = '#b8bacf'
+    divider_inner_color: str = '#ffffff'
+    divider_solid_color: str = '#b8bacf'
+
+    # 에셋 이미지 설정
+    image_size: int = 100
+    image_margin: int = 10
+    use_image_border: bool = False
+    image_border_color: str = '#000000'
+    use_image_shadow: bool = True
+    image_mappings: tuple = ()  # (태그, URL) 쌍
+
+    # 단어 변경 (변환할 단어, 변환될 단어, 정규식 여부) 규칙
+    word_replacements: tuple = ()
+
+    # 템플릿 공통 스타일 (STYLES 값)
+    font_family: str = 'Segoe UI, Roboto, Arial, sans-serif'
+    text_color: str = '#000000'
+    font_size_normal: int = 14
+    font_weight_bold: int = 600
+    spacing_large: int = 24
+    radius_normal: int = 8
+    radius_large: int = 16
+
+    @classmethod
+    def from_preset(cls, preset=None, text_settings=None, **overrides):
+        """저장된 프리셋(color_presets.json)과 텍스트 설정(text_settings.json)에서 생성
+
+        텍스트 설정은 프리셋 위에 덮어쓰며, 저장되지 않은 값은 기본값을 사용합니다.
+        """
+        names = {field.name for field in fields(cls)}
+        values = {}
+
+        # 1. 색상 프리셋
+        preset = preset or {}
+        for key, value in preset.items():
+            if key in names:
+                values[key] = value
+
+        # 2. 프리셋의 프로필 설정
+        for key, value in (preset.get('profile_settings') or {}).items():
+            key = _PROFILE_SETTING_KEYS.get(key, key)
+            if key in names:
+                values[key] = value
+
+        # 3. 텍스트 설정
+        for key, value in (text_settings or {}).items():
+            if key in names:
+                values[key] = value
+
+        values.update(overrides)
+        return cls(**values)
+
+    def paragraph_fingerprint(self):
+        """문단 포맷팅(format_conversation) 결과에 영향을 주는 설정만 모은 키"""
+        return (
+            self.use_text_indent, self.text_indent,
+            self.dialog_color, self.narration_color, self.inner_thoughts_color,
+            self.dialog_bold, self.dialog_newline, self.inner_thoughts_bold,
+            self.use_text_size, self.text_size,
+            self.convert_ellipsis,
+            self.compact_output, self.use_style_classes
+        )
+
+    def profile_fingerprint(self):
+        """프로필 영역(create_profile_section) 결과에 영향을 주는 설정만 모은 키"""
+        return (
+            self.show_profile, self.show_profile_image, self.show_bot_name,
+            self.show_tags, self.show_divider,
+            self.bot_name, self.bot_name_color, self.font_weight_bold,
+            self.image_url, self.frame_style, self.profile_width, self.profile_height,
+            self.show_profile_border, self.show_profile_shadow, self.profile_border_color,
+            self.tags,
+            self.divider_style, self.divider_thickness,
+            self.divider_outer_color, self.divider_inner_color, self.divider_solid_color,
+            self.minify_output
+        )
+
+
+# 프리셋의 profile_settings 키 중 필드 이름과 다른 것
+_PROFILE_SETTING_KEYS = {
+    'width': 'profile_width',
+    'height': 'profile_height'
+}
+
+
+# GUI 색상 모드별 본문 글자색 (STYLES['text'])
+THEME_TEXT_COLORS = {
+    'light': '#000000',
+    'dark': '#FFFFFF'
+}
+
+
+# QColor 내부 표현(16비트 채널)과 같은 방식으로 계산하기 위한 상수
+_USHRT_MAX = 65535
+
+
+def _f32(value):
+    """float32 정밀도로 반올림"""
+    return struct.unpack('f', struct.pack('f', value))[0]
+
+
+def _qround(value):
+    return int(value + 0.5)
+
+
+def _rgb_to_hsv(red, green, blue):
+    """16비트 RGB를 QColor와 같은 방식으로 HSV로 변환"""
+    max_value = max(red, green, blue)
+    delta = max_value - min(red, green, blue)
+    if delta == 0:
+        return _USHRT_MAX, 0, max_value
+
+    saturation = _qround(_f32(_f32(delta / max_value) * _USHRT_MAX))
+    if red == max_value:
+        hue = _f32((green - blue) / delta)
+    elif green == max_value:
+        hue = _f32(2.0 + _f32((blue - red) / delta))
+    else:
+        hue = _f32(4.0 + _f32((red - green) / delta))
+    if hue < 0:
+        hue = _f32(hue + 6.0)
+    return _qround(_f32(hue * 6000.0)), saturation, max_value
+
+
+def _hsv_to_rgb(hue, saturation, value):
+    """16비트 HSV를 QColor와 같은 방식으로 RGB로 변환"""
+    if saturation == 0 or hue == _USHRT_MAX:
+        return value, value, value
+
+    h = 0.0 if hue == 36000 else _f32(hue / 6000.0)
+    s = _f32(saturation / _USHRT_MAX)
+    v = _f32(value / _USHRT_MAX)
+    i = int(h)
+    f = _f32(h - i)
+    p = _f32(v * _f32(1.0 - s))
+
+    if i & 1:
+        q = _f32(v * _f32(1.0 - _f32(s * f)))
+        channels = {1: (q, v, p), 3: (p, q, v), 5: (v, p, q)}[i]
+    else:
+        t = _f32(v * _f32(1.0 - _f32(s * _f32(1.0 - f))))
+        channels = {0: (v, t, p), 2: (p, v, t), 4: (t, p, v)}[i]
+    return tuple(_qround(_f32(c * _USHRT_MAX)) for c in channels)
+
+
+def adjust_color_lightness(color, factor, lighter=True):
+    """QColor.lighter()/darker()와 동일한 결과를 내는 색상 밝기 조절"""
+    hex_value = color.lstrip('#')
+    if len(hex_value) == 3:
+        hex_value = ''.join(ch * 2 for ch in hex_value)
+    try:
+        red, green, blue = (int(hex_value[i:i + 2], 16) * 0x101 for i in (0, 2, 4))
+    except ValueError:
+        # 잘못된 색상은 QColor와 마찬가지로 검은색 처리
+        return '#000000'
+
+    hue, saturation, value = _rgb_to_hsv(red, green, blue)
+    if lighter:
+        value = (factor * value) // 100
+        if value > _USHRT_MAX:
+            # 밝기가 넘치면 채도를 줄여서 보정
+            saturation = max(0, saturation - (value - _USHRT_MAX))
+            value = _USHRT_MAX
+    else:
+        value = (value * 100) // factor
+
+    channels = _hsv_to_rgb(hue, saturation, value)
+    return '#' + ''.join(f"{int(c / 257 + 0.5):02x}" for c in channels)
+
+
+def extract_tag_identifier(tag):
+    """이미지 태그에서 식별자만 추출"""
+    return url_normalizer.tag_identifier(tag)
+
+
+def clean_url(url):
+    """URL 정리"""
+    return url_normalizer.clean(url)
+
+
+def process_image_url(url):
+    """프로필 이미지 URL 처리"""
+    return url_normalizer.profile(url)
+
+
+# 이미지 태그 (한 번의 탐색으로 모든 형식 처리)
+#   {{img::태그}} {{image::태그}}  → double_colon
+#   {{img=태그}} {{image=태그}}    → equals
+#   <img src="태그">               → src
+#   <img="태그"> <image="태그">    → attr
+# <img ...> 형식은 따옴표로 감싼 태그가 있는 경우만 매치해서,
+# 닫히지 않은 태그가 뒤따르는 다른 태그를 삼키지 않도록 합니다.
+_IMAGE_TAG_PATTERN = re.compile(
+    r'\{\{(?:img|image)::(?P<double_colon>[^}]+)\}\}'
+    r'|\{\{(?:img|image)=(?P<equals>[^}]+)\}\}'
+    r'|<(?:img|image)\s+src=[\'"″](?P<src>[^\'"″>\n]+)[\'"″]+>'
+    r'|<(?:img|image)=[\'"″](?P<attr>[^\'"″>\n]+)[\'"″][^>]*>'
+)
+
+# 이미지 태그를 바꾼 여러 줄 블록 (_create_image_html의 전체 형식)
+# 최소화 출력도 이 형식으로 만들어 format_conversation이 두 출력에서 같은 줄을 보게 하고,
+# 그대로 출력되는 문단에서만 한 줄로 줄입니다.
+_IMAGE_BLOCK_PATTERN = re.compile(
+    r'\n? {12}<div style="margin-bottom:1rem; width:100%; text-align:center;">'
+    r'\n {16}<img style="(?P<style>[^"]*)" '
+    r'\n {20}src="(?P<src>[^"]*)" alt="(?P<alt>[^"]*)" class="fr-fic fr-dii">'
+    r'\n {12}</div>\n {8}'
+)
+
+# 여러 줄 스타일의 줄바꿈과 들여쓰기
+_LAYOUT_WHITESPACE = re.compile(r'\s*\n\s*')
+
+
+# 대화문/속마음 구분에 쓰는 따옴표
+_BOLD_DIALOG_OPEN = '**"'
+_BOLD_DIALOG_CLOSE = '"**'
+_DIALOG_START = re.compile(r'\*\*"|["″“]')
+_DIALOG_CLOSE = re.compile(r'["″”]')
+_DIALOG_CLOSE_CHARS = '"″”'
+_INNER_THOUGHTS_QUOTE = "'"
+_WHITESPACE_RUN = re.compile(r'\s*')
+
+
+class _Lookahead:
+    """증가하는 위치로만 질의하는 '다음 출현 위치' 탐색기
+
+    직전 결과를 기억해 두므로 한 줄에 대한 모든 질의가 합쳐서 O(n)입니다.
+    찾지 못하면 문자열 길이 이상의 값을 돌려줍니다.
+    """
+    __slots__ = ('_line', '_needle', '_found')
+
+    def __init__(self, line, needle):
+        self._line = line
+        self._needle = needle
+        self._found = -1
+
+    def at_or_after(self, index):
+        if self._found < index:
+            if isinstance(self._needle, str):
+                found = self._line.find(self._needle, index)
+            else:
+                match = self._needle.search(self._line, index)
+                found = match.start() if match else -1
+            self._found = found if found >= 0 else len(self._line)
+        return self._found
+
+
+def _match_quoted(line, start, limit, closers, close_chars):
+    """start의 여는 따옴표에서 시작하는 인용구의 끝 위치 (없으면 -1)
+
+    정규식 ``<여는>\\s*.+?\\s*<닫는>``과 같은 결과를 냅니다.
+    여는 따옴표 뒤 공백을 먼저 건너뛰고 최소 한 글자 뒤의 첫 닫는 따옴표를 찾되,
+    없으면 공백 바로 뒤의 닫는 따옴표까지 허용합니다.
+    """
+    ws_end = _WHITESPACE_RUN.match(line, start + 1, limit).end()
+    close = closers.at_or_after(ws_end + 1)
+    if close < limit:
+        return close + 1
+    if start + 1 < ws_end < limit and line[ws_end] in close_chars:
+        return ws_end + 1
+    return -1
+
+
+def _split_narration(line, start, end, quotes):
+    """나레이션 구간을 나레이션/속마음 토큰으로 분리"""
+    pos = last = start
+    while True:
+        open_at = line.find(_INNER_THOUGHTS_QUOTE, pos, end)
+        if open_at < 0:
+            break
+        close_end = _match_quoted(line, open_at, end, quotes, _INNER_THOUGHTS_QUOTE)
+        if close_end < 0:
+            pos = open_at + 1
+            continue
+
+        if open_at > last:
+            yield ('narration', line[last:open_at])
+        yield ('inner_thoughts', line[open_at:close_end])
+        last = pos = close_end
+
+    if end > last:
+        yield ('narration', line[last:end])
+
+
+def tokenize_line(line):
+    """한 줄을 (종류, 텍스트) 토큰으로 분리
+
+    종류는 'dialogue', 'bold_dialogue'(**"..."**), 'inner_thoughts', 'narration'입니다.
+    왼쪽에서 오른쪽으로 한 번만 훑으며, 닫히지 않은 따옴표가 있어도 O(n)입니다.
+    """
+    length = len(line)
+    bold_closers = _Lookahead(line, _BOLD_DIALOG_CLOSE)
+    dialog_closers = _Lookahead(line, _DIALOG_CLOSE)
+    quotes = _Lookahead(line, _INNER_THOUGHTS_QUOTE)
+
+    pos = last = 0
+    while True:
+        match = _DIALOG_START.search(line, pos)
+        if not match:
+            break
+        start = match.start()
+
+        if match.group() == _BOLD_DIALOG_OPEN:
+            # 1. 볼드 대화문 **"...."**
+            close = bold_closers.at_or_after(start + 3)
+            if close >= length:
+                pos = start + 1
+                continue
+            kind, end = 'bold_dialogue', close + 3
+        else:
+            # 2. 따옴표 대화문, 안 되면 빈 따옴표 ""
+            end = _match_quoted(line, start, length, dialog_closers, _DIALOG_CLOSE_CHARS)
+            if end < 0 and line.startswith('""', start):
+                end = start + 2
+            if end < 0:
+                pos = start + 1
+                continue
+            kind = 'dialogue'
+
+        yield from _split_narration(line, last, start, quotes)
+        yield (kind, line[start:end])
+        last = pos = end
+
+    yield from _split_narration(line, last, length, quotes)
+
+
+def cache_stats(items, size_bytes, hits, misses, evictions, lookup_time):
+    """캐시 공통 통계 (모든 캐시의 get_stats가 이 키들을 포함)
+
+    size_bytes는 바이트 단위, lookup_time은 조회에 걸린 시간의 합(초)입니다.
+    """
+    lookups = hits + misses
+    return {
+        'items': items,
+        'bytes': size_bytes,
+        'hits': hits,
+        'misses': misses,
+        'evictions': evictions,
+        'hit_rate': f"{(hits / lookups * 100 if lookups else 0):.1f}%",
+        'mean_lookup_us': lookup_time / lookups * 1e6 if lookups else 0.0
+    }
+
+
+class LRUCache:
+    """크기 제한이 있는 LRU 캐시 (CacheManager와 같은 get/set 인터페이스, Qt 비의존)
+
+    변환 스레드가 쓰는 동안 GUI 스레드가 통계를 읽을 수 있도록 잠금으로 보호합니다.
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lookup_time = 0.0
+
+    def get(self, key):
+        """캐시에서 값 가져오기 (없으면 None)"""
+        with self.lock:
+            start = perf_counter()
+            value = self.cache.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.cache.move_to_end(key)
+                self.hits += 1
+            self.lookup_time += perf_counter() - start
+        return value
+
+    def set(self, key, value):
+        """캐시에 값 저장 (용량 초과 시 가장 오래 쓰지 않은 항목 제거)"""
+        with self.lock:
+            self.cache[key] = value
+            self.cache.move_to_end(key)
+            if len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """캐시 전체 초기화"""
+        with self.lock:
+            self.cache.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.lookup_time = 0.0
+
+    def get_stats(self):
+        """캐시 상태 통계 (값 크기는 sys.getsizeof 기준)"""
+        # 잠금 안에서는 스냅샷만 만들고 크기 계산은 밖에서
+        with self.lock:
+            values = list(self.cache.values())
+            counters = (self.hits, self.misses, self.evictions, self.lookup_time)
+        stats = cache_stats(
+            len(values),
+            sum(sys.getsizeof(value) for value in values),
+            *counters
+        )
+        stats['total_items'] = len(values)
+        stats['max_size'] = self.max_size
+        return stats
+
+
+class ShardedCache:
+    """여러 스레드가 함께 쓰는 LRU 캐시 (CacheManager와 같은 get/set/remove/clear/
+    cleanup_expired/get_stats 인터페이스)
+
+    키의 해시로 고른 샤드마다 OrderedDict와 잠금을 따로 두어, 서로 다른 샤드를 쓰는
+    스레드끼리는 기다리지 않습니다. 용량(max_size)은 샤드에 나누어 적용하고,
+    max_age가 None이면 만료하지 않습니다. shards=1이면 잠금 하나짜리 캐시와 같습니다.
+    """
+
+    def __init__(self, max_size=100, max_age=3600, shards=16):
+        self.max_size = max_size
+        self.max_age = max_age
+        count = max(1, min(shards, max_size))
+        self.shard_size = -(-max_size // count)  # 샤드당 용량 (올림)
+        self.shards = [OrderedDict() for _ in range(count)]  # 키 → (값, 저장 시각)
+        self.locks = [threading.Lock() for _ in range(count)]
+        # 샤드별 [적중, 실패, 제거, 조회 시간 합] (각 샤드 잠금으로 보호)
+        self.counters = [[0, 0, 0, 0.0] for _ in range(count)]
+
+    def _index(self, key):
+        return hash(key) % len(self.shards)
+
+    def _expired(self, timestamp, now):
+        return self.max_age is not None and now - timestamp > self.max_age
+
+    def get(self, key):
+        """캐시에서 값 가져오기 (없거나 만료되었으면 None)"""
+        index = self._index(key)
+        shard = self.shards[index]
+        counter = self.counters[index]
+        with self.locks[index]:
+            start = perf_counter()
+            entry = shard.get(key)
+            if entry is not None and self._expired(entry[1], time()):
+                del shard[key]
+                entry = None
+            if entry is None:
+                counter[1] += 1
+                value = None
+            else:
+                shard.move_to_end(key)
+                counter[0] += 1
+                value = entry[0]
+            counter[3] += perf_counter() - start
+        return value
+
+    def set(self, key, value):
+        """캐시에 값 저장 (샤드 용량 초과 시 그 샤드에서 가장 오래 쓰지 않은 항목 제거)"""
+        index = self._index(key)
+        shard = self.shards[index]
+        with self.locks[index]:
+            shard[key] = (value, time())
+            shard.move_to_end(key)
+            if len(shard) > self.shard_size:
+                shard.popitem(last=False)
+                self.counters[index][2] += 1
+
+    def update(self, key, function, default=None):
+        """현재 값(없으면 default)에 function을 적용해 저장하고 새 값 반환 (원자적)"""
+        index = self._index(key)
+        shard = self.shards[index]
+        with self.locks[index]:
+            entry = shard.get(key)
+            if entry is not None and self._expired(entry[1], time()):
+                entry = None
+            value = function(default if entry is None else entry[0])
+            shard[key] = (value, time())
+            shard.move_to_end(key)
+            if len(shard) > self.shard_size:
+                shard.popitem(last=False)
+                self.counters[index][2] += 1
+        return value
+
+    def remove(self, key):
+        """캐시에서 항목 제거"""
+        index = self._index(key)
+        with self.locks[index]:
+            self.shards[index].pop(key, None)
+
+    def clear(self):
+        """캐시 전체 초기화"""
+        for index, shard in enumerate(self.shards):
+            with self.locks[index]:
+                shard.clear()
+                self.counters[index] = [0, 0, 0, 0.0]
+
+    def cleanup_expired(self):
+        """만료된 캐시 항목 정리 (샤드를 하나씩 잠그며 처리)"""
+        if self.max_age is None:
+            return 0
+        cleaned = 0
+        now = time()
+        for index, shard in enumerate(self.shards):
+            with self.locks[index]:
+                expired = [key for key, (_, timestamp) in shard.items() if self._expired(timestamp, now)]
+                for key in expired:
+                    del shard[key]
+                cleaned += len(expired)
+        return cleaned
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+    def get_stats(self):
+        """캐시 상태 통계 (샤드 합계)"""
+        items = size = hits = misses = evictions = 0
+        lookup_time = 0.0
+        for index, shard in enumerate(self.shards):
+            with self.locks[index]:
+                items += len(shard)
+                size += sum(sys.getsizeof(value) for value, _ in shard.values())
+                shard_hits, shard_misses, shard_evictions, shard_time = self.counters[index]
+            hits += shard_hits
+            misses += shard_misses
+            evictions += shard_evictions
+            lookup_time += shard_time
+        stats = cache_stats(items, size, hits, misses, evictions, lookup_time)
+        stats['total_items'] = items
+        stats['max_size'] = self.max_size
+        stats['shards'] = len(self.shards)
+        return stats
+
+
+# URL 정규화에 쓰는 정규식
+_IMG_SRC = re.compile(r'src=[\'"](.*?)[\'"]')
+_COMMUNITY_IMAGE_URL = re.compile(r'((?:https?:)?//[^\s<>"]+?\.(?:jpg|jpeg|png|gif)(?:\?[^"\s<>]*)?)')
+
+
+class UrlNormalizer:
+    """이미지 URL과 태그 정규화 (원본 문자열별 결과를 크기 제한 LRU에 기억)
+
+    <img> 태그의 src 추출, // 프로토콜 보정, namu.la/dcinside 주소 처리, &amp; 디코딩을
+    한곳에서 처리합니다. 같은 문자열을 다시 넣으면 딕셔너리 조회 한 번으로 끝나며,
+    미리보기 변환 스레드와 GUI 스레드가 함께 쓰므로 캐시는 ShardedCache를 씁니다.
+    """
+
+    def __init__(self, max_size=4096):
+        self.cache = ShardedCache(max_size, max_age=None)
+
+    def _cached(self, kind, raw, normalize):
+        key = (kind, raw)
+        result = self.cache.get(key)
+        if result is None:
+            result = normalize(raw)
+            self.cache.set(key, result)
+        return result
+
+    def clean(self, url):
+        """매핑 URL 정리"""
+        return self._cached('clean', url, self._clean)
+
+    def tag_identifier(self, tag):
+        """이미지 태그에서 식별자만 추출"""
+        return self._cached('tag', tag, self._tag_identifier)
+
+    def profile(self, url):
+        """프로필 이미지 URL 처리 (비어 있으면 기본 이미지)"""
+        return self._cached('profile', url, self._profile)
+
+    def image_src(self, html):
+        """HTML의 src 속성에서 정리된 URL 추출 (없으면 '')"""
+        return self._cached('src', html, self._image_src)
+
+    def clear(self):
+        self.cache.clear()
+
+    def get_stats(self):
+        return self.cache.get_stats()
+
+    @staticmethod
+    def _extract_src(text):
+        """<img> 태그면 src 값, 아니면 그대로"""
+        if '<img' in text:
+            match = _IMG_SRC.search(text)
+            if match:
+                return match.group(1)
+        return text
+
+    @staticmethod
+    def _fix_protocol(url):
+        return 'https:' + url if url.startswith('//') else url
+
+    @staticmethod
+    def _decode_entities(url):
+        return url.replace('&amp;', '&')
+
+    def _clean(self, url):
+        url = self._fix_protocol(self._extract_src(url))
+        return self._decode_entities(url).strip()
+
+    def _tag_identifier(self, tag):
+        # img 태그에서 식별자 추출
+        if '<img' in tag:
+            tag = self._extract_src(tag)
+
+        # {{img::}} 형식에서 식별자 추출
+        elif tag.startswith('{{img::'):
+            tag = tag.split('::')[1].rstrip('}}').strip('"\'')
+
+        # {{img=}} 형식에서 식별자 추출
+        elif '{{img=' in tag:
+            tag = tag.split('=')[1].strip('{}"\'')
+
+        # .png 확장자 제거
+        if tag.lower().endswith('.png'):
+            tag = tag[:-4]
+
+        return tag.strip()
+
+    def _profile(self, url):
+        if not url or not url.strip():
+            return DEFAULT_PROFILE_IMAGE
+
+        try:
+            url = self._fix_protocol(self._extract_src(url.strip()))
+
+            # 커뮤니티 이미지 URL 처리 (쿼리 파라미터 유지)
+            if 'namu.la' in url or 'dcinside.com' in url:
+                url_match = _COMMUNITY_IMAGE_URL.search(url)
+                if url_match:
+                    url = self._fix_protocol(url_match.group(1))
+
+            return self._decode_entities(url)
+
+        except Exception as e:
+            print(f"Error processing image URL: {str(e)}")
+            return DEFAULT_PROFILE_IMAGE
+
+    def _image_src(self, html):
+        match = _IMG_SRC.search(html)
+        if not match:
+            return ''
+        url = self._fix_protocol(match.group(1))
+        return self._decode_entities(url).strip()
+
+
+# 렌더링 엔진과 GUI가 함께 쓰는 URL 정규화기
+url_normalizer = UrlNormalizer()
+
+
+def compact_styles(settings):
+    """압축 출력용 역할별 속성과 <style> 블록
+
+    나레이션의 색상과 글자 크기는 줄 div로 올려서, 나레이션은 span 없이 출력하고
+    다른 span에는 나레이션과 다른 선언만 남깁니다. 같은 스타일은 한 번만 정의하며,
+    클래스를 쓰면 (role → 'class="lgN"', <style> 블록), 아니면 (role → 'style="..."', '')를
+    반환합니다. 줄 div에서 물려받는 것 외에 선언이 없는 역할은 None입니다.
+    """
+    line = ["margin-bottom:1rem"]
+    if settings.use_text_indent:
+        line.append(f"text-indent:{settings.text_indent}px")
+    line.append(f"color:{settings.narration_color}")
+    if settings.use_text_size:
+        line.append(f"font-size:{settings.text_size}px")
+
+    def override(color, bold):
+        decls = [f"color:{color}"] if color != settings.narration_color else []
+        if bold:
+            decls.append("font-weight:bold")
+        return decls
+
+    declarations = {
+        'paragraph': ["margin-bottom:1.5rem"],
+        'line': line,
+        'dialogue_block': ["margin:1em 0"],
+        'narration': [],
+        'inner_thoughts': override(settings.inner_thoughts_color, settings.inner_thoughts_bold),
+        'dialogue': override(settings.dialog_color, settings.dialog_bold)
+    }
+
+    if not settings.use_style_classes:
+        return {
+            role: f'style="{";".join(decls)}"' if decls else None
+            for role, decls in declarations.items()
+        }, ''
+
+    classes = {}
+    attributes = {}
+    for role, decls in declarations.items():
+        if not decls:
+            attributes[role] = None
+            continue
+        style = ";".join(decls)
+        if style not in classes:
+            classes[style] = f"lg{len(classes)}"
+        attributes[role] = f'class="{classes[style]}"'
+
+    rules = ''.join(f".{name}{{{style}}}" for style, name in classes.items())
+    return attributes, f"<style>{rules}</style>"
+
+
+def _trie_regex(node):
+    """문자 트라이를 정규식으로 변환 (같은 시작 위치에서는 가장 긴 단어가 매치)"""
+    branches = []
+    for char in sorted(key for key in node if key):
+        branches.append(re.escape(char) + _trie_regex(node[char]))
+
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # 여기서 끝나는 단어가 있으면 더 긴 쪽을 먼저 시도
+        return body + '?' if len(branches) > 1 else '(?:' + body + ')?'
+    return body
+
+
+class WordReplacer:
+    """단어 변경 규칙을 한 번에 적용하는 치환기
+
+    규칙은 (변환할 단어, 변환될 단어, 정규식 여부) 튜플입니다.
+    일반 단어는 모두 하나의 트라이(Aho-Corasick 방식의 공유 접두사)로 묶어
+    정규식 하나로 컴파일하고, 정규식 규칙은 각자 컴파일해 다음 매치 위치를
+    기억해 둡니다. 텍스트를 왼쪽부터 한 번만 훑으며 가장 왼쪽에서 시작하는
+    매치 중 가장 긴 것을 치환합니다. (길이가 같으면 앞쪽 규칙 우선)
+    치환 결과는 다시 검사하지 않으므로 규칙 순서에 따라 결과가 달라지지 않습니다.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._literals = {}         # 단어 → (규칙 순번, 변환될 단어)
+        self._regex_rules = []      # (규칙 순번, 컴파일된 정규식, 변환될 단어)
+
+        for index, rule in enumerate(rules):
+            from_word, to_word = rule[0], rule[1]
+            is_regex = len(rule) > 2 and rule[2]
+            if not from_word:
+                continue
+            to_word = to_word if to_word is not None else ''
+
+            if is_regex:
+                try:
+                    self._regex_rules.append((index, re.compile(from_word), to_word))
+                except re.error as e:
+                    print(f"잘못된 정규식 규칙 무시: {from_word} ({e})")
+            elif from_word not in self._literals:
+                self._literals[from_word] = (index, to_word)
+
+        # 일반 단어 트라이 컴파일
+        self._literal_pattern = None
+        if self._literals:
+            trie = {}
+            for word in self._literals:
+                node = trie
+                for char in word:
+                    node = node.setdefault(char, {})
+                node[''] = True
+            self._literal_pattern = re.compile(_trie_regex(trie))
+
+    def apply(self, text):
+        """텍스트에 모든 규칙을 한 번에 적용"""
+        if not text or (self._literal_pattern is None and not self._regex_rules):
+            return text
+
+        # 일반 단어만 있으면 정규식 엔진 안에서 바로 치환
+        if not self._regex_rules:
+            literals = self._literals
+            return self._literal_pattern.sub(lambda match: literals[match.group()][1], text)
+
+        result = []
+        pos = 0
+        for start, end, replacement in self.matches(text):
+            result.append(text[pos:start])
+            result.append(replacement)
+            pos = end
+        result.append(text[pos:])
+        return ''.join(result)
+
+    def matches(self, text):
+        """치환할 구간을 (시작, 끝, 변환될 텍스트)로 왼쪽부터 차례로 반환"""
+        if not text or (self._literal_pattern is None and not self._regex_rules):
+            return
+
+        if not self._regex_rules:
+            literals = self._literals
+            for match in self._literal_pattern.finditer(text):
+                yield match.start(), match.end(), literals[match.group()][1]
+            return
+
+        searchers = []
+        if self._literal_pattern is not None:
+            searchers.append((None, self._literal_pattern, None))
+        searchers.extend(self._regex_rules)
+        upcoming = [self._search(pattern, text, 0) for _, pattern, _ in searchers]
+
+        while True:
+            # 1. 가장 왼쪽, 가장 긴, 가장 앞쪽 규칙의 매치 선택
+            best = None
+            best_key = None
+            for i, match in enumerate(upcoming):
+                if match is None:
+                    continue
+                index = searchers[i][0]
+                if index is None:
+                    index = self._literals[match.group()][0]
+                key = (match.start(), -match.end(), index)
+                if best_key is None or key < best_key:
+                    best, best_key = i, key
+            if best is None:
+                break
+
+            # 2. 치환
+            match = upcoming[best]
+            if searchers[best][0] is None:
+                replacement = self._literals[match.group()][1]
+            else:
+                try:
+                    replacement = match.expand(searchers[best][2])
+                except (re.error, IndexError):
+                    replacement = searchers[best][2]
+            pos = match.end()
+            yield match.start(), pos, replacement
+
+            # 3. 치환된 구간과 겹치는 매치만 다시 탐색
+            for i, upcoming_match in enumerate(upcoming):
+                if upcoming_match is not None and upcoming_match.start() < pos:
+                    upcoming[i] = self._search(searchers[i][1], text, pos)
+
+    @staticmethod
+    def _search(pattern, text, pos):
+        """pos 이후의 첫 매치 (빈 매치는 건너뜀)"""
+        match = pattern.search(text, pos)
+        while match is not None and match.end() == match.start():
+            if match.start() >= len(text):
+                return None
+            match = pattern.search(text, match.start() + 1)
+        return match
+
+
+def _substitute_with_origins(pattern, replacement, text, origins):
+    """re.sub과 같은 치환을 하면서 문자별 원본 위치도 함께 갱신"""
+    chars = []
+    kept = []
+    pos = 0
+    for match in re.finditer(pattern, text):
+        chars.append(text[pos:match.start()])
+        kept.extend(origins[pos:match.start()])
+        chars.append(replacement)
+        kept.extend([origins[match.start()]] * len(replacement))
+        pos = match.end()
+    chars.append(text[pos:])
+    kept.extend(origins[pos:])
+    return ''.join(chars), kept
+
+
+def processed_line_tokens(line, settings, replacer=None):
+    """변환과 같은 전처리를 거친 줄의 토큰을 원본 줄 위치로 반환
+
+    단어 변경, 에스터리스크 제거, 말줄임표 변환을 적용한 뒤 tokenize_line으로 나누고,
+    각 토큰을 (종류, 원본 시작, 원본 끝)으로 돌려줍니다. 입력 창 강조처럼 원본을
+    보여주면서 변환 결과와 같은 구분을 표시할 때 씁니다. 줄 단위로 처리하므로
+    여러 줄에 걸치는 단어 변경 규칙은 반영되지 않으며, 변환에서 생략되는
+    빈 줄과 태그 줄은 빈 리스트를 반환합니다.
+    """
+    if replacer is None:
+        replacer = WordReplacer(settings.word_replacements)
+
+    # 1. 단어 변경 (처리된 문자마다 원본 위치 기록, 치환된 문자는 매치 시작 위치)
+    chars = []
+    origins = []
+    pos = 0
+    for start, end, replacement in replacer.matches(line):
+        chars.append(line[pos:start])
+        origins.extend(range(pos, start))
+        chars.append(replacement)
+        origins.extend([start] * len(replacement))
+        pos = end
+    chars.append(line[pos:])
+    origins.extend(range(pos, len(line)))
+    text = ''.join(chars)
+
+    # 2. 에스터리스크 제거, 말줄임표 변환 (변환과 같은 순서)
+    if settings.remove_asterisk and '*' in text:
+        text, origins = _substitute_with_origins(r'\*+', '', text, origins)
+    if settings.convert_ellipsis and '...' in text:
+        text, origins = _substitute_with_origins(r'\.\.\.', '…', text, origins)
+
+    # 3. 변환에서 생략되는 줄 제외
+    stripped = text.strip()
+    if not stripped or (stripped.startswith('<') and stripped.endswith('>')):
+        return []
+
+    # 4. 토큰 경계를 원본 위치로 변환 (끝 경계는 다음 문자의 원본 위치)
+    origins.append(len(line))
+    tokens = []
+    pos = 0
+    for kind, part in tokenize_line(text):
+        end = pos + len(part)
+        tokens.append((kind, origins[pos], origins[end]))
+        pos = end
+    return tokens
+
+
+# 스트리밍 변환에서 템플릿의 본문 위치를 찾기 위한 표시
+_CONTENT_MARKER = '\x00content\x00'
+
+
+class _DomSignatureParser(HTMLParser):
+    """시작 태그와 속성만 모으는 파서"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tags = []
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.append((tag, tuple(
+            (name, _normalize_attribute(name, value or '')) for name, value in attrs
+        )))
+
+
+def _normalize_attribute(name, value):
+    """속성 값의 레이아웃 공백 제거 (style은 선언 단위로 정리)"""
+    if name != 'style':
+        return ' '.join(value.split())
+    declarations = []
+    for declaration in value.split(';'):
+        prop, _, declared = declaration.partition(':')
+        if prop.strip():
+            declarations.append(f"{prop.strip()}:{' '.join(declared.split())}")
+    return ';'.join(declarations)
+
+
+def dom_signature(html):
+    """HTML의 (태그, 속성) 목록 - 공백 차이만 있는 두 결과(전체/최소화 출력)는 같은 값"""
+    parser = _DomSignatureParser()
+    parser.feed(html)
+    parser.close()
+    return parser.tags
+
+
+def _split_chunks(source, chunk_size):
+    """입력을 chunk_size 이후의 첫 빈 줄 위치에서 나눈 조각들 (빈 줄로 다시 이으면 원문)"""
+    if isinstance(source, str):
+        start = 0
+        while True:
+            cut = source.find('\n\n', start + chunk_size)
+            if cut < 0:
+                yield source[start:]
+                return
+            yield source[start:cut]
+            start = cut + 2
+
+    lines = []
+    size = 0
+    for line in source:
+        # 빈 줄에 도달했고 모은 양이 충분하면 그 앞에서 자름
+        if size >= chunk_size and line == '\n' and lines and lines[-1].endswith('\n'):
+            text = ''.join(lines)
+            yield text[:-1]
+            lines = []
+            size = 0
+            continue
+        lines.append(line)
+        size += len(line)
+    yield ''.join(lines)
+
+
+class LogRenderer:
+    """채팅 로그를 HTML로 변환하는 렌더링 엔진"""
+
+    def __init__(self, paragraph_cache_size=4096, profile_cache_size=16):
+        self._word_replacer = None
+        self.last_image_count = 0           # 직전 변환에서 HTML로 바꾼 이미지 태그 수
+        self.last_minify_saved_bytes = 0    # 직전 변환에서 공백 제거로 줄인 바이트 수
+        # (문단 포맷 설정 키, 문단 텍스트) → 문단 HTML
+        self.paragraph_cache = LRUCache(paragraph_cache_size)
+        # 프로필 설정 키 → 프로필 영역 HTML (본문만 바뀔 때는 다시 만들지 않음)
+        self.profile_cache = LRUCache(profile_cache_size)
+
+    def render(self, text, settings):
+        """텍스트 전체를 변환하여 최종 HTML 반환"""
+        self.last_minify_saved_bytes = 0
+        if not text.strip():
+            return ""
+
+        # 이미지 태그 처리를 먼저 수행
+        content = self.process_image_tags(text, settings)
+
+        # 단어 변경
+        content = self.apply_word_replacements(content, settings)
+
+        # 에스터리스크 제거
+        if settings.remove_asterisk:
+            content = re.sub(r'\*+', '', content)
+
+        # 각 문단을 처리 (바뀌지 않은 문단은 캐시에서 재사용)
+        fingerprint = settings.paragraph_fingerprint()
+        paragraphs = []
+        for paragraph in content.split('\n\n'):
+            if paragraph.strip():
+                paragraphs.append(self._paragraph_html(paragraph, settings, fingerprint))
+
+        # 최종 HTML 생성
+        if settings.minify_output:
+            self.last_minify_saved_bytes += self.minify_savings(settings)
+        return self.create_template('\n'.join(paragraphs), settings)
+
+    def render_iter(self, source, settings, chunk_size=65536):
+        """문단 단위로 HTML 조각을 차례로 반환하는 스트리밍 변환
+
+        source는 문자열 또는 줄 단위로 읽히는 파일 객체입니다. 입력을 빈 줄 위치에서
+        chunk_size 정도씩 나누어 처리하므로, 전체 결과를 메모리에 모으지 않고
+        파일이나 소켓에 바로 쓸 수 있습니다. 조각은 템플릿 앞부분, 문단들(두 번째부터는
+        앞에 줄바꿈), 템플릿 끝부분 순서입니다.
+
+        문자열은 빈 줄을 가로지를 수 있는 규칙(rules_span_paragraphs)이 있으면 나누지 않으므로
+        이어 붙인 결과가 항상 render()와 같습니다. 파일은 미리 훑지 않으므로, 빈 줄을
+        가로지르는 이미지 태그나 정규식/줄바꿈 단어 변경이 조각 경계에 걸리면 적용되지 않습니다.
+        """
+        if isinstance(source, str) and self.rules_span_paragraphs(source, settings):
+            chunk_size = len(source) + 1
+
+        # 1. 템플릿을 본문 앞뒤로 분리 (프로필 영역은 캐시 사용)
+        head, tail = self.create_template(_CONTENT_MARKER, settings).split(_CONTENT_MARKER, 1)
+        fingerprint = settings.paragraph_fingerprint()
+
+        has_text = False
+        started = False
+        image_count = 0
+        carry = None
+        self.last_minify_saved_bytes = 0
+
+        for chunk in _split_chunks(source, chunk_size):
+            has_text = has_text or bool(chunk.strip())
+
+            # 2. 조각마다 이미지 태그, 단어 변경, 에스터리스크 처리
+            content = self.process_image_tags(chunk, settings)
+            image_count += self.last_image_count
+            content = self.apply_word_replacements(content, settings)
+            if settings.remove_asterisk:
+                content = re.sub(r'\*+', '', content)
+
+            # 3. 마지막 문단은 다음 조각과 이어질 수 있으므로 남겨 둠
+            paragraphs = (content if carry is None else f'{carry}\n\n{content}').split('\n\n')
+            carry = paragraphs.pop()
+            for paragraph in paragraphs:
+                if paragraph.strip():
+                    if not started:
+                        yield head
+                    yield ('\n' if started else '') + self._paragraph_html(paragraph, settings, fingerprint)
+                    started = True
+
+        # 4. 남은 문단과 템플릿 끝부분
+        if carry is not None and carry.strip():
+            if not started:
+                yield head
+            yield ('\n' if started else '') + self._paragraph_html(carry, settings, fingerprint)
+            started = True
+
+        self.last_image_count = image_count
+        if settings.minify_output and has_text:
+            self.last_minify_saved_bytes += self.minify_savings(settings)
+        if has_text:
+            if not started:
+                yield head
+            yield tail
+
+    def rules_span_paragraphs(self, text, settings):
+        """이미지 태그나 단어 변경이 빈 줄을 가로질러 적용될 수 있는지 확인
+
+        빈 줄을 포함한 이미지 태그가 있거나, 정규식 규칙(앵커나 전후방 탐색은 조각
+        경계에서 다르게 동작)이나 줄바꿈이 든 일반 단어 규칙이 있으면 True입니다.
+        """
+        if '\n\n' not in text:
+            return False
+        for rule in settings.word_replacements:
+            if rule[0] and ((len(rule) > 2 and rule[2]) or '\n' in rule[0]):
+                return True
+        return any('\n\n' in match.group(0) for match in _IMAGE_TAG_PATTERN.finditer(text))
+
+    def _paragraph_html(self, paragraph, settings, fingerprint):
+        """문단 하나의 HTML (이미 처리된 HTML이면 그대로 사용, 아니면 대화문 포맷팅)
+
+        최소화 출력에서는 그대로 쓰는 문단의 이미지 블록만 한 줄로 줄이고,
+        줄어든 길이를 last_minify_saved_bytes에 더합니다.
+        """
+        if paragraph.strip().startswith('<div'):
+            if settings.minify_output:
+                html = self.minify_image_blocks(paragraph)
+                self.last_minify_saved_bytes += len(paragraph) - len(html)
+                return html
+            return paragraph
+        return self.format_paragraph(paragraph, settings, fingerprint)
+
+    def minify_image_blocks(self, html):
+        """여러 줄 이미지 블록을 같은 태그와 속성의 한 줄 HTML로 변경"""
+        def minify(match):
+            style = _LAYOUT_WHITESPACE.sub('', match.group('style'))
+            block = self._create_image_html(match.group('src'), match.group('alt'), style, minify=True)
+            # 문단 맨 앞이라 줄바꿈이 이미 빠진 블록은 그대로 둠
+            return block if match.group(0).startswith('\n') else block[1:]
+        return _IMAGE_BLOCK_PATTERN.sub(minify, html)
+
+    def minify_savings(self, settings):
+        """템플릿(프로필 영역 포함)의 공백 제거로 줄어든 바이트 수
+
+        본문은 템플릿에 그대로 들어가므로 내용 없이 만든 두 템플릿의 길이 차이와 같습니다.
+        문단에서 줄어든 길이는 _paragraph_html이 따로 더합니다.
+        """
+        full = replace(settings, minify_output=False)
+        minified = replace(settings, minify_output=True)
+        return len(self.create_template('', full)) - len(self.create_template('', minified))
+
+    def format_paragraph(self, paragraph, settings, fingerprint=None):
+        """문단 하나를 포맷팅 (같은 문단과 설정이면 캐시된 HTML 반환)"""
+        key = (fingerprint or settings.paragraph_fingerprint(), paragraph)
+        html = self.paragraph_cache.get(key)
+        if html is None:
+            formatted_text = self.format_conversation(paragraph, settings)
+            if settings.compact_output:
+                html = f'<div {compact_styles(settings)[0]["paragraph"]}>{formatted_text}</div>'
+            else:
+                html = f'<div style="margin-bottom:1.5rem;">{formatted_text}</div>'
+            self.paragraph_cache.set(key, html)
+        return html
+
+    def apply_word_replacements(self, content, settings):
+        """단어 변경 규칙을 한 번에 적용 (규칙이 바뀔 때만 치환기 재구성)"""
+        rules = settings.word_replacements
+        replacer = self._word_replacer
+        if replacer is None or (replacer.rules is not rules and replacer.rules != rules):
+            replacer = self._word_replacer = WordReplacer(rules)
+        return replacer.apply(content)
+
+    def collect_url_mappings(self, image_mappings):
+        """(태그, URL) 쌍을 식별자 → 정리된 URL 딕셔너리로 변환"""
+        mappings = {}
+        for tag, url in image_mappings:
+            tag = tag.strip()
+            url = url.strip()
+            if tag and url:
+                if 'style="width: 0px; height: 0px;"' in url:
+                    url = url.replace('style="width: 0px; height: 0px;"', '')
+                tag = extract_tag_identifier(tag)
+                url = clean_url(url)
+                mappings[tag] = url
+        return mappings
+
+    def process_image_tags(self, content, settings):
+        """이미지 태그 처리"""
+        self.last_image_count = 0
+        if not content:
+            return content
+
+        try:
+            # 1. URL 매핑 한 번만 수집
+            url_mappings = self.collect_url_mappings(settings.image_mappings)
+
+            # 2. 스타일 설정 한 번만 생성
+            base_style = self._create_base_style(settings)
+
+            # 3. 태그 변환 함수
+            def replace_tag(match):
+                try:
+                    # 3.1 따옴표 정규화
+                    full_match = match.group(0).replace('″', '"')
+
+                    # 3.2 태그 추출
+                    tag = self._extract_tag_from_match(match)
+
+                    # 3.3 매핑된 URL이 있으면 HTML 생성
+                    # (최소화 출력도 같은 줄 구성을 쓰고, 한 줄로 줄이는 것은 _paragraph_html에서)
+                    if tag and tag in url_mappings:
+                        self.last_image_count += 1
+                        return self._create_image_html(url_mappings[tag], tag, base_style)
+
+                    return full_match
+
+                except Exception as e:
+                    print(f"태그 처리 중 오류: {str(e)}")
+                    return match.group(0).replace('″', '"')
+
+            # 4. 모든 형식을 한 번에 처리
+            return _IMAGE_TAG_PATTERN.sub(replace_tag, content)
+
+        except Exception as e:
+            print(f"이미지 처리 중 오류: {str(e)}")
+            return content
+
+    def _create_base_style(self, settings):
+        """기본 이미지 스타일 생성"""
+        style = f"""
+            max-width:{settings.image_size}%;
+            margin:{settings.image_margin}px 0;
+            border-radius:12px;
+        """
+
+        if settings.use_image_border:
+            style += f"border:2px solid {settings.image_border_color};"
+        if settings.use_image_shadow:
+            style += "box-shadow:rgba(0,0,0,0.12) 0px 4px 16px;"
+
+        return style
+
+    def _extract_tag_from_match(self, match):
+        """_IMAGE_TAG_PATTERN 매치의 그룹에서 태그 추출"""
+        groups = match.groupdict()
+
+        if groups['double_colon'] is not None:
+            return groups['double_colon'].replace('″', '"').split('::')[0].strip('"\'')
+
+        if groups['equals'] is not None:
+            return groups['equals'].replace('″', '"').split('=')[0].strip('{}"\' ')
+
+        if groups['src'] is not None:
+            return groups['src']
+
+        return groups['attr']
+
+    def _create_image_html(self, url, tag, style, minify=False):
+        """이미지 HTML 생성"""
+        if minify:
+            # 앞의 줄바꿈은 문단 구분에 쓰이므로 유지
+            return (
+                f'\n<div style="margin-bottom:1rem;width:100%;text-align:center;">'
+                f'<img style="{style}" src="{url}" alt="{tag}" class="fr-fic fr-dii"></div>'
+            )
+        return f'''
+            <div style="margin-bottom:1rem; width:100%; text-align:center;">
+                <img style="{style}" 
+                    src="{url}" alt="{tag}" class="fr-fic fr-dii">
+            </div>
+        '''
+
+    def format_conversation(self, text, settings):
+        """대화문 포맷팅 - 대화문에만 선택적 줄바꿈 적용, 공백 보존, 따옴표 스타일링"""
+        indent = settings.text_indent if settings.use_text_indent else 0
+        dialog_color = settings.dialog_color
+        inner_thoughts_color = settings.inner_thoughts_color
+        narration_color = settings.narration_color
+
+        dialog_bold = "font-weight:bold;" if settings.dialog_bold else ""
+        inner_thoughts_bold = "font-weight:bold;" if settings.inner_thoughts_bold else ""
+        text_size = f"font-size:{settings.text_size}px;" if settings.use_text_size else ""
+
+        if settings.convert_ellipsis:
+            text = text.replace('...', '…')
+
+        if settings.compact_output:
+            return self._format_conversation_compact(text, settings)
+
+        narration_style = f"color:{narration_color}; {text_size}"
+        inner_thoughts_style = f"color:{inner_thoughts_color}; {inner_thoughts_bold} {text_size}"
+        dialog_style = f"color:{dialog_color}; {dialog_bold} {text_size}"
+
+        lines = text.split('\n')
+        formatted_lines = []
+
+        for line in lines:
+            if not line.strip():
+                formatted_lines.append('<p><br></p>')
+                continue
+
+            if line.strip().startswith('<') and line.strip().endswith('>'):
+                continue
+
+            parts_to_process = []
+
+            for kind, part in tokenize_line(line):
+                if kind == 'narration':
+                    # 공백뿐인 나레이션은 생략
+                    if part.strip():
+                        parts_to_process.append(f'<span style="{narration_style}">{part}</span>')
+                elif kind == 'inner_thoughts':
+                    parts_to_process.append(f'<span style="{inner_thoughts_style}">{part}</span>')
+                elif settings.dialog_newline:
+                    content = f'<span style="{dialog_style}">{part}</span>'
+                    parts_to_process.append(f'<div style="margin-top:1em; margin-bottom:1em;">{content}</div>')
+                else:
+                    parts_to_process.append(f'<span style="{dialog_style}">{part}</span>')
+
+            # 들여쓰기 처리
+            if settings.use_text_indent:
+                formatted_lines.append(
+                    f'<div style="margin-bottom:1rem; text-indent:{indent}px">{"".join(parts_to_process)}</div>'
+                )
+            else:
+                formatted_lines.append(
+                    f'<div style="margin-bottom:1rem;">{"".join(parts_to_process)}</div>'
+                )
+
+        return '\n'.join(formatted_lines)
+
+    def _format_conversation_compact(self, text, settings):
+        """압축 출력 - 같은 스타일의 인접 구간을 병합하고 나레이션 스타일은 줄 div로 올림"""
+        attributes = compact_styles(settings)[0]
+        formatted_lines = []
+
+        def wrap(attribute, content):
+            return f'<span {attribute}>{content}</span>' if attribute else content
+
+        for line in text.split('\n'):
+            if not line.strip():
+                formatted_lines.append('<p><br></p>')
+                continue
+
+            if line.strip().startswith('<') and line.strip().endswith('>'):
+                continue
+
+            parts = []
+            run_attribute = None
+            run = []
+
+            for kind, part in tokenize_line(line):
+                if kind == 'narration':
+                    # 공백뿐인 나레이션은 생략
+                    if not part.strip():
+                        continue
+                    attribute = attributes['narration']
+                elif kind == 'inner_thoughts':
+                    attribute = attributes['inner_thoughts']
+                else:
+                    attribute = attributes['dialogue']
+                    if settings.dialog_newline:
+                        # 줄바꿈 대화문은 블록이므로 병합하지 않음
+                        if run:
+                            parts.append(wrap(run_attribute, ''.join(run)))
+                            run = []
+                        parts.append(f'<div {attributes["dialogue_block"]}>{wrap(attribute, part)}</div>')
+                        continue
+
+                # 같은 스타일이 이어지면 하나로 병합
+                if attribute != run_attribute and run:
+                    parts.append(wrap(run_attribute, ''.join(run)))
+                    run = []
+                run_attribute = attribute
+                run.append(part)
+
+            if run:
+                parts.append(wrap(run_attribute, ''.join(run)))
+
+            formatted_lines.append(f'<div {attributes["line"]}>{"".join(parts)}</div>')
+
+        return '\n'.join(formatted_lines)
+
+    def get_profile_section(self, settings):
+        """프로필 영역 HTML (같은 프로필 설정이면 캐시된 HTML 반환)"""
+        key = settings.profile_fingerprint()
+        html = self.profile_cache.get(key)
+        if html is None:
+            html = self.create_profile_section(settings)
+            self.profile_cache.set(key, html)
+        return html
+
+    def create_profile_section(self, settings):
+        """프로필 영역(이미지, 봇 이름, 태그, 구분선) HTML 생성"""
+        profile_section_html = ''
+        if not settings.show_profile:
+            return profile_section_html
+
+        minify = settings.minify_output
+
+        try:
+            profile_parts = []
+
+            # 프로필 이미지
+            if settings.show_profile_image:
+                profile_border_color = settings.profile_border_color
+                width = settings.profile_width
+                height = settings.profile_height
+                image_url = process_image_url(settings.image_url)
+
+                # 기본 이미지 스타일 설정
+                if minify:
+                    common_style = (
+                        "max-width:100%;"
+                        + ("box-shadow:rgba(0,0,0,0.12) 0px 4px 16px;" if settings.show_profile_shadow else "")
+                        + (f"border:3px solid {profile_border_color};" if settings.show_profile_border else "")
+                    )
+                else:
+                    common_style = f'''
+                            max-width:100%;
+                            {f'box-shadow:rgba(0,0,0,0.12) 0px 4px 16px;' if settings.show_profile_shadow else ''}
+                            {f'border:3px solid {profile_border_color};' if settings.show_profile_border else ''}
+                        '''
+
+                if settings.frame_style == "배너":
+                    frame_styles = ["border-radius:12px"]
+                    container_style = "width:100%;"
+                elif settings.frame_style == "동그라미":
+                    frame_styles = [f"width:{width}px", f"height:{width}px", "border-radius:50%", "object-fit:cover"]
+                    container_style = "width:auto;"
+                else:  # 직사각형
+                    frame_styles = [f"width:{width}px", f"height:{height}px", "border-radius:8px", "object-fit:cover"]
+                    container_style = "width:auto;"
+
+                if minify:
+                    profile_style = f"{common_style}{';'.join(frame_styles)};"
+                    profile_html = (
+                        f'<div style="margin-bottom:1rem;text-align:center;{container_style}">'
+                        f'<img style="{profile_style}" src="{image_url}" alt="profile" class="fr-fic fr-dii"></div>'
+                    )
+                else:
+                    profile_style = f"{common_style} {'; '.join(frame_styles)};"
+                    profile_html = f'''
+                        <div style="margin-bottom:1rem; text-align:center; {container_style}">
+                            <img style="{profile_style}" 
+                                src="{image_url}" 
+                                alt="profile" 
+                                class="fr-fic fr-dii">
+                        </div>
+                        '''
+                profile_parts.append(profile_html)
+
+            # 봇 이름
+            if settings.show_bot_name:
+                bot_name = settings.bot_name or "봇 이름"
+                bot_name_html = f'<h3 style="color:{settings.bot_name_color};font-weight:{settings.font_weight_bold};">{bot_name}</h3>'
+                if not minify:
+                    bot_name_html = f'''
+                            {bot_name_html}
+                        '''
+                profile_parts.append(bot_name_html)
+
+            # 태그 처리
+            if settings.show_tags:
+                tags_html = []
+                for i, tag in enumerate(settings.tags):
+                    tag_text = tag.text or f"태그 {i+1}"
+                    padding_top, padding_right, padding_bottom, padding_left = tag.padding
+
+                    css_styles = [
+                        "display:inline-block",
+                        f"border-radius:{tag.border_radius}px",
+                        f"font-size:{tag.font_size}rem",
+                        f"padding:{padding_top}rem {padding_right}rem "
+                        f"{padding_bottom}rem {padding_left}rem",
+                        f"color:{tag.text_color}",
+                        "margin:0.15rem 0.2rem",
+                        "white-space:nowrap"
+                    ]
+
+                    if tag.style == "투명 배경":
+                        css_styles.extend([
+                            f"background:transparent",
+                            f"border:1px solid {tag.color}"
+                        ])
+                    elif tag.style == "그라데이션":
+                        light_color = adjust_color_lightness(tag.color, 120, lighter=True)
+                        dark_color = adjust_color_lightness(tag.color, 120, lighter=False)
+                        css_styles.extend([
+                            f"background:linear-gradient(135deg, {light_color}, {dark_color})",
+                            "border:none"
+                        ])
+                    else:
+                        css_styles.extend([
+                            f"background:{tag.color}",
+                            "border:none"
+                        ])
+
+                    tag_html = f"<span style=\"{';'.join(css_styles)}\">{tag_text}</span>"
+                    if not minify:
+                        tag_html = f'''
+                                    {tag_html}
+                                '''
+                    tags_html.append(tag_html)
+
+                if tags_html:
+                    if minify:
+                        # 인라인 블록 태그 사이 간격을 위해 공백 하나는 유지
+                        tags_container = (
+                            '<div style="text-align:center;margin:0 auto;max-width:fit-content;">'
+                            f"{' '.join(tags_html)}</div>"
+                        )
+                    else:
+                        tags_container = f'''
+                                <div style="text-align:center;margin:0 auto;max-width:fit-content;">
+                                    {''.join(tags_html)}
+                                </div>
+                            '''
+                    profile_parts.append(tags_container)
+
+            # 구분선
+            if settings.show_divider:
+                thickness = settings.divider_thickness
+                if settings.divider_style == "그라데이션":
+                    divider_outer_color = settings.divider_outer_color
+                    divider_inner_color = settings.divider_inner_color
+                    divider_style = f"background:linear-gradient(to right,{divider_outer_color} 0%,{divider_inner_color} 50%,{divider_outer_color} 100%);"
+                else:
+                    divider_style = f"background:{settings.divider_solid_color};"
+
+                if minify:
+                    divider_html = f'<div style="height:{thickness}px;{divider_style}margin:1rem 0;border-radius:{thickness/2}px;"><br></div>'
+                else:
+                    divider_html = f'''
+                            <div style="height:{thickness}px;{divider_style}margin:1rem 0;border-radius:{thickness/2}px;">
+                                <br>
+                            </div>
+                        '''
+                profile_parts.append(divider_html)
+
+            # 전체 프로필 섹션 조합
+            if profile_parts and minify:
+                profile_section_html = (
+                    '<div style="display:flex;flex-direction:column;text-align:center;margin-bottom:1.25rem;">'
+                    f"{''.join(profile_parts)}</div>"
+                )
+            elif profile_parts:
+                profile_section_html = f'''
+                            <div style="display:flex;flex-direction:column;text-align:center;margin-bottom:1.25rem;">
+                                {''.join(profile_parts)}
+                            </div>
+                        '''
+
+        except Exception as e:
+            print(f"Error in profile creation: {str(e)}")
+
+        return profile_section_html
+
+    def create_template(self, content, settings):
+        """템플릿 HTML 생성"""
+        try:
+            padding_html = '<p><br></p>' if settings.use_padding else ''
+
+            # 박스 색상
+            box_outer_color = settings.outer_box_color
+            box_inner_color = settings.inner_box_color
+            shadow_value = settings.shadow_intensity
+
+            # 테두리 설정
+            border_style = ""
+            if settings.use_box_border:
+                border_style = f"border: {settings.box_border_thickness}px solid {settings.box_border_color};"
+                if settings.minify_output:
+                    border_style = border_style.replace("border: ", "border:")
+
+            if settings.show_inner_box:
+                # 내부 박스가 있을 때
+                background_color = box_outer_color
+                inner_box_style = f"""
+                    font-size:{settings.font_size_normal}px;
+                    background:{box_inner_color};
+                    padding:{settings.spacing_large}px;
+                    border-radius:{settings.radius_normal}px;"""
+            else:
+                # 내부 박스가 없을 때
+                background_color = box_inner_color
+                inner_box_style = f"""
+                    font-size:{settings.font_size_normal}px;
+                    padding:0;"""
+
+            # 프로필 영역 HTML 생성 (설정이 같으면 캐시 사용)
+            profile_section_html = self.get_profile_section(settings)
+
+            # 압축 출력의 클래스 스타일 블록
+            style_block_html = ''
+            if settings.compact_output and settings.use_style_classes:
+                style_block_html = compact_styles(settings)[1]
+
+            # 최종 템플릿 반환
+            if settings.minify_output:
+                inner_box_style = "".join(inner_box_style.split())
+                outer_style = (
+                    f"font-family:{settings.font_family};"
+                    f"color:{settings.text_color};"
+                    "line-height:1.8;width:100%;max-width:600px;margin:1rem auto;"
+                    f"background:{background_color};"
+                    f"border-radius:{settings.radius_large}px;"
+                    f"box-shadow:0px {shadow_value}px {shadow_value * 2}px rgba(0,0,0,0.2);"
+                    f"{border_style}"
+                )
+                return (
+                    f'{style_block_html}{padding_html}<div style="{outer_style}">'
+                    f'<div style="padding:{settings.spacing_large}px;">'
+                    f'<div style="{inner_box_style}">{profile_section_html}{content}</div>'
+                    f'</div></div>{padding_html}'
+                )
+
+            return f'''{style_block_html}{padding_html}
+                <div style="font-family:{settings.font_family};
+                            color:{settings.text_color};
+                            line-height:1.8;
+                            width:100%;
+                            max-width:600px;
+                            margin:1rem auto;
+                            background:{background_color};
+                            border-radius:{settings.radius_large}px;
+                            box-shadow:0px {shadow_value}px {shadow_value * 2}px rgba(0,0,0,0.2);
+                            {border_style}">
+                    <div style="padding:{settings.spacing_large}px;">
+                        <div style="{inner_box_style}">
+                            {profile_section_html}
+                            {content}
+                        </div>
+                    </div>
+                </div>
+                {padding_html}'''
+
+        except Exception as e:
+            print(f"Error in template creation: {str(e)}")
+            return f"<div>{content}</div>"
+
+
+# 변환 결과에 영향을 주는 엔진 변경이 있으면 올려서 디스크 캐시를 무효화
+RENDER_ENGINE_VERSION = 2
+
+
+class DiskLRUCache:
+    """항목 하나를 파일 하나로 저장하는 디스크 캐시
+
+    전체 용량이 max_bytes를 넘으면 가장 오래 쓰지 않은 파일부터 지웁니다.
+    사용 순서는 파일 수정 시각으로 기록하므로 세션이 바뀌어도 유지되며,
+    여러 스레드가 함께 쓸 수 있도록 색인은 잠금으로 보호합니다.
+    """
+    SUFFIX = '.cache'
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.index = None      # 키 → 파일 크기 (오래 쓰지 않은 순서)
+        self.total_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lookup_time = 0.0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def _load_index(self):
+        """처음 사용할 때 폴더를 한 번 훑어 사용 순서와 전체 용량 파악"""
+        if self.index is not None:
+            return
+        entries = []
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(self.SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name[:-len(self.SUFFIX)], stat.st_size))
+        entries.sort()
+        self.index = OrderedDict((key, size) for _, key, size in entries)
+        self.total_size = sum(self.index.values())
+
+    def load(self, key, decode=bytes):
+        """저장된 바이트를 decode에 넘긴 결과 또는 None (읽거나 풀 수 없는 파일은 삭제)"""
+        start = perf_counter()
+        try:
+            return self._load(key, decode)
+        finally:
+            with self.lock:
+                self.lookup_time += perf_counter() - start
+
+    def _load(self, key, decode):
+        with self.lock:
+            self._load_index()
+            if key not in self.index:
+                self.misses += 1
+                return None
+            self.index.move_to_end(key)
+
+        try:
+            path = self._path(key)
+            with open(path, 'rb') as f:
+                value = decode(f.read())
+            os.utime(path)
+        except Exception as e:
+            print(f"디스크 캐시 읽기 실패 ({key}): {str(e)}")
+            self.remove(key)
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+        return value
+
+    def store(self, key, data):
+        """바이트 저장 후 용량 한도에 맞게 오래된 항목 제거"""
+        if len(data) > self.max_bytes:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            # 다른 스레드가 같은 키를 저장해도 겹치지 않는 임시 파일에 쓴 뒤 교체
+            temp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"디스크 캐시 저장 실패 ({key}): {str(e)}")
+            return
+
+        with self.lock:
+            self._load_index()
+            self.total_size += len(data) - self.index.pop(key, 0)
+            self.index[key] = len(data)
+            while self.total_size > self.max_bytes and len(self.index) > 1:
+                old_key, size = self.index.popitem(last=False)
+                self.total_size -= size
+                self.evictions += 1
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+
+    def remove(self, key):
+        """항목 하나 삭제"""
+        with self.lock:
+            self._load_index()
+            self.total_size -= self.index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        """캐시 파일 전체 삭제 (통계 포함)"""
+        with self.lock:
+            self._load_index()
+            keys = list(self.index)
+            self.index.clear()
+            self.total_size = 0
+            self.hits = self.misses = self.evictions = 0
+            self.lookup_time = 0.0
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get_stats(self):
+        """캐시 상태 통계"""
+        with self.lock:
+            self._load_index()
+            stats = cache_stats(
+                len(self.index), self.total_size, self.hits, self.misses, self.evictions, self.lookup_time
+            )
+            stats['total_items'] = len(self.index)
+            stats['total_size_mb'] = self.total_size / 1024 / 1024
+            stats['max_size_mb'] = self.max_bytes / 1024 / 1024
+            return stats
+
+
+class RenderDiskCache(DiskLRUCache):
+    """변환 결과를 디스크에 압축 저장하는 캐시
+
+    키는 엔진 버전, 정규화한 RenderSettings, 입력 텍스트를 합친 SHA-256입니다.
+    render_iter 조각과 공백 제거 바이트 수를 zlib으로 압축해 파일 하나에 저장합니다.
+    """
+    SUFFIX = '.html.z'
+    MIN_RENDER_MS = 100  # 이보다 빨리 끝나는 변환은 저장하지 않음 (호출하는 쪽에서 확인)
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        super().__init__(directory, max_bytes)
+
+    @staticmethod
+    def key(text, settings):
+        """입력 텍스트와 설정으로 캐시 키 생성"""
+        snapshot = json.dumps(
+            asdict(settings), sort_keys=True, ensure_ascii=False, default=str
+        )
+        digest = hashlib.sha256()
+        digest.update(f'{RENDER_ENGINE_VERSION}\0{snapshot}\0'.encode('utf-8'))
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _decode(data):
+        payload = zlib.decompress(data).decode('utf-8', 'surrogatepass')
+        header, body = payload.split('\n', 1)
+        meta = json.loads(header)
+        parts = []
+        pos = 0
+        for length in meta['parts']:
+            parts.append(body[pos:pos + length])
+            pos += length
+        return parts, meta['saved']
+
+    def get(self, key):
+        """(render_iter 조각 목록, 공백 제거 바이트 수) 또는 None"""
+        return self.load(key, self._decode)
+
+    def put(self, key, parts, saved_bytes=0):
+        """변환 결과 압축 저장"""
+        header = json.dumps({'parts': [len(part) for part in parts], 'saved': saved_bytes})
+        data = zlib.compress(
+            (header + '\n' + ''.join(parts)).encode('utf-8', 'surrogatepass'), 6
+        )
+        self.store(key, data)
+
+
+class ImageDiskCache(DiskLRUCache):
+    """미리보기용 원격 이미지 원본을 URL별로 저장하는 디스크 캐시"""
+    SUFFIX = '.img'
+
+    def __init__(self, directory, max_bytes=128 * 1024 * 1024):
+        super().__init__(directory, max_bytes)
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def clear(self):
+        """캐시 폴더를 통째로 삭제 (예전 형식의 파일 포함)"""
+        with self.lock:
+            self.index = OrderedDict()
+            self.total_size = 0
+            self.hits = self.misses = self.evictions = 0
+            self.lookup_time = 0.0
+        shutil.rmtree(self.directory, ignore_errors=True)